@@ -3,11 +3,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, date, timedelta
-import logging
+from datetime import date
 
-from backend.database.db import get_db, MenuItem, DiningHall
+from backend.config.config import SEARCH_MAX_PAGE_SIZE, SEARCH_PAGE_SIZE
+from backend.database.db import get_db, MenuItem, DiningHall, menu_date_key
 from backend.models.mealplan import MenuItem as MenuItemModel
+from backend.services import search
 from backend.api.dependencies import get_current_active_user
 
 router = APIRouter(
@@ -23,6 +24,10 @@ def get_menu_items(
     date: Optional[date] = None,
     meal_type: Optional[str] = None,
     category: Optional[str] = None,
+    min_protein_g: Optional[float] = None,
+    max_calories: Optional[int] = None,
+    max_sodium_mg: Optional[float] = None,
+    max_total_fat_g: Optional[float] = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -34,9 +39,8 @@ def get_menu_items(
         query = query.filter(MenuItem.dining_hall_id == dining_hall_id)
     
     if date:
-        # Filter by date (ignoring time component)
-        query = query.filter(MenuItem.date >= datetime.combine(date, datetime.min.time()))
-        query = query.filter(MenuItem.date < datetime.combine(date + timedelta(days=1), datetime.min.time()))
+        # Filter by day (ignoring time component)
+        query = query.filter(MenuItem.date_key == menu_date_key(date))
     
     if meal_type:
         query = query.filter(MenuItem.meal_type == meal_type)
@@ -44,21 +48,21 @@ def get_menu_items(
     if category:
         query = query.filter(MenuItem.category == category)
     
-    # Get items and parse strings
-    items = query.all()
-    for item in items:
-        if item.nutrients:
-            try:
-                # Handle nutrients as a JSON string if it's not already a dict
-                import json
-                if isinstance(item.nutrients, str):
-                    item.nutrients = json.loads(item.nutrients)
-            except json.JSONDecodeError as e:
-                logging.error(f"Error decoding JSON for item {item.id}: {e}")
-                item.nutrients = None
-        # Allergens are now handled by the model's property getter
+    # Nutrient filters run against the numeric columns
+    if min_protein_g is not None:
+        query = query.filter(MenuItem.protein_g >= min_protein_g)
     
-    return items
+    if max_calories is not None:
+        query = query.filter(MenuItem.calories <= max_calories)
+    
+    if max_sodium_mg is not None:
+        query = query.filter(MenuItem.sodium_mg <= max_sodium_mg)
+    
+    if max_total_fat_g is not None:
+        query = query.filter(MenuItem.total_fat_g <= max_total_fat_g)
+    
+    # Nutrients and allergens are decoded by the model's accessors during serialization
+    return query.all()
 
 
 @router.get("/dining-halls/{dining_hall_id}", response_model=List[MenuItemModel])
@@ -79,28 +83,14 @@ def get_items_by_dining_hall(
     
     # Apply filters
     if date:
-        # Filter by date (ignoring time component)
-        query = query.filter(MenuItem.date >= datetime.combine(date, datetime.min.time()))
-        query = query.filter(MenuItem.date < datetime.combine(date + timedelta(days=1), datetime.min.time()))
+        # Filter by day (ignoring time component)
+        query = query.filter(MenuItem.date_key == menu_date_key(date))
     
     if meal_type:
         query = query.filter(MenuItem.meal_type == meal_type)
     
-    # Get items and parse strings
-    items = query.all()
-    for item in items:
-        if item.nutrients:
-            try:
-                # Handle nutrients as a JSON string if it's not already a dict
-                import json
-                if isinstance(item.nutrients, str):
-                    item.nutrients = json.loads(item.nutrients)
-            except json.JSONDecodeError as e:
-                logging.error(f"Error decoding JSON for item {item.id}: {e}")
-                item.nutrients = None
-        # Allergens are now handled by the model's property getter
-    
-    return items
+    # Nutrients and allergens are decoded by the model's accessors during serialization
+    return query.all()
 
 
 @router.get("/meal-types", response_model=List[str])
@@ -136,26 +126,15 @@ def get_available_dates(
 @router.get("/search", response_model=List[MenuItemModel])
 def search_menu_items(
     query: str = Query(..., min_length=2),
+    date: Optional[date] = None,
+    dining_hall_id: Optional[int] = None,
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
-    """Search for menu items by name."""
-    items = db.query(MenuItem).filter(MenuItem.name.ilike(f"%{query}%")).all()
-    
-    # Parse strings
-    for item in items:
-        if item.nutrients:
-            try:
-                # Handle nutrients as a JSON string if it's not already a dict
-                import json
-                if isinstance(item.nutrients, str):
-                    item.nutrients = json.loads(item.nutrients)
-            except json.JSONDecodeError as e:
-                logging.error(f"Error decoding JSON for item {item.id}: {e}")
-                item.nutrients = None
-        # Allergens are now handled by the model's property getter
-    
-    return items
+    """Search menu items by name and category: best matches first, every word a prefix, paginated."""
+    return search.search_menu_items(db, query, date, dining_hall_id, limit, offset)
 
 
 @router.get("/{item_id}", response_model=MenuItemModel)
@@ -169,16 +148,4 @@ def get_menu_item(
     if not item:
         raise HTTPException(status_code=404, detail="Menu item not found")
     
-    # Parse strings
-    if item.nutrients:
-        try:
-            # Handle nutrients as a JSON string if it's not already a dict
-            import json
-            if isinstance(item.nutrients, str):
-                item.nutrients = json.loads(item.nutrients)
-        except json.JSONDecodeError as e:
-            logging.error(f"Error decoding JSON for item {item.id}: {e}")
-            item.nutrients = None
-    # Allergens are now handled by the model's property getter
-    
     return item
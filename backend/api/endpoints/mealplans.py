@@ -6,9 +6,11 @@ from typing import List, Optional
 from datetime import datetime, date, timedelta
 
 from backend.database.db import get_db, MealPlan, MenuItem, User
+from backend.database.write_queue import write_queue
 from backend.models.mealplan import MealPlan as MealPlanModel, MealPlanCreate, MealPlanUpdate, MealPlanRequest, WeeklyMealPlan
 from backend.api.dependencies import get_current_active_user
 from backend.services.ai_service import generate_meal_plan
+from backend.services.nutrition import calculate_menu_item_totals
 
 router = APIRouter(
     prefix="/mealplans",
@@ -29,51 +31,27 @@ def create_meal_plan(
         raise HTTPException(status_code=403, detail="Not authorized to create meal plan for another user")
     
     # Verify menu items exist
-    menu_items = db.query(MenuItem).filter(MenuItem.id.in_(meal_plan.menu_items)).all()
+    item_ids = [item.id for item in meal_plan.menu_items]
+    menu_items = db.query(MenuItem).filter(MenuItem.id.in_(item_ids)).all()
     if len(menu_items) != len(meal_plan.menu_items):
         raise HTTPException(status_code=400, detail="One or more menu items not found")
     
     # Calculate nutritional totals
-    total_calories = sum(item.calories or 0 for item in menu_items)
-    
-    def extract_numeric_value(nutrient_str):
-        if not nutrient_str:
-            return 0
-        # Remove 'g' or other units and convert to float
-        try:
-            return float(''.join(c for c in nutrient_str if c.isdigit() or c == '.'))
-        except ValueError:
-            return 0
-    
-    total_protein = sum(
-        extract_numeric_value(item.nutrients.get("Protein", "0g")) if item.nutrients else 0 
-        for item in menu_items
-    )
-    total_carbs = sum(
-        extract_numeric_value(item.nutrients.get("Total Carbohydrate", "0g")) if item.nutrients else 0 
-        for item in menu_items
-    )
-    total_fat = sum(
-        extract_numeric_value(item.nutrients.get("Total Fat", "0g")) if item.nutrients else 0 
-        for item in menu_items
-    )
+    totals = calculate_menu_item_totals(db, item_ids)
     
     # Create meal plan
     db_meal_plan = MealPlan(
         user_id=current_user.id,
         name=meal_plan.name,
         description=meal_plan.description,
-        total_calories=total_calories,
-        total_protein=total_protein,
-        total_carbs=total_carbs,
-        total_fat=total_fat,
+        **totals,
         ai_prompt=meal_plan.ai_prompt,
         ai_response=meal_plan.ai_response,
         menu_items=menu_items
     )
     
     db.add(db_meal_plan)
-    db.commit()
+    write_queue.commit(db)
     db.refresh(db_meal_plan)
     return db_meal_plan
 
@@ -133,7 +111,7 @@ def generate_ai_meal_plan(
     )
     
     db.add(db_meal_plan)
-    db.commit()
+    write_queue.commit(db)
     db.refresh(db_meal_plan)
     return db_meal_plan
 
@@ -299,7 +277,8 @@ def update_meal_plan(
     
     # Update menu items if provided
     if meal_plan_update.menu_items is not None:
-        menu_items = db.query(MenuItem).filter(MenuItem.id.in_(meal_plan_update.menu_items)).all()
+        item_ids = [item.id for item in meal_plan_update.menu_items]
+        menu_items = db.query(MenuItem).filter(MenuItem.id.in_(item_ids)).all()
         if len(menu_items) != len(meal_plan_update.menu_items):
             raise HTTPException(status_code=400, detail="One or more menu items not found")
         
@@ -307,34 +286,10 @@ def update_meal_plan(
         db_meal_plan.menu_items = menu_items
         
         # Recalculate nutritional totals
-        db_meal_plan.total_calories = sum(item.calories or 0 for item in menu_items)
-        db_meal_plan.total_protein = sum(
-            extract_numeric_value(parse_nutrients(item).get("Protein", "0g")) if item.nutrients else 0 
-            for item in menu_items
-        )
-        db_meal_plan.total_carbs = sum(
-            extract_numeric_value(parse_nutrients(item).get("Total Carbohydrate", "0g")) if item.nutrients else 0 
-            for item in menu_items
-        )
-        db_meal_plan.total_fat = sum(
-            extract_numeric_value(parse_nutrients(item).get("Total Fat", "0g")) if item.nutrients else 0 
-            for item in menu_items
-        )
-        
-        # Update menu items with parsed data for response, but serialize for database
-        for item in menu_items:
-            parsed_nutrients = parse_nutrients(item)
-            parsed_allergens = parse_allergens(item)
-            
-            # Store parsed data for response
-            item._nutrients = parsed_nutrients
-            item._allergens = parsed_allergens
-            
-            # Serialize for database
-            item.nutrients = serialize_nutrients(parsed_nutrients)
-            item.allergens = serialize_allergens(parsed_allergens)
+        for name, value in calculate_menu_item_totals(db, item_ids).items():
+            setattr(db_meal_plan, name, value)
     
-    db.commit()
+    write_queue.commit(db)
     db.refresh(db_meal_plan)
     return db_meal_plan
 
@@ -355,5 +310,5 @@ def delete_meal_plan(
         raise HTTPException(status_code=403, detail="Not authorized to delete this meal plan")
     
     db.delete(db_meal_plan)
-    db.commit()
+    write_queue.commit(db)
     return None
@@ -0,0 +1,19 @@
+"""Endpoints reporting scheduled scraper runs."""
+
+from fastapi import APIRouter, Depends
+from typing import Any, Dict
+
+from backend.scraper.scheduler import scraper_status
+from backend.api.dependencies import get_current_active_user
+
+router = APIRouter(
+    prefix="/scraper",
+    tags=["scraper"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/status")
+def get_scraper_status(current_user = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Get the schedule, last run result and next run time of the menu scraper."""
+    return scraper_status()
@@ -3,11 +3,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import timedelta
 import bcrypt
 
+from backend.config.campuses import get_campus
 from backend.database.db import get_db, User, Allergy as AllergyDB, DietType as DietTypeDB, DiningHall as DiningHallDB
+from backend.database.write_queue import write_queue
 from backend.models.user import UserCreate, User as UserModel, UserUpdate, Token, Allergy, DietType, DiningHall
 from backend.api.dependencies import create_access_token, get_current_active_user, ACCESS_TOKEN_EXPIRE_MINUTES
 
@@ -83,7 +85,7 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         db_user.dining_halls = dining_halls
     
     db.add(db_user)
-    db.commit()
+    write_queue.commit(db)
     db.refresh(db_user)
     return db_user
 
@@ -149,7 +151,7 @@ def update_user(
         dining_halls = db.query(DiningHallDB).filter(DiningHallDB.id.in_(user_update.dining_halls)).all()
         current_user.dining_halls = dining_halls
     
-    db.commit()
+    write_queue.commit(db)
     db.refresh(current_user)
     return current_user
 
@@ -167,6 +169,12 @@ def get_diet_types(db: Session = Depends(get_db)):
 
 
 @router.get("/dining-halls", response_model=List[DiningHall])
-def get_dining_halls(db: Session = Depends(get_db)):
-    """Get all available dining halls."""
-    return db.query(DiningHallDB).all()
+def get_dining_halls(campus: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get all available dining halls, optionally only those of one campus (key or name)."""
+    query = db.query(DiningHallDB)
+    if campus:
+        try:
+            query = query.filter(DiningHallDB.campus == get_campus(campus).key)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return query.all()
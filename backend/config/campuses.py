@@ -0,0 +1,102 @@
+"""Registry of campuses whose dining menus are scraped from NetNutrition.
+
+Every campus has its own NetNutrition site, dining units and politeness
+limits. The scraper, DiningHall seeding and User.campus_name all read from
+this registry. Additional campuses can be registered without code changes in
+a JSON file named by CAMPUS_REGISTRY_PATH:
+
+    [{"key": "ksu", "name": "Kansas State University",
+      "base_url": "https://example.edu/NetNutrition/1",
+      "units": [{"name": "Derby", "location": "Derby Hall", "unit_oid": "4"}],
+      "requests_per_second": 2.0}]
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from backend.config.config import BASE_URL, MAX_REQUESTS_PER_HOST, REQUEST_BURST, REQUESTS_PER_SECOND
+
+CAMPUS_REGISTRY_PATH = os.getenv("CAMPUS_REGISTRY_PATH")
+DEFAULT_CAMPUS = os.getenv("DEFAULT_CAMPUS", "ku")
+
+
+@dataclass(frozen=True)
+class DiningUnit:
+    """A dining hall as listed in a campus's NetNutrition unit tree."""
+    name: str
+    unit_oid: str
+    location: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Campus:
+    """A NetNutrition site and the politeness limits used against it."""
+    key: str
+    name: str
+    base_url: str
+    units: Tuple[DiningUnit, ...] = field(default_factory=tuple)
+    requests_per_second: float = REQUESTS_PER_SECOND
+    request_burst: int = REQUEST_BURST
+    max_requests_per_host: int = MAX_REQUESTS_PER_HOST
+
+
+CAMPUSES: Dict[str, Campus] = {
+    "ku": Campus(
+        key="ku",
+        name="University of Kansas",
+        base_url=BASE_URL,
+        units=(
+            DiningUnit("Mrs. E's", "1", "Lewis Hall"),
+            DiningUnit("The Market", "2", "Kansas Union"),
+            DiningUnit("South Dining Commons", "3", "Oliver Hall"),
+        ),
+    ),
+}
+
+
+def load_campus_registry(path: str) -> Dict[str, Campus]:
+    """
+    Load campuses from a JSON registry file.
+
+    Args:
+        path: JSON file holding a list of campus objects (see the module docstring)
+
+    Returns:
+        Campuses by key
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    campuses = {}
+    for entry in entries:
+        units = tuple(DiningUnit(**unit) for unit in entry.pop("units", []))
+        campus = Campus(units=units, **entry)
+        campuses[campus.key] = campus
+    return campuses
+
+
+if CAMPUS_REGISTRY_PATH:
+    CAMPUSES.update(load_campus_registry(CAMPUS_REGISTRY_PATH))
+
+# Model defaults read the default campus at import time, so fail early and clearly
+if DEFAULT_CAMPUS not in CAMPUSES:
+    raise ValueError(f"DEFAULT_CAMPUS '{DEFAULT_CAMPUS}' is not a registered campus key, expected one of {sorted(CAMPUSES)}")
+
+
+def get_campus(key_or_name: Optional[str] = None) -> Campus:
+    """
+    Look a campus up by key or full name (case-insensitive).
+
+    Args:
+        key_or_name: e.g. "ku" or "University of Kansas"; DEFAULT_CAMPUS if None
+
+    Raises:
+        ValueError: If no registered campus matches
+    """
+    wanted = (key_or_name or DEFAULT_CAMPUS).strip().lower()
+    for campus in CAMPUSES.values():
+        if wanted in (campus.key.lower(), campus.name.lower()):
+            return campus
+    raise ValueError(f"Unknown campus '{key_or_name}', expected one of {sorted(CAMPUSES)}")
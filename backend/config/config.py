@@ -1,4 +1,10 @@
-BASE_URL = "http://netnutrition.union.ku.edu/NetNutrition/7"
+import os
+
+# Override to point the scraper at a replay server (see backend/scraper/replay_server.py)
+BASE_URL = os.getenv("NETNUTRITION_BASE_URL", "http://netnutrition.union.ku.edu/NetNutrition/7")
+
+# Directory where SessionManager records request/response pairs (disabled when unset)
+RECORD_DIR = os.getenv("NETNUTRITION_RECORD_DIR")
 
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
@@ -28,9 +34,83 @@ ENDPOINTS = {
     "nutrition_label": "/NutritionDetail/ShowItemNutritionLabel"
 }
 
+# Concurrency settings
+MAX_CONCURRENCY = 8  # Worker threads used for concurrent nutrition label fetches
+MAX_REQUESTS_PER_HOST = 4  # In-flight requests allowed against a single host
+MAX_HALL_WORKERS = 3  # Dining halls scraped concurrently, each in its own session
+
+# Streaming pipeline settings (see backend/scraper/pipeline.py)
+SCRAPE_HORIZON_DAYS = 7  # Days of menus scraped per dining hall
+# Hours between refreshes by days from today, as (last day offset, hours): today and
+# tomorrow every 4 hours, the next two days twice a day, the rest of the horizon daily
+SCRAPE_REFRESH_HOURS = ((1, 4), (3, 12), (None, 24))
+SCRAPE_DAY_BUDGET = int(os.getenv("SCRAPE_DAY_BUDGET", "0"))  # Most overdue dates refreshed per hall per run (0: all due)
+PIPELINE_QUEUE_SIZE = 8  # Menus buffered between stages; bounds memory and applies backpressure
+PIPELINE_LABEL_WORKERS = 2  # Menus whose labels are fetched at once (labels fan out over MAX_CONCURRENCY)
+PIPELINE_PARSE_WORKERS = 2  # Threads parsing fetched nutrition labels
+PARSE_PROCESSES = int(os.getenv("SCRAPER_PARSE_PROCESSES", "0"))  # Worker processes for HTML parsing (0 parses in threads)
+PERSIST_BATCH_SIZE = 10  # Menus imported per database transaction
+PERSIST_FLUSH_INTERVAL = 2.0  # Seconds before a partial batch is written anyway
+
+# Request pacing and retry settings
+REQUESTS_PER_SECOND = 5.0  # Token bucket refill rate per host (0 disables limiting)
+REQUEST_BURST = 10  # Token bucket capacity per host
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) timeout in seconds
+MAX_RETRIES = 3  # Retries after timeouts, connection errors and retryable statuses
+RETRY_BACKOFF_BASE = 0.5  # Seconds; doubled on every retry, with full jitter
+RETRY_BACKOFF_MAX = 30  # Upper bound for a single backoff delay in seconds
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+SESSION_EXPIRED_STATUS_CODES = (401, 403, 440)  # Treated like a redirect to the homepage: session expired
+
+# Session pool settings
+SESSION_POOL_SIZE = 6  # Independently initialized NetNutrition sessions shared by a scraper run
+
+# Nutrition label cache settings
+NUTRITION_CACHE_PATH = "cache/nutrition_labels.sqlite3"
+NUTRITION_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds before a cached label is refetched
+NUTRITION_CACHE_MAX_ENTRIES = 50000  # Least recently used labels are evicted beyond this
+
+# Scraper scheduling (cron fields: minute hour day month weekday, server local time)
+SCRAPER_SCHEDULER_ENABLED = os.getenv("SCRAPER_SCHEDULER_ENABLED", "false").lower() in ("1", "true", "yes")
+SCRAPE_SCHEDULE = os.getenv("SCRAPE_SCHEDULE", "0 * * * *")  # Hourly; runs only refresh dates that are due
+SCRAPE_LOCK_PATH = "cache/scraper.lock"  # Held by whichever worker process is scraping
+SCRAPE_STATUS_PATH = "cache/scraper_status.json"  # Last/next run, shared by all workers
+
+# HTML parser backend: "lxml", "bs4" or "auto" (lxml when installed)
+HTML_PARSER = "auto"
+
 # Log settings
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 # Output settings
-OUTPUT_DIR = "output"
\ No newline at end of file
+OUTPUT_DIR = "output"  # Legacy per-menu JSON files (convert with python -m backend.scraper.archive)
+ARCHIVE_DIR = "archive"  # Compressed NDJSON menu archive, partitioned by hall and date
+ARCHIVE_COMPRESS_LEVEL = 6
+
+# Bulk import settings (see backend/services/bulk_import.py)
+BULK_IMPORT_BATCH_ROWS = 5000  # Rows per executemany upsert
+BULK_IMPORT_COMMIT_ROWS = 100000  # Rows per transaction
+
+# SQLite settings, applied to every connection (see backend/database/db.py)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers and the writer no longer block each other
+    "synchronous": "NORMAL",  # Safe with WAL; commits skip the fsync until checkpoints
+    "foreign_keys": "ON",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000")),  # Milliseconds a writer waits for the lock
+    "cache_size": -16000,  # Page cache per connection, in KiB when negative
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),  # Bytes of the file read through mmap
+}
+
+# PostgreSQL connection settings (see backend/database/db.py)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))  # API worker processes, as read by uvicorn and gunicorn
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "60"))  # Shared by all processes; keep below the server's max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0"))  # Connections kept open per process (0: derived from the two above)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "-1"))  # Extra connections per process under load (-1: derived)
+DB_POOL_TIMEOUT = 10  # Seconds a request waits for a free connection before failing
+DB_POOL_RECYCLE = 1800  # Seconds before a connection is replaced, ahead of server and proxy idle timeouts
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # Server-side limit per statement (0: none)
+
+# Menu item search settings (see backend/services/search.py)
+SEARCH_PAGE_SIZE = 20  # Results per page unless the request asks for another limit
+SEARCH_MAX_PAGE_SIZE = 100
@@ -1,54 +1,174 @@
 """Database connection setup and ORM models for the KU Food Planner app."""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Table, DateTime, Text
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, ForeignKey, Table, DateTime, Text, Index, UniqueConstraint, inspect, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import AddConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+from typing import Dict, Iterable, List, Union
+import json
 import os
 from pathlib import Path
 
+from backend.config.campuses import CAMPUSES, DEFAULT_CAMPUS, get_campus
+from backend.config.config import (
+    DB_MAX_CONNECTIONS, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_STATEMENT_TIMEOUT_MS,
+    SQLITE_PRAGMAS, WEB_CONCURRENCY
+)
+
 # Create the database directory if it doesn't exist
 db_dir = Path(__file__).parent.parent.parent / "data"
 db_dir.mkdir(exist_ok=True)
 
+
+def normalize_database_url(url: str) -> str:
+    """
+    Select the psycopg (3) driver for PostgreSQL URLs without an explicit driver.
+    
+    SQLAlchemy before 2.1 maps plain postgresql:// URLs to psycopg2, which is
+    not installed. postgres://, the spelling used by several hosting
+    providers, is not accepted by SQLAlchemy at all.
+    """
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    return url
+
+
 # Database URL
-DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{db_dir}/ku_food_planner.db")
+DATABASE_URL = normalize_database_url(os.getenv("DATABASE_URL", f"sqlite:///{db_dir}/ku_food_planner.db"))
+
+
+def engine_options(url: str) -> dict:
+    """
+    create_engine options for a database URL.
+    
+    SQLite needs none beyond the per-connection pragmas. On PostgreSQL every
+    process (each API worker plus the scraper) gets an equal share of
+    DB_MAX_CONNECTIONS, half kept open and half as overflow; connections are
+    checked before use and recycled, and statements time out server-side.
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    
+    share = max(2, DB_MAX_CONNECTIONS // (WEB_CONCURRENCY + 1))
+    pool_size = DB_POOL_SIZE or (share + 1) // 2
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": DB_MAX_OVERFLOW if DB_MAX_OVERFLOW >= 0 else max(share - pool_size, 0),
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
 
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Association tables for many-to-many relationships
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS (WAL, busy timeout, foreign keys, ...) to every new SQLite connection."""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+# Numeric nutrient columns of MenuItem and the unit each is stored in,
+# parsed once from the label strings at import time
+NUTRIENT_COLUMNS = {
+    "total_fat_g": "g",
+    "saturated_fat_g": "g",
+    "trans_fat_g": "g",
+    "cholesterol_mg": "mg",
+    "sodium_mg": "mg",
+    "total_carbohydrate_g": "g",
+    "dietary_fiber_g": "g",
+    "total_sugars_g": "g",
+    "protein_g": "g",
+}
+
+
+def menu_date_key(day) -> int:
+    """Integer day key (YYYYMMDD) of a date or datetime, as stored in MenuItem.date_key."""
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def split_allergens(value: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Allergen names from any form they were scraped or stored in.
+    
+    Accepts the label text ("Eggs, Milk", "None"), a JSON list (the canonical
+    stored form), a JSON-encoded label string (stored by older imports) or a
+    list of names.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        if isinstance(value, str):
+            value = value.split(",")
+        elif not isinstance(value, list):
+            return []
+    names = (str(name).strip() for name in value)
+    return [name for name in names if name and name.lower() != "none"]
+
+
+def encode_allergens(value: Union[str, Iterable[str], None]) -> str:
+    """Canonical stored form of allergens: a JSON list of names, e.g. '["Eggs", "Milk"]'."""
+    return json.dumps(split_allergens(value))
+
+
+def _default_date_key(context):
+    menu_date = context.get_current_parameters().get("date")
+    return menu_date_key(menu_date) if menu_date else None
+
+# Association tables for many-to-many relationships, keyed on both sides so
+# loading a user's or meal plan's collection is an index lookup
 user_allergy = Table(
     "user_allergy",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("allergy_id", Integer, ForeignKey("allergies.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("allergy_id", Integer, ForeignKey("allergies.id"), primary_key=True),
 )
 
 user_diet_type = Table(
     "user_diet_type",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("diet_type_id", Integer, ForeignKey("diet_types.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("diet_type_id", Integer, ForeignKey("diet_types.id"), primary_key=True),
 )
 
 user_dining_hall = Table(
     "user_dining_hall",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("dining_hall_id", Integer, ForeignKey("dining_halls.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("dining_hall_id", Integer, ForeignKey("dining_halls.id"), primary_key=True),
 )
 
 mealplan_item = Table(
     "mealplan_item",
     Base.metadata,
-    Column("mealplan_id", Integer, ForeignKey("mealplans.id")),
-    Column("menu_item_id", Integer, ForeignKey("menu_items.id")),
+    Column("mealplan_id", Integer, ForeignKey("mealplans.id"), primary_key=True),
+    Column("menu_item_id", Integer, ForeignKey("menu_items.id"), primary_key=True),
     Column("servings", Float, default=1.0),
 )
 
+ASSOCIATION_TABLES = (user_allergy, user_diet_type, user_dining_hall, mealplan_item)
+
 
 # ORM Models
 class User(Base):
@@ -73,7 +193,7 @@ class User(Base):
     workout_type = Column(String, nullable=True)  # 'cardio', 'strength', 'sports', 'mixed'
     
     # Meal plan details
-    campus_name = Column(String, default="University of Kansas")
+    campus_name = Column(String, default=get_campus().name)
     meal_plan_type = Column(String)  # 'unlimited', 'fixed_swipes', 'points_only', 'combination'
     cooking_availability = Column(String)  # 'none', 'microwave', 'limited', 'full'
     
@@ -116,24 +236,31 @@ class DiningHall(Base):
     __tablename__ = "dining_halls"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True)
+    campus = Column(String, index=True, default=DEFAULT_CAMPUS)  # Key in the campus registry
+    name = Column(String, index=True)
     location = Column(String, nullable=True)
-    unit_oid = Column(String, unique=True)  # OID from the scraper
+    unit_oid = Column(String)  # OID from the scraper, unique within the campus's NetNutrition site
     
     # Relationships
     users = relationship("User", secondary=user_dining_hall, back_populates="dining_halls")
     menu_items = relationship("MenuItem", back_populates="dining_hall")
 
+    __table_args__ = (
+        UniqueConstraint("campus", "name", name="uq_dining_halls_campus_name"),
+        UniqueConstraint("campus", "unit_oid", name="uq_dining_halls_campus_unit"),
+    )
+
 
 class MenuItem(Base):
     """Menu item model for storing scraped menu items."""
     __tablename__ = "menu_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    item_oid = Column(String, unique=True, index=True)
+    item_oid = Column(String, index=True)  # The same item is served at many meals, days and halls
     name = Column(String, index=True)
     category = Column(String, index=True)
     date = Column(DateTime, index=True)
+    date_key = Column(Integer, default=_default_date_key)  # menu_date_key(date); day filters are equality lookups
     meal_type = Column(String, index=True)
     dining_hall_id = Column(Integer, ForeignKey("dining_halls.id"))
     
@@ -143,87 +270,69 @@ class MenuItem(Base):
     _nutrients = Column("nutrients", Text, nullable=True)  # JSON string
     _allergens = Column("allergens", Text, nullable=True)  # JSON string
     
+    # Numeric nutrients (see NUTRIENT_COLUMNS), for SQL totals and filters
+    total_fat_g = Column(Float, nullable=True, index=True)
+    saturated_fat_g = Column(Float, nullable=True)
+    trans_fat_g = Column(Float, nullable=True)
+    cholesterol_mg = Column(Float, nullable=True)
+    sodium_mg = Column(Float, nullable=True, index=True)
+    total_carbohydrate_g = Column(Float, nullable=True, index=True)
+    dietary_fiber_g = Column(Float, nullable=True)
+    total_sugars_g = Column(Float, nullable=True)
+    protein_g = Column(Float, nullable=True, index=True)
+    
     # Relationships
     dining_hall = relationship("DiningHall", back_populates="menu_items")
     meal_plans = relationship("MealPlan", secondary=mealplan_item, back_populates="menu_items")
     
+    __table_args__ = (
+        UniqueConstraint("item_oid", "date", "meal_type", "dining_hall_id", name="uq_menu_items_menu_item"),
+        # A day's meals across halls (meal plans, /items/?date=) and a hall's days (/items/dining-halls/{id})
+        Index("ix_menu_items_day_meal_hall", "date_key", "meal_type", "dining_hall_id"),
+        Index("ix_menu_items_hall_day_meal", "dining_hall_id", "date_key", "meal_type"),
+    )
+    
+    # Decoded nutrients and allergens are cached on the instance together with the
+    # raw column value they were decoded from; a new value (set or reloaded) is
+    # decoded again on next access. Treat the returned dict and list as read-only.
+    
     @property
-    def nutrients(self):
-        if not self._nutrients:
-            return {}
-        try:
-            import json
-            return json.loads(self._nutrients)
-        except:
-            return {}
+    def nutrients(self) -> Dict[str, str]:
+        raw = self._nutrients
+        cached = self.__dict__.get("_nutrients_decoded")
+        if cached is None or cached[0] is not raw:
+            try:
+                decoded = json.loads(raw) if raw else {}
+            except ValueError:
+                decoded = {}
+            cached = (raw, decoded if isinstance(decoded, dict) else {})
+            self.__dict__["_nutrients_decoded"] = cached
+        return cached[1]
     
     @nutrients.setter
     def nutrients(self, value):
-        if value is None:
-            self._nutrients = None
-        else:
+        if isinstance(value, str):
             try:
-                if isinstance(value, str):
-                    # Verify it's valid JSON
-                    import json
-                    json.loads(value)
-                    self._nutrients = value
-                else:
-                    self._nutrients = json.dumps(value)
-            except:
-                self._nutrients = None
+                value = json.loads(value)
+            except ValueError:
+                value = None
+        self._nutrients = json.dumps(value) if isinstance(value, dict) else None
+        # Decoded from the stored JSON rather than the caller's dict, which the caller may go on to change
+        self.__dict__["_nutrients_decoded"] = (self._nutrients, json.loads(self._nutrients) if self._nutrients else {})
     
     @property
-    def allergens(self):
-        if not self._allergens:
-            return []
-        try:
-            if isinstance(self._allergens, str):
-                if ',' in self._allergens:
-                    return [allergen.strip() for allergen in self._allergens.split(',') if allergen.strip()]
-                elif self._allergens.strip():
-                    # Handle single allergen without commas
-                    try:
-                        import json
-                        parsed = json.loads(self._allergens)
-                        if isinstance(parsed, list):
-                            return parsed
-                        else:
-                            # If it's not a list after JSON parsing, treat as a single allergen
-                            return [self._allergens.strip()]
-                    except:
-                        # If it's not valid JSON, treat as a single allergen
-                        return [self._allergens.strip()]
-                else:
-                    return []
-            elif isinstance(self._allergens, list):
-                return self._allergens
-            else:
-                return []
-        except:
-            return []
+    def allergens(self) -> List[str]:
+        raw = self._allergens
+        cached = self.__dict__.get("_allergens_decoded")
+        if cached is None or cached[0] is not raw:
+            cached = (raw, split_allergens(raw))
+            self.__dict__["_allergens_decoded"] = cached
+        return cached[1]
     
     @allergens.setter
     def allergens(self, value):
-        if value is None:
-            self._allergens = None
-        else:
-            try:
-                if isinstance(value, str):
-                    if ',' in value:
-                        self._allergens = value
-                    else:
-                        # Verify it's valid JSON
-                        import json
-                        json.loads(value)
-                        self._allergens = value
-                else:
-                    if all(isinstance(x, str) for x in value):
-                        self._allergens = ','.join(value)
-                    else:
-                        self._allergens = json.dumps(value)
-            except:
-                self._allergens = None
+        self._allergens = None if value is None else encode_allergens(value)
+        self.__dict__["_allergens_decoded"] = (self._allergens, split_allergens(value))
 
 
 class MealPlan(Base):
@@ -251,6 +360,30 @@ class MealPlan(Base):
     menu_items = relationship("MenuItem", secondary=mealplan_item, back_populates="meal_plans")
 
 
+class ScrapeState(Base):
+    """Scrape state model recording the item panel last scraped for each menu."""
+    __tablename__ = "scrape_state"
+    __table_args__ = (
+        UniqueConstraint("dining_hall_id", "date", "meal_type", "menu_oid", name="uq_scrape_state_menu"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    dining_hall_id = Column(Integer, ForeignKey("dining_halls.id"))
+    date = Column(String)  # Date as shown on the site, e.g. "Monday, March 31, 2025"
+    meal_type = Column(String)
+    menu_oid = Column(String)
+    
+    panel_hash = Column(String)  # SHA-256 of the item panel HTML
+    item_count = Column(Integer, default=0)
+    last_scraped_at = Column(DateTime, default=datetime.utcnow)
+
+
+def lift_statement_timeout(connection):
+    """Allow long-running maintenance statements for the rest of a PostgreSQL transaction."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL statement_timeout = 0"))
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -263,6 +396,222 @@ def get_db():
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    migrate_db()
+
+
+def schema_exists() -> bool:
+    """
+    Whether init_db has created every table, e.g. before a dry run reads the database.
+    
+    A missing SQLite file is not created by the check.
+    """
+    url = engine.url
+    in_file = url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+    if in_file and not os.path.exists(url.database):
+        return False
+    return set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+
+
+def migrate_db():
+    """
+    Bring an existing database up to date with the models.
+    
+    create_all only creates missing tables, so columns, keys and indexes
+    added to existing tables are migrated here, and new columns backfilled.
+    """
+    # Before anything loads MenuItem rows through the ORM
+    _migrate_menu_item_date_key()
+    _migrate_nutrient_columns()
+    _migrate_allergen_format()
+    _migrate_dining_hall_campus()
+    # item_oid used to be unique on its own, so an item could only ever be on one menu
+    _migrate_unique_constraints(MenuItem.__table__)
+    for table in ASSOCIATION_TABLES:
+        _migrate_primary_key(table)
+    _migrate_indexes()
+    # Last: rebuilding menu_items above drops the search index's triggers
+    _migrate_search_index()
+
+
+def _migrate_nutrient_columns():
+    from backend.services.nutrition import nutrient_columns
+    
+    existing = {column["name"] for column in inspect(engine).get_columns(MenuItem.__tablename__)}
+    missing = [column for column in NUTRIENT_COLUMNS if column not in existing]
+    if not missing:
+        return
+    
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        for column in missing:
+            connection.execute(text(f"ALTER TABLE {MenuItem.__tablename__} ADD COLUMN {column} FLOAT"))
+        for index in MenuItem.__table__.indexes:
+            if any(column.name in missing for column in index.columns):
+                index.create(connection, checkfirst=True)
+    
+    # Parse the stored label strings of existing items into the new columns
+    db = SessionLocal()
+    try:
+        for item in db.query(MenuItem).filter(MenuItem._nutrients.isnot(None)).yield_per(1000):
+            for column, value in nutrient_columns(item.nutrients).items():
+                setattr(item, column, value)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _migrate_allergen_format():
+    """Rewrite allergens stored as comma-separated or JSON-encoded label text as JSON lists."""
+    table = MenuItem.__table__
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        # Canonical values are JSON lists; the few distinct legacy values are rewritten one set at a time
+        legacy = connection.execute(
+            select(table.c.allergens).distinct().where(table.c.allergens.notlike("[%"))
+        ).scalars().all()
+        for value in legacy:
+            connection.execute(
+                table.update().where(table.c.allergens == value).values(allergens=encode_allergens(value))
+            )
+
+
+def _migrate_dining_hall_campus():
+    existing = {column["name"] for column in inspect(engine).get_columns(DiningHall.__tablename__)}
+    if "campus" not in existing:
+        # Halls from before the campus registry all belong to the default campus
+        with engine.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {DiningHall.__tablename__} ADD COLUMN campus VARCHAR"))
+            connection.execute(text(f"UPDATE {DiningHall.__tablename__} SET campus = :campus"), {"campus": DEFAULT_CAMPUS})
+    
+    # Hall names and unit OIDs used to be unique globally, now only within a campus
+    _migrate_unique_constraints(DiningHall.__table__)
+
+
+def _migrate_unique_constraints(table: Table):
+    """
+    Replace a table's unique constraints (and unique indexes) with the ones its model declares.
+    
+    SQLite cannot drop constraints, so there the table is rebuilt (see
+    _rebuild_sqlite_table).
+    """
+    inspector = inspect(engine)
+    wanted = {
+        tuple(column.name for column in constraint.columns)
+        for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+    }
+    constraints = inspector.get_unique_constraints(table.name)
+    # PostgreSQL also lists the index backing each unique constraint
+    unique_indexes = [
+        index for index in inspector.get_indexes(table.name)
+        if index["unique"] and not index.get("duplicates_constraint")
+    ]
+    existing = {tuple(unique["column_names"]) for unique in constraints + unique_indexes}
+    if existing == wanted:
+        return
+    
+    if engine.dialect.name == "sqlite":
+        _rebuild_sqlite_table(table)
+        return
+    
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        for constraint in constraints:
+            if tuple(constraint["column_names"]) not in wanted:
+                connection.execute(text(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{constraint["name"]}"'))
+        for index in unique_indexes:
+            if tuple(index["column_names"]) not in wanted:
+                connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and tuple(column.name for column in constraint.columns) not in existing:
+                connection.execute(AddConstraint(constraint))
+        # Indexes that were dropped for being unique come back as plain ones
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _migrate_primary_key(table: Table):
+    """Give a table the primary key its model declares, dropping rows that duplicate a key."""
+    wanted = [column.name for column in table.primary_key.columns]
+    if inspect(engine).get_pk_constraint(table.name)["constrained_columns"] == wanted:
+        return
+    
+    if engine.dialect.name == "sqlite":
+        _rebuild_sqlite_table(table)
+        return
+    
+    matching = " AND ".join(f'a."{column}" = b."{column}"' for column in wanted)
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        connection.execute(text(f'DELETE FROM "{table.name}" a USING "{table.name}" b WHERE a.ctid < b.ctid AND {matching}'))
+        connection.execute(AddConstraint(table.primary_key))
+
+
+def _migrate_menu_item_date_key():
+    table = MenuItem.__table__
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        if "date_key" not in existing:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN date_key INTEGER"))
+        
+        # One set-based UPDATE per day still missing its key
+        missing = connection.execute(
+            select(table.c.date).distinct().where(table.c.date_key.is_(None), table.c.date.isnot(None))
+        ).scalars().all()
+        for day in missing:
+            connection.execute(
+                table.update().where(table.c.date == day, table.c.date_key.is_(None)).values(date_key=menu_date_key(day))
+            )
+
+
+def _migrate_indexes():
+    """Create the models' indexes that an existing database is missing."""
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def _migrate_search_index():
+    from backend.services.search import create_search_index
+    
+    create_search_index(engine)
+
+
+def _rebuild_sqlite_table(table: Table):
+    """
+    Rebuild a SQLite table with its model's schema, keeping its rows.
+    
+    SQLite cannot drop or add constraints, so a copy is created with the
+    model's schema, the rows are copied over (rows that would break a new
+    key are dropped), and the copy takes the original's place.
+    """
+    inspector = inspect(engine)
+    columns = [column["name"] for column in inspector.get_columns(table.name)]
+    copied = ", ".join(f'"{column.name}"' for column in table.columns if column.name in columns)
+    with engine.connect() as connection:
+        # Must be set outside the transaction; dropping the old table must not touch referencing rows
+        connection.execute(text("PRAGMA foreign_keys=OFF"))
+        connection.commit()
+        with connection.begin():
+            for index in inspector.get_indexes(table.name):
+                connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+            
+            rebuilt = table.to_metadata(Base.metadata, name=f"_{table.name}_rebuilt")
+            # Indexes are created under their real names once the copy is renamed
+            rebuilt.indexes.clear()
+            try:
+                rebuilt.create(connection)
+                connection.execute(text(f'INSERT OR IGNORE INTO "{rebuilt.name}" ({copied}) SELECT {copied} FROM "{table.name}"'))
+                connection.execute(text(f'DROP TABLE "{table.name}"'))
+                connection.execute(text(f'ALTER TABLE "{rebuilt.name}" RENAME TO "{table.name}"'))
+            finally:
+                Base.metadata.remove(rebuilt)
+            for index in table.indexes:
+                index.create(connection)
+    # The connection that renamed the table can keep a stale view of its constraints
+    engine.dispose()
 
 
 def seed_initial_data():
@@ -289,11 +638,11 @@ def seed_initial_data():
         {"name": "Egg allergy", "description": "Allergy to eggs"}
     ]
     
-    # Seed dining halls
+    # Seed dining halls from the campus registry
     dining_halls = [
-        {"name": "Mrs. E's", "location": "Lewis Hall", "unit_oid": "1"},
-        {"name": "The Market", "location": "Kansas Union", "unit_oid": "2"},
-        {"name": "South Dining Commons", "location": "Oliver Hall", "unit_oid": "3"}
+        {"campus": campus.key, "name": unit.name, "location": unit.location, "unit_oid": unit.unit_oid}
+        for campus in CAMPUSES.values()
+        for unit in campus.units
     ]
     
     # Insert diet types if they don't exist
@@ -308,7 +657,10 @@ def seed_initial_data():
     
     # Insert dining halls if they don't exist
     for dining_hall in dining_halls:
-        if not db.query(DiningHall).filter(DiningHall.name == dining_hall["name"]).first():
+        if not db.query(DiningHall).filter(
+            DiningHall.campus == dining_hall["campus"],
+            DiningHall.unit_oid == dining_hall["unit_oid"]
+        ).first():
             db.add(DiningHall(**dining_hall))
     
     db.commit()
@@ -0,0 +1,130 @@
+"""Check that the hot queries are served by indexes.
+
+Usage:
+    python -m backend.database.explain
+    DATABASE_URL=postgresql://... python -m backend.database.explain
+
+Runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) for the queries behind meal plan
+generation, the /items endpoints and the association table lookups against
+the configured database, prints each plan and exits non-zero if any of them
+scans a table instead of searching the expected index. On PostgreSQL
+sequential scans are disabled for the check, since the planner rightly
+prefers them on small tables.
+
+backend/tests/test_query_plans.py runs the same check on a new and on a
+migrated SQLite database.
+"""
+
+import re
+import sys
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from backend.database.db import (
+    MenuItem, engine, init_db, mealplan_item, menu_date_key, user_allergy, user_diet_type, user_dining_hall
+)
+
+DAY = menu_date_key(date.today())
+MENU_INDEXES = ("ix_menu_items_day_meal_hall", "ix_menu_items_hall_day_meal")
+PRIMARY_KEY = ()
+
+# Name, statement and the indexes either of which may serve it
+HOT_QUERIES: List[Tuple[str, Callable, Tuple[str, ...]]] = [
+    (
+        "meal plan: day, meal types and halls",
+        lambda: select(MenuItem).where(
+            MenuItem.date_key == DAY,
+            MenuItem.meal_type.in_(["BREAKFAST", "LUNCH", "DINNER"]),
+            MenuItem.dining_hall_id.in_([1, 2])
+        ),
+        MENU_INDEXES,
+    ),
+    (
+        "/items/?date=&meal_type=",
+        lambda: select(MenuItem).where(MenuItem.date_key == DAY, MenuItem.meal_type == "LUNCH"),
+        ("ix_menu_items_day_meal_hall",),
+    ),
+    (
+        "/items/dining-halls/{id}",
+        lambda: select(MenuItem).where(MenuItem.dining_hall_id == 1),
+        ("ix_menu_items_hall_day_meal",),
+    ),
+    (
+        "/items/dining-halls/{id}?date=&meal_type=",
+        lambda: select(MenuItem).where(
+            MenuItem.dining_hall_id == 1, MenuItem.date_key == DAY, MenuItem.meal_type == "LUNCH"
+        ),
+        MENU_INDEXES,
+    ),
+    ("meal plan items", lambda: select(mealplan_item).where(mealplan_item.c.mealplan_id == 1), PRIMARY_KEY),
+    ("user allergies", lambda: select(user_allergy).where(user_allergy.c.user_id == 1), PRIMARY_KEY),
+    ("user diet types", lambda: select(user_diet_type).where(user_diet_type.c.user_id == 1), PRIMARY_KEY),
+    ("user dining halls", lambda: select(user_dining_hall).where(user_dining_hall.c.user_id == 1), PRIMARY_KEY),
+]
+
+
+def explain(connection: Connection, statement) -> List[str]:
+    """The plan of a statement as lines of text."""
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.execute(text(f"EXPLAIN {compiled}")).all()]
+
+
+def uses_index(plan: List[str], index_names: Tuple[str, ...], dialect_name: str) -> bool:
+    """Whether a plan searches one of the given indexes (a primary key if none are given) and scans nothing."""
+    if dialect_name == "sqlite":
+        if any(line.startswith("SCAN") for line in plan):
+            return False
+        if not index_names:
+            return any("PRIMARY KEY" in line or "sqlite_autoindex" in line for line in plan)
+        return any(f"INDEX {index_name} " in line for line in plan for index_name in index_names)
+
+    if any("Seq Scan" in line for line in plan):
+        return False
+    if not index_names:
+        return any("_pkey" in line for line in plan)
+    # "Index Scan using <index> on <table>" or "Bitmap Index Scan on <index>"
+    return any(
+        re.search(rf"(using|on) {re.escape(index_name)}\b", line)
+        for line in plan for index_name in index_names
+    )
+
+
+def check_plans() -> Dict[str, bool]:
+    """
+    Explain every hot query.
+
+    Returns:
+        Query name to whether it is served by its expected index
+    """
+    results = {}
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SET enable_seqscan = off"))
+        for name, statement, index_names in HOT_QUERIES:
+            plan = explain(connection, statement())
+            results[name] = uses_index(plan, index_names, connection.dialect.name)
+            print(f"{'ok  ' if results[name] else 'FAIL'} {name}")
+            for line in plan:
+                print(f"       {line}")
+    return results
+
+
+def main() -> int:
+    init_db()
+    results = check_plans()
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"{len(failed)} of {len(results)} hot queries are not served by their index", file=sys.stderr)
+        return 1
+    print(f"All {len(results)} hot queries are served by their index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
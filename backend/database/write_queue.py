@@ -0,0 +1,97 @@
+"""Single-writer queue serializing database writes on SQLite.
+
+SQLite allows one writer at a time. In WAL mode readers never wait for it,
+but concurrent writers in one process (API requests saving meal plans and
+profiles on the server's thread pool, or a scraper run's persist stages, one
+per campus) still queue up on the database lock, and fail with "database is
+locked" once a long write outlasts the busy timeout. WriteQueue hands every
+write to one dedicated thread instead, so writes from the same process never
+contend with each other; busy_timeout only has to cover the short batches
+written by other processes, such as the scheduled scraper run.
+
+On other databases writes run directly in the calling thread.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from backend.database.db import engine
+
+T = TypeVar("T")
+
+
+class WriteQueue:
+    """Runs database writes one at a time on a dedicated writer thread."""
+
+    def __init__(self, serialize: bool = True):
+        """
+        Args:
+            serialize: Whether to run writes on the writer thread; if False they run in the caller
+        """
+        self.serialize = serialize
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer_thread: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _record_writer_thread(self) -> None:
+        self._writer_thread = threading.get_ident()
+
+    def submit(self, write: Callable[..., T], *args, **kwargs) -> "Future[T]":
+        """
+        Queue a write behind every write submitted before it.
+
+        Args:
+            write: Callable doing the write, including its commit or rollback
+            *args, **kwargs: Passed to ``write``
+
+        Returns:
+            Future of the callable's result or exception
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="db-writer",
+                    initializer=self._record_writer_thread
+                )
+        return self._executor.submit(write, *args, **kwargs)
+
+    def run(self, write: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a write on the writer thread and wait for it.
+
+        Writes issued from the writer thread itself run inline, so a queued
+        write can call code that writes through the queue again.
+
+        Raises:
+            Whatever ``write`` raises
+        """
+        if not self.serialize or threading.get_ident() == self._writer_thread:
+            return write(*args, **kwargs)
+        return self.submit(write, *args, **kwargs).result()
+
+    def commit(self, db: Session) -> None:
+        """
+        Commit a session on the writer thread.
+
+        The session's pending changes are flushed as part of the commit, so
+        a request handler can build its changes as usual and only hand over
+        the commit. The caller must not use the session meanwhile, which
+        holds since it waits for the commit.
+        """
+        self.run(db.commit)
+
+    def close(self) -> None:
+        """Finish queued writes and stop the writer thread."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._writer_thread = None
+
+
+# Shared by everything in this process that writes to the database
+write_queue = WriteQueue(serialize=engine.dialect.name == "sqlite")
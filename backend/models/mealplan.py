@@ -16,6 +16,17 @@ class MenuItemBase(BaseModel):
     calories: Optional[int] = None
     nutrients: Optional[Dict[str, Any]] = None
     allergens: Optional[List[str]] = None
+    
+    # Numeric nutrients parsed from the label at import time
+    total_fat_g: Optional[float] = None
+    saturated_fat_g: Optional[float] = None
+    trans_fat_g: Optional[float] = None
+    cholesterol_mg: Optional[float] = None
+    sodium_mg: Optional[float] = None
+    total_carbohydrate_g: Optional[float] = None
+    dietary_fiber_g: Optional[float] = None
+    total_sugars_g: Optional[float] = None
+    protein_g: Optional[float] = None
 
 
 class MenuItemCreate(MenuItemBase):
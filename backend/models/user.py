@@ -4,6 +4,8 @@ from pydantic import BaseModel, EmailStr, Field, validator
 from typing import List, Optional
 from enum import Enum
 
+from backend.config.campuses import DEFAULT_CAMPUS, get_campus
+
 
 class Gender(str, Enum):
     MALE = "male"
@@ -82,6 +84,7 @@ class DietType(DietTypeBase):
 
 
 class DiningHallBase(BaseModel):
+    campus: str = DEFAULT_CAMPUS
     name: str
     location: Optional[str] = None
     unit_oid: str
@@ -115,7 +118,7 @@ class UserBase(BaseModel):
     workout_type: Optional[WorkoutType] = None
     
     # Meal plan details
-    campus_name: str = "University of Kansas"
+    campus_name: str = get_campus().name
     meal_plan_type: MealPlanType
     cooking_availability: CookingAvailability
     
@@ -134,6 +137,11 @@ class UserCreate(UserBase):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters')
         return v
+    
+    @validator('campus_name')
+    def registered_campus(cls, v):
+        # Accepts a campus key or name; stores the campus's full name
+        return get_campus(v).name
 
 
 class UserUpdate(BaseModel):
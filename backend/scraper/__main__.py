@@ -0,0 +1,85 @@
+"""Command-line entry point for the menu scraper.
+
+Usage:
+    python -m backend.scraper
+    python -m backend.scraper --halls 1 "Mrs. E's" --days 2 --meals lunch dinner
+    python -m backend.scraper --dry-run --concurrency 4
+    python -m backend.scraper --parse-processes 4
+    python -m backend.scraper --campuses ku
+
+Runs in its own process, separate from the API, and reports live progress
+(menus/sec, labels/sec and bytes downloaded) on stderr. Campuses from the
+registry (backend/config/campuses.py) are scraped concurrently.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from backend.config.config import (
+    LOG_LEVEL, LOG_FORMAT, MAX_CONCURRENCY, PARSE_PROCESSES, SCRAPE_DAY_BUDGET, SCRAPE_HORIZON_DAYS
+)
+from backend.database import db
+from backend.scraper.runner import ProgressReporter, run_scraper
+from backend.scraper.stats import ScrapeStats
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Scrape dining hall menus and nutrition labels")
+    arg_parser.add_argument("--campuses", nargs="*", help="Campus keys or names (default: all registered)")
+    arg_parser.add_argument("--halls", nargs="*", help="Dining hall ids or names (default: all)")
+    arg_parser.add_argument("--days", type=int, default=SCRAPE_HORIZON_DAYS, help="Menu dates considered per hall")
+    arg_parser.add_argument(
+        "--budget", type=int, default=SCRAPE_DAY_BUDGET,
+        help="Most overdue dates refreshed per hall (default: every date that is due)"
+    )
+    arg_parser.add_argument("--meals", nargs="*", help="Meal types to scrape, e.g. breakfast lunch (default: all)")
+    arg_parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY, help="Concurrent label fetches")
+    arg_parser.add_argument(
+        "--parse-processes", type=int, default=PARSE_PROCESSES,
+        help="Worker processes for HTML parsing (default: 0, parse in threads)"
+    )
+    arg_parser.add_argument(
+        "--dry-run", action="store_true", help="Scrape and parse without writing to the database, archive or label cache"
+    )
+    arg_parser.add_argument("--force", action="store_true", help="Re-scrape every date, even if fresh or unchanged")
+    arg_parser.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between progress lines")
+    arg_parser.add_argument("--no-progress", action="store_true", help="Disable progress reporting")
+    arg_parser.add_argument("--json", action="store_true", help="Print final counters as JSON on stdout")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, LOG_LEVEL.upper()), format=LOG_FORMAT, stream=sys.stderr)
+
+    # A dry run only reads the database, and only if it already exists
+    if not args.dry_run:
+        db.init_db()
+        db.seed_initial_data()
+
+    stats = ScrapeStats()
+    progress = None if args.no_progress else ProgressReporter(stats, args.progress_interval)
+    run_scraper(
+        force=args.force,
+        halls=args.halls,
+        days=args.days,
+        day_budget=args.budget,
+        meal_types=args.meals,
+        concurrency=args.concurrency,
+        parse_processes=args.parse_processes,
+        dry_run=args.dry_run,
+        progress=progress,
+        stats=stats,
+        campuses=args.campuses
+    )
+    # Close pooled connections, so SQLite checkpoints and removes its WAL file
+    db.engine.dispose()
+
+    if args.json:
+        print(json.dumps(stats.as_dict()))
+    else:
+        print(stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
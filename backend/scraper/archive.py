@@ -0,0 +1,245 @@
+"""Append-only, compressed archive of scraped menus.
+
+Menus are stored as gzip-compressed newline-delimited JSON, one record per
+menu item, partitioned by dining hall and date::
+
+    archive/<dining_hall_id>/<YYYY-MM-DD>.ndjson.gz
+
+Every append adds a new gzip member to the end of the file, which gzip
+readers decompress as one continuous stream, so existing data is never
+rewritten. Readers stream records line by line without loading whole files.
+
+Usage:
+    python -m backend.scraper.archive convert output --archive archive
+    python -m backend.scraper.archive dump --hall 1 --start 2025-03-31
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import zlib
+from datetime import date, datetime
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.config.config import ARCHIVE_DIR, ARCHIVE_COMPRESS_LEVEL, OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+SITE_DATE_FORMAT = "%A, %B %d, %Y"
+ARCHIVE_SUFFIX = ".ndjson.gz"
+
+_append_lock = threading.Lock()
+
+
+def menu_date(date_str: str) -> date:
+    """Parse a NetNutrition menu date such as "Monday, March 31, 2025"."""
+    return datetime.strptime(date_str, SITE_DATE_FORMAT).date()
+
+
+def archive_path(dining_hall_id: int, menu_day: date, archive_dir: str = ARCHIVE_DIR) -> str:
+    """Path of the partition holding one dining hall's menus for one day."""
+    return os.path.join(archive_dir, str(dining_hall_id), f"{menu_day.isoformat()}{ARCHIVE_SUFFIX}")
+
+
+def menu_records(menu_data: Dict) -> Iterator[Dict]:
+    """Flatten a menu (as built by the scraper) into one archive record per item."""
+    for item in menu_data.get("items", []):
+        yield {
+            "dining_hall_id": menu_data["dining_hall_id"],
+            "date": menu_data["date"],
+            "meal_type": menu_data["meal_type"],
+            "name": item.get("name"),
+            "category": item.get("category"),
+            "nutrition": item.get("nutrition", {})
+        }
+
+
+def append_menus(menus: Iterable[Dict], archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    Append menus to their partitions, one gzip member per partition touched.
+
+    Args:
+        menus: Menu dicts with dining_hall_id, date, meal_type and items
+        archive_dir: Archive root directory
+
+    Returns:
+        Number of item records written
+    """
+    partitions: Dict[str, List[bytes]] = {}
+    for menu_data in menus:
+        path = archive_path(menu_data["dining_hall_id"], menu_date(menu_data["date"]), archive_dir)
+        lines = partitions.setdefault(path, [])
+        for record in menu_records(menu_data):
+            lines.append(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    written = 0
+    with _append_lock:
+        for path, lines in partitions.items():
+            if not lines:
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, "ab", compresslevel=ARCHIVE_COMPRESS_LEVEL) as f:
+                f.writelines(lines)
+            written += len(lines)
+    return written
+
+
+def _partition_day(path: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(os.path.basename(path)[:-len(ARCHIVE_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def archive_files(
+    archive_dir: str = ARCHIVE_DIR,
+    dining_hall_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> List[str]:
+    """List partition files, optionally restricted to a hall and an inclusive date range."""
+    hall = str(dining_hall_id) if dining_hall_id is not None else "*"
+    files = []
+    for path in sorted(glob.glob(os.path.join(archive_dir, hall, f"*{ARCHIVE_SUFFIX}"))):
+        day = _partition_day(path)
+        if day is None or (start and day < start) or (end and day > end):
+            continue
+        files.append(path)
+    return files
+
+
+def iter_records(
+    archive_dir: str = ARCHIVE_DIR,
+    dining_hall_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Iterator[Dict]:
+    """
+    Stream item records from the archive, one decompressed line at a time.
+
+    A partition cut short (e.g. by a crash during an append) is read up to the
+    damage; the rest of it, including members appended later, is skipped.
+    """
+    for path in archive_files(archive_dir, dining_hall_id, start, end):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping corrupt record {path}:{line_number}: {e}")
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            logger.warning(f"Skipping the rest of truncated or corrupt partition {path}: {e}")
+
+
+def iter_menus(
+    archive_dir: str = ARCHIVE_DIR,
+    dining_hall_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Iterator[Dict]:
+    """
+    Stream menus back out of the archive in the scraper's menu dict format.
+
+    A menu's items are appended together, so consecutive records with the same
+    hall, date and meal are regrouped; a menu scraped again later is yielded
+    again (importers skip items they already have).
+    """
+    def menu_key(record: Dict) -> Tuple:
+        return record["dining_hall_id"], record["date"], record["meal_type"]
+
+    for (hall_id, date_str, meal_type), records in groupby(
+        iter_records(archive_dir, dining_hall_id, start, end), key=menu_key
+    ):
+        yield {
+            "dining_hall_id": hall_id,
+            "date": date_str,
+            "meal_type": meal_type,
+            "items": [
+                {"name": record["name"], "category": record["category"], "nutrition": record["nutrition"]}
+                for record in records
+            ]
+        }
+
+
+def convert_json_dir(
+    output_dir: str = OUTPUT_DIR,
+    archive_dir: str = ARCHIVE_DIR,
+    default_hall_id: int = 1
+) -> Tuple[int, int]:
+    """
+    Convert a directory of per-menu JSON files into the archive.
+
+    Args:
+        output_dir: Directory of legacy ``*.json`` menu files
+        archive_dir: Archive root directory
+        default_hall_id: Hall for files written before the hall id was recorded
+
+    Returns:
+        Number of menu files converted and item records written
+    """
+    menus = 0
+    records = 0
+    for menu_data in iter_json_menus(output_dir, default_hall_id):
+        try:
+            records += append_menus([menu_data], archive_dir)
+            menus += 1
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping {menu_data.get('date')} {menu_data.get('meal_type')}: {e}")
+    return menus, records
+
+
+def iter_json_menus(output_dir: str = OUTPUT_DIR, default_hall_id: int = 1) -> Iterator[Dict]:
+    """
+    Stream menus from a directory of per-menu JSON files, skipping unreadable ones.
+
+    Args:
+        output_dir: Directory of legacy ``*.json`` menu files
+        default_hall_id: Hall for files written before the hall id was recorded
+    """
+    for path in sorted(glob.glob(os.path.join(output_dir, "*.json"))):
+        try:
+            with open(path) as f:
+                menu_data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        menu_data.setdefault("dining_hall_id", default_hall_id)
+        yield menu_data
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="Convert a legacy JSON output directory")
+    convert.add_argument("output_dir", nargs="?", default=OUTPUT_DIR)
+    convert.add_argument("--archive", default=ARCHIVE_DIR, help="Archive root directory")
+    convert.add_argument("--hall", type=int, default=1, help="Hall id for files without one")
+
+    dump = subparsers.add_parser("dump", help="Print archived records as NDJSON")
+    dump.add_argument("--archive", default=ARCHIVE_DIR, help="Archive root directory")
+    dump.add_argument("--hall", type=int, help="Only this dining hall")
+    dump.add_argument("--start", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    dump.add_argument("--end", type=date.fromisoformat, help="Last day (YYYY-MM-DD)")
+
+    args = arg_parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "convert":
+        menus, records = convert_json_dir(args.output_dir, args.archive, args.hall)
+        print(f"Converted {menus} menus ({records} items) into {args.archive}")
+    else:
+        for record in iter_records(args.archive, args.hall, args.start, args.end):
+            sys.stdout.write(json.dumps(record) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
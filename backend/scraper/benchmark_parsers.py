@@ -0,0 +1,211 @@
+"""Micro-benchmark comparing HTML parser backends on recorded NetNutrition HTML.
+
+Usage:
+    python -m backend.scraper.benchmark_parsers --recordings recordings
+    python -m backend.scraper.benchmark_parsers --labels recorded/labels --item-panels recorded/items
+    python -m backend.scraper.benchmark_parsers --recordings recordings --processes 2 4 8
+
+``--recordings`` takes a directory written by SessionManager record mode; the
+other arguments take HTML files or directories of ``*.html`` files. Every
+backend parses every document; the outputs are checked against the
+BeautifulSoup reference backend before timings are reported.
+
+``--processes`` additionally times label and item panel parsing on a
+ParsePool of each given size, reporting the speedup over parsing in one
+thread; it only pays off on multi-core machines.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Tuple
+
+from backend.config.config import ENDPOINTS
+from backend.scraper.parse_pool import ParsePool
+from backend.scraper.parsers import PARSERS, BeautifulSoupParser, HtmlParser, get_parser
+from backend.scraper.recording import load_exchanges
+
+
+def load_documents(paths: List[str]) -> List[Tuple[str, str]]:
+    """Load (name, html) pairs from files and directories of .html files."""
+    documents = []
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, "*.html"))) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, encoding="utf-8") as f:
+                documents.append((os.path.basename(file_path), f.read()))
+    return documents
+
+
+def load_recorded_documents(record_dir: str) -> Dict[str, List[Tuple[str, str]]]:
+    """Extract label, menu panel and item panel HTML from recorded exchanges."""
+    corpora = {"labels": [], "menu-panels": [], "item-panels": []}
+    panels = {ENDPOINTS["select_unit"]: ("menu-panels", "menuPanel"), ENDPOINTS["select_menu"]: ("item-panels", "itemPanel")}
+
+    for exchange in load_exchanges(record_dir).values():
+        if exchange["status"] != 200:
+            continue
+        endpoint = exchange["endpoint"]
+        if endpoint == ENDPOINTS["nutrition_label"]:
+            corpora["labels"].append((exchange["data"].get("detailOid", ""), exchange["body"]))
+        elif endpoint in panels:
+            kind, panel_id = panels[endpoint]
+            try:
+                panel_html = next(panel["html"] for panel in json.loads(exchange["body"])["panels"] if panel["id"] == panel_id)
+            except (ValueError, KeyError, StopIteration):
+                continue
+            corpora[kind].append((json.dumps(exchange["data"]), panel_html))
+    return corpora
+
+
+def _parse_all(parse: Callable[[str, str], object], documents: List[Tuple[str, str]]) -> list:
+    return [parse(name, html) for name, html in documents]
+
+
+def _count_records(results: list) -> int:
+    """Count parsed records (menus, items or labels) across all documents."""
+    total = 0
+    for result in results:
+        if isinstance(result, dict):
+            total += sum(len(menus) for menus in result.values())
+        elif isinstance(result, list):
+            total += len(result)
+        else:
+            total += 1
+    return total
+
+
+def benchmark(
+    parser: HtmlParser,
+    kind: str,
+    documents: List[Tuple[str, str]],
+    repeat: int
+) -> Tuple[list, float]:
+    """Parse every document ``repeat`` times and return the results and best total time."""
+    parse = {
+        "labels": lambda name, html: parser.parse_nutrition_label(html, os.path.splitext(name)[0]),
+        "menu-panels": lambda name, html: parser.parse_menu_panel(html),
+        "item-panels": lambda name, html: parser.parse_item_panel(html),
+    }[kind]
+
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = _parse_all(parse, documents)
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+
+def benchmark_processes(
+    parser: HtmlParser,
+    kind: str,
+    documents: List[Tuple[str, str]],
+    processes: int,
+    repeat: int
+) -> Tuple[list, float]:
+    """Parse every document on a ParsePool ``repeat`` times and return the results and best total time."""
+    pool = ParsePool(processes, parser.name)
+    # Documents are keyed by position: recorded names are not guaranteed to be unique
+    keyed = {str(index): html for index, (_, html) in enumerate(documents)}
+    try:
+        if kind == "labels":
+            def parse_all() -> list:
+                results = pool.parse_labels(keyed).values()
+                # Restore the item OID the serial run takes from the document name
+                return [
+                    replace(result, item_oid=os.path.splitext(name)[0]) if result else result
+                    for (name, _), result in zip(documents, results)
+                ]
+        else:
+            def parse_all() -> list:
+                return list(pool.parse_item_panels(keyed).values())
+
+        # Start the workers and import the parsers before timing
+        parse_all()
+        best = float("inf")
+        results = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = parse_all()
+            best = min(best, time.perf_counter() - start)
+        return results, best
+    finally:
+        pool.close()
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--recordings", help="Directory of recorded exchanges")
+    arg_parser.add_argument("--labels", nargs="*", default=[], help="Recorded nutrition label HTML")
+    arg_parser.add_argument("--menu-panels", nargs="*", default=[], help="Recorded unit menu panel HTML")
+    arg_parser.add_argument("--item-panels", nargs="*", default=[], help="Recorded menu item panel HTML")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best run is reported)")
+    arg_parser.add_argument("--backends", nargs="*", default=sorted(PARSERS), help="Parser backends to compare")
+    arg_parser.add_argument(
+        "--processes", nargs="*", type=int, default=[],
+        help="Also time label and item panel parsing on process pools of these sizes"
+    )
+    args = arg_parser.parse_args(argv)
+
+    corpora: Dict[str, List[Tuple[str, str]]] = {
+        "labels": load_documents(args.labels),
+        "menu-panels": load_documents(args.menu_panels),
+        "item-panels": load_documents(args.item_panels),
+    }
+    if args.recordings:
+        for kind, documents in load_recorded_documents(args.recordings).items():
+            corpora[kind].extend(documents)
+    if not any(corpora.values()):
+        arg_parser.error("no recorded HTML given")
+
+    backends = [get_parser(name) for name in args.backends]
+    reference = BeautifulSoupParser()
+    mismatches = 0
+
+    print(f"{'corpus':<12} {'backend':<8} {'docs':>6} {'records':>8} {'total ms':>10} {'us/doc':>10} {'us/record':>10}")
+    for kind, documents in corpora.items():
+        if not documents:
+            continue
+
+        expected, _ = benchmark(reference, kind, documents, 1)
+        for backend in backends:
+            results, elapsed = benchmark(backend, kind, documents, args.repeat)
+            records = _count_records(results)
+            print(
+                f"{kind:<12} {backend.name:<8} {len(documents):>6} {records:>8} "
+                f"{elapsed * 1000:>10.2f} {elapsed * 1e6 / len(documents):>10.1f} "
+                f"{elapsed * 1e6 / max(records, 1):>10.1f}"
+            )
+            for (name, _), result, reference_result in zip(documents, results, expected):
+                if result != reference_result:
+                    mismatches += 1
+                    print(f"  MISMATCH {backend.name} {kind} {name}", file=sys.stderr)
+
+            if kind == "menu-panels":
+                continue
+            for processes in args.processes:
+                pool_results, pool_elapsed = benchmark_processes(backend, kind, documents, processes, args.repeat)
+                label = f"{backend.name}x{processes}"
+                print(
+                    f"{kind:<12} {label:<8} {len(documents):>6} {_count_records(pool_results):>8} "
+                    f"{pool_elapsed * 1000:>10.2f} {pool_elapsed * 1e6 / len(documents):>10.1f} "
+                    f"{pool_elapsed * 1e6 / max(records, 1):>10.1f}  {elapsed / pool_elapsed:.2f}x"
+                )
+                for (name, _), result, reference_result in zip(documents, pool_results, expected):
+                    if result != reference_result:
+                        mismatches += 1
+                        print(f"  MISMATCH {label} {kind} {name}", file=sys.stderr)
+
+    if mismatches:
+        print(f"{mismatches} documents parsed differently from the bs4 reference", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
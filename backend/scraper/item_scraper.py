@@ -3,9 +3,9 @@
 import logging
 import traceback
 from typing import List, Optional
-from bs4 import BeautifulSoup
 
 from backend.scraper.session_manager import SessionManager
+from backend.scraper.parsers import HtmlParser, get_parser
 from backend.config.config import ENDPOINTS
 from backend.models.item import MenuItem
 
@@ -14,12 +14,21 @@ logger = logging.getLogger(__name__)
 class ItemScraper:
     """Scrapes menu items for a specific menu."""
     
-    def __init__(self, session_manager: Optional[SessionManager] = None):
-        """Initialize the item scraper with a session manager."""
+    def __init__(self, session_manager: Optional[SessionManager] = None, parser: Optional[HtmlParser] = None):
+        """Initialize the item scraper with a session manager and HTML parser backend."""
         self.session_manager = session_manager or SessionManager()
+        self.parser = parser or get_parser()
     
     def get_items(self, menu_oid: str) -> List[MenuItem]:
         """Get all menu items for a specific menu."""
+        item_grid_html = self.get_item_panel(menu_oid)
+        if item_grid_html is None:
+            return []
+        
+        return self.parse_items(item_grid_html, menu_oid)
+    
+    def get_item_panel(self, menu_oid: str) -> Optional[str]:
+        """Select a menu and return the raw HTML of its item panel."""
         menu_data = self.session_manager.post(
             ENDPOINTS["select_menu"],
             {"menuOid": menu_oid}
@@ -27,42 +36,23 @@ class ItemScraper:
         
         if not menu_data:
             logger.error(f"Failed to get menu data for menu {menu_oid}")
-            return []
+            return None
         
         try:
-            item_grid_html = next(panel["html"] for panel in menu_data["panels"] if panel["id"] == "itemPanel")
-            soup = BeautifulSoup(item_grid_html, "html.parser")
-            
-            items = []
-            current_category = "Unknown"
-            item_table = soup.find("table", class_="table")
+            return next(panel["html"] for panel in menu_data["panels"] if panel["id"] == "itemPanel")
+        except (StopIteration, KeyError, TypeError) as e:
+            logger.error(f"Failed to find item panel for menu {menu_oid}: {e}")
+            return None
+    
+    def parse_items(self, item_grid_html: str, menu_oid: str) -> List[MenuItem]:
+        """Parse a menu's item panel HTML into menu items."""
+        try:
+            items = self.parser.parse_item_panel(item_grid_html)
             
-            # Use table directly if tbody might be missing; find_all handles this
-            for tr in item_table.find_all("tr", recursive=False):
-                if "cbo_nn_itemGroupRow" in tr.get("class", []):
-                    category_td = tr.find("td")
-                    if category_td:
-                        category_div = category_td.find("div")
-                        if category_div:
-                            current_category = category_div.get_text(strip=True)
-                else:
-                    # Item row
-                    item_a = tr.find("a", class_="cbo_nn_itemHover")
-                    if item_a:
-                        try:
-                            # Assumes '...getItemNutritionLabel(NUMBER)...' structure
-                            item_id_attr = item_a.get("id", "")
-                            oid = item_id_attr.split("_")[1] if "_" in item_id_attr else None
-                            name = item_a.get_text(strip=True)
-                            items.append(MenuItem(oid, name, current_category))
-                        except (AttributeError, IndexError, TypeError):
-                            # Log minimally if a specific item row fails
-                            logger.warning(f"Skipping malformed item row in category '{current_category}'")
-
             # logger.info(f"Extracted {len(items)} items for menu {menu_oid}") # Optional logging
             return items
         except (StopIteration, AttributeError, Exception) as e:
-            # Catch failure to find 'itemPanel', 'cbo_nn_itemGridTable', or other parsing errors
+            # Catch failure to find 'cbo_nn_itemGridTable', or other parsing errors
             logger.error(f"Failed to parse items structure for menu {menu_oid}: {e}")
             traceback.print_exc()
-            return []
\ No newline at end of file
+            return []
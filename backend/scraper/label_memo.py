@@ -0,0 +1,53 @@
+"""Run-scoped de-duplication of nutrition label requests.
+
+The same item (coffee, the salad bar, cereal) appears under many meals and
+halls. The first menu to need an item's label claims it and fetches and
+parses it; every later menu in the same run links to that claim instead of
+requesting the label again, including while the first fetch is still in
+flight.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from backend.models.nutrition import NutritionInfo
+
+
+class LabelMemo:
+    """Thread-safe map of item_oid to the (possibly pending) parsed label for one run."""
+
+    def __init__(self):
+        self._entries: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.claims = 0
+        self.shared = 0
+
+    def claim(self, item_oid: str) -> Tuple[Future, bool]:
+        """
+        Get the label future for an item.
+
+        Returns:
+            The future and whether the caller owns it; the owner must fetch the
+            label and ``resolve`` it, everyone else just waits for the result
+        """
+        with self._lock:
+            future = self._entries.get(item_oid)
+            if future is not None:
+                self.shared += 1
+                return future, False
+
+            future = Future()
+            self._entries[item_oid] = future
+            self.claims += 1
+            return future, True
+
+    def resolve(self, item_oid: str, nutrition_info: Optional[NutritionInfo]) -> None:
+        """Publish the owner's result (None if the label could not be fetched or parsed)."""
+        future = self._entries.get(item_oid)
+        if future is not None and not future.done():
+            future.set_result(nutrition_info)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"labels": len(self._entries), "claims": self.claims, "requests_saved": self.shared}
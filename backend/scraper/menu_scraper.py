@@ -1,9 +1,9 @@
 import logging
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from backend.scraper.session_manager import SessionManager
+from backend.scraper.parsers import HtmlParser, get_parser
 from backend.models.menu import MenuDate, Menu
 from backend.config.config import ENDPOINTS, DEFAULT_UNIT_OID
 
@@ -12,74 +12,67 @@ logger = logging.getLogger(__name__)
 class MenuScraper:
     """Scrapes available menu dates and meal types."""
     
-    def __init__(self, session_manager: Optional[SessionManager] = None):
-        """Initialize the menu scraper with a session manager."""
+    def __init__(
+        self,
+        session_manager: Optional[SessionManager] = None,
+        unit_oid: str = DEFAULT_UNIT_OID,
+        parser: Optional[HtmlParser] = None
+    ):
+        """Initialize the menu scraper with a session manager, the dining hall unit to scrape and an HTML parser backend."""
         self.session_manager = session_manager or SessionManager()
+        self.unit_oid = unit_oid
+        self.parser = parser or get_parser()
+        self._menu_index: Optional[Dict[str, List[Menu]]] = None
     
-    def get_menu_dates(self) -> List[MenuDate]:
-        """Get available menu dates."""
+    def get_menu_index(self, refresh: bool = False) -> Dict[str, List[Menu]]:
+        """
+        Get every available menu, indexed by date.
+        
+        The unit's menu panel is fetched and parsed once; later calls reuse the
+        index unless ``refresh`` is set.
+        
+        Returns:
+            Dictionary mapping each date string (as shown on the site, e.g.
+            "Monday, March 31, 2025") to its menus, in the site's order.
+        """
+        if self._menu_index is not None and not refresh:
+            return self._menu_index
+        
         unit_data = self.session_manager.post(
             ENDPOINTS["select_unit"],
-            {"unitOid": DEFAULT_UNIT_OID}
+            {"unitOid": self.unit_oid}
         )
         
         if not unit_data:
-            logger.error("Failed to get unit data")
-            return []
+            logger.error(f"Failed to get unit data for unit {self.unit_oid}")
+            return {}
         
         try:
             menu_list_html = next(panel["html"] for panel in unit_data["panels"] if panel["id"] == "menuPanel")
-            soup = BeautifulSoup(menu_list_html, "html.parser")
+            menu_index = self.parser.parse_menu_panel(menu_list_html)
             
-            menu_dates = []
-            for header in soup.select("header.card-title.h4"):
-                date_str = header.get_text(strip=True)
-                try:
-                    date_obj = datetime.strptime(date_str, "%A, %B %d, %Y")
-                    menu_dates.append(MenuDate(raw_text=date_str, date=date_obj))
-                except ValueError as e:
-                    logger.warning(f"Failed to parse date '{date_str}': {e}")
-            
-            logger.info(f"Found {len(menu_dates)} menu dates")
-            return menu_dates
-        except (StopIteration, AttributeError) as e:
-            logger.error(f"Error getting menu dates: {e}")
-            return []
+            logger.info(f"Found {sum(len(menus) for menus in menu_index.values())} menus across {len(menu_index)} dates for unit {self.unit_oid}")
+            self._menu_index = menu_index
+            return menu_index
+        except (StopIteration, AttributeError, IndexError, ValueError) as e:
+            logger.error(f"Error parsing menu panel: {e}")
+            return {}
+    
+    def get_menu_dates(self) -> List[MenuDate]:
+        """Get available menu dates."""
+        menu_dates = []
+        for date_str in self.get_menu_index():
+            try:
+                date_obj = datetime.strptime(date_str, "%A, %B %d, %Y")
+                menu_dates.append(MenuDate(raw_text=date_str, date=date_obj))
+            except ValueError as e:
+                logger.warning(f"Failed to parse date '{date_str}': {e}")
+        
+        logger.info(f"Found {len(menu_dates)} menu dates")
+        return menu_dates
     
     def get_available_meals(self, date_str: str) -> List[Menu]:
         """Get all available meal types for a specific date."""
-        unit_data = self.session_manager.post(
-            ENDPOINTS["select_unit"],
-            {"unitOid": DEFAULT_UNIT_OID}
-        )
-        
-        if not unit_data:
-            logger.error("Failed to get unit data")
-            return []
-        
-        try:
-            menu_list_html = next(panel["html"] for panel in unit_data["panels"] if panel["id"] == "menuPanel")
-            soup = BeautifulSoup(menu_list_html, "html.parser")
-            
-            menus = []
-            for block in soup.select("div.card-block"):
-                header = block.find("header")
-                if header and header.get_text(strip=True) == date_str:
-                    # Find all meal links in this row
-                    for meal_link in block.find_all("a", class_="cbo_nn_menuLink"):
-                        meal_type = meal_link.get_text(strip=True)
-                        if "onclick" in meal_link.attrs:
-                            onclick = meal_link["onclick"]
-                            menu_oid = onclick.split("menuListSelectMenu(")[1].split(")")[0]
-                            
-                            menus.append(Menu(
-                                date=date_str,
-                                meal_type=meal_type,
-                                menu_oid=menu_oid
-                            ))
-            
-            logger.info(f"Found {len(menus)} available meals for {date_str}")
-            return menus
-        except (StopIteration, AttributeError) as e:
-            logger.error(f"Error finding meals for {date_str}: {e}")
-            return []
\ No newline at end of file
+        menus = self.get_menu_index().get(date_str, [])
+        logger.info(f"Found {len(menus)} available meals for {date_str}")
+        return menus
@@ -0,0 +1,192 @@
+"""Persistent on-disk cache for parsed nutrition labels."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.config.campuses import DEFAULT_CAMPUS
+from backend.config.config import NUTRITION_CACHE_PATH, NUTRITION_CACHE_TTL, NUTRITION_CACHE_MAX_ENTRIES
+from backend.models.nutrition import NutritionInfo
+
+logger = logging.getLogger(__name__)
+
+
+def campus_cache_path(campus_key: str) -> str:
+    """Cache file for a campus; item OIDs are only unique within one NetNutrition site."""
+    if campus_key == DEFAULT_CAMPUS:
+        return NUTRITION_CACHE_PATH
+    root, extension = os.path.splitext(NUTRITION_CACHE_PATH)
+    return f"{root}_{campus_key}{extension}"
+
+
+def hash_label(label_html: str) -> str:
+    """Hash raw nutrition label HTML to detect unchanged labels."""
+    return hashlib.sha256(label_html.encode("utf-8")).hexdigest()
+
+
+class NutritionCache:
+    """
+    SQLite-backed cache of parsed nutrition labels, shared across scraper runs.
+
+    Entries are keyed by item OID and store the hash of the raw label HTML next
+    to the parsed NutritionInfo. A label fetched less than ``ttl`` seconds ago is
+    served without any request; an older label is refetched, but only re-parsed
+    if its HTML hash changed. Entries unused for ``ttl`` seconds, and the least
+    recently used entries beyond ``max_entries``, are evicted by ``prune``.
+
+    A read-only cache (used by dry runs) works on an in-memory copy of the
+    file, so hits are served as usual but nothing is written back to disk.
+    """
+
+    def __init__(
+        self,
+        path: str = NUTRITION_CACHE_PATH,
+        ttl: float = NUTRITION_CACHE_TTL,
+        max_entries: int = NUTRITION_CACHE_MAX_ENTRIES,
+        read_only: bool = False
+    ):
+        """Open (or create) the cache database at the given path; copy it into memory if read_only."""
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.read_only = read_only
+
+        self.hits = 0
+        self.misses = 0
+        self.unchanged = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        if read_only:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            if os.path.exists(path):
+                source = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True)
+                try:
+                    source.backup(self._conn)
+                finally:
+                    source.close()
+        else:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS nutrition_labels (
+                item_oid TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                nutrition TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_nutrition_labels_accessed_at ON nutrition_labels (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, item_oid: str) -> Optional[NutritionInfo]:
+        """Get a cached label that is still fresh, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT nutrition FROM nutrition_labels WHERE item_oid = ? AND fetched_at >= ?",
+                (item_oid, now - self.ttl)
+            ).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE nutrition_labels SET accessed_at = ? WHERE item_oid = ?",
+                (now, item_oid)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return NutritionInfo(**json.loads(row[0]))
+
+    def get_unchanged(self, item_oid: str, content_hash: str) -> Optional[NutritionInfo]:
+        """
+        Get a cached label whose raw HTML hash matches a freshly fetched label.
+
+        A match renews the entry, so the label does not need to be parsed again.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT nutrition FROM nutrition_labels WHERE item_oid = ? AND content_hash = ?",
+                (item_oid, content_hash)
+            ).fetchone()
+            if not row:
+                return None
+
+            self._conn.execute(
+                "UPDATE nutrition_labels SET fetched_at = ?, accessed_at = ? WHERE item_oid = ?",
+                (now, now, item_oid)
+            )
+            self._conn.commit()
+            self.unchanged += 1
+        return NutritionInfo(**json.loads(row[0]))
+
+    def put(self, item_oid: str, content_hash: str, nutrition_info: NutritionInfo) -> None:
+        """Store a freshly parsed label."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO nutrition_labels (item_oid, content_hash, nutrition, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (item_oid, content_hash, json.dumps(asdict(nutrition_info)), now, now)
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Evict entries unused for longer than the TTL and enforce the size limit."""
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM nutrition_labels WHERE accessed_at < ?",
+                (time.time() - self.ttl,)
+            ).rowcount
+            overflow = self._conn.execute(
+                """
+                DELETE FROM nutrition_labels WHERE item_oid IN (
+                    SELECT item_oid FROM nutrition_labels
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+            self.evictions += expired + overflow
+
+        if expired or overflow:
+            logger.info(f"Evicted {expired} expired and {overflow} excess nutrition labels from cache")
+        return expired + overflow
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters for this cache instance."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM nutrition_labels").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "unchanged": self.unchanged,
+                "evictions": self.evictions,
+                "size": size
+            }
+
+    def close(self) -> None:
+        """Prune the cache and close the underlying database."""
+        self.prune()
+        with self._lock:
+            self._conn.close()
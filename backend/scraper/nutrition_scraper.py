@@ -1,25 +1,107 @@
 """Module for scraping nutrition information from the Grinnell nutrition website."""
 
 import logging
-from typing import Optional
-from bs4 import BeautifulSoup
-import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 from backend.scraper.session_manager import SessionManager
-from backend.config.config import ENDPOINTS
+from backend.scraper.parsers import HtmlParser, get_parser
+from backend.scraper.nutrition_cache import NutritionCache, hash_label
+from backend.config.config import ENDPOINTS, MAX_CONCURRENCY
 from backend.models.nutrition import NutritionInfo
 
+if TYPE_CHECKING:
+    from backend.scraper.parse_pool import ParsePool
+
 logger = logging.getLogger(__name__)
 
 class NutritionScraper:
     """Scrapes nutrition information for menu items."""
     
-    def __init__(self, session_manager: Optional[SessionManager] = None):
-        """Initialize the nutrition scraper with a session manager."""
-        self.session_manager = session_manager or SessionManager()
+    def __init__(
+        self,
+        session_manager: Optional[SessionManager] = None,
+        cache: Optional[NutritionCache] = None,
+        parser: Optional[HtmlParser] = None
+    ):
+        """
+        Initialize the nutrition scraper with a session manager, optional label cache and HTML parser backend.
+        
+        Without a session manager one is created on the first fetch, so a scraper
+        that only parses labels never registers limits for the default host.
+        """
+        self._session_manager = session_manager
+        self.cache = cache
+        self.parser = parser or get_parser()
+    
+    @property
+    def session_manager(self) -> SessionManager:
+        """Session used to fetch labels, created on first use."""
+        if self._session_manager is None:
+            self._session_manager = SessionManager()
+        return self._session_manager
     
     def get_nutrition_info(self, item_oid: str) -> Optional[NutritionInfo]:
         """Get nutrition information for a specific menu item."""
+        cached = self.get_cached(item_oid)
+        if cached:
+            return cached
+        
+        label_html = self.fetch_label(item_oid)
+        if label_html is None:
+            return None
+        
+        return self.process_label(label_html, item_oid)
+    
+    def get_cached(self, item_oid: str) -> Optional[NutritionInfo]:
+        """Get a fresh cached label without making a request, if there is one."""
+        return self.cache.get(item_oid) if self.cache else None
+    
+    def process_label(self, label_html: str, item_oid: str) -> Optional[NutritionInfo]:
+        """Parse a fetched label, reusing the cached parse when the HTML is unchanged."""
+        return self.process_labels({item_oid: label_html})[item_oid]
+    
+    def process_labels(
+        self,
+        labels: Dict[str, str],
+        parse_pool: Optional["ParsePool"] = None
+    ) -> Dict[str, Optional[NutritionInfo]]:
+        """
+        Parse many fetched labels, reusing cached parses for unchanged HTML.
+        
+        Args:
+            labels: Item OID to raw label HTML
+            parse_pool: Worker processes to parse in; this thread if None
+            
+        Returns:
+            Item OID to NutritionInfo, None where the label could not be parsed
+        """
+        results: Dict[str, Optional[NutritionInfo]] = {}
+        content_hashes: Dict[str, str] = {}
+        to_parse: Dict[str, str] = {}
+        for item_oid, label_html in labels.items():
+            if self.cache:
+                # Skip parsing when the label is byte-for-byte what we parsed before
+                content_hashes[item_oid] = hash_label(label_html)
+                cached = self.cache.get_unchanged(item_oid, content_hashes[item_oid])
+                if cached:
+                    results[item_oid] = cached
+                    continue
+            to_parse[item_oid] = label_html
+        
+        if parse_pool:
+            parsed = parse_pool.parse_labels(to_parse)
+        else:
+            parsed = {item_oid: self.parse_label(label_html, item_oid) for item_oid, label_html in to_parse.items()}
+        
+        for item_oid, nutrition_info in parsed.items():
+            if nutrition_info and self.cache:
+                self.cache.put(item_oid, content_hashes[item_oid], nutrition_info)
+            results[item_oid] = nutrition_info
+        return results
+    
+    def fetch_label(self, item_oid: str) -> Optional[str]:
+        """Fetch the raw nutrition label HTML for a specific menu item."""
         nutrition_data = self.session_manager.post(
             ENDPOINTS["nutrition_label"],
             {"detailOid": item_oid}
@@ -29,79 +111,45 @@ class NutritionScraper:
             logger.error(f"Failed to get nutrition data for item {item_oid}")
             return None
         
+        label_html = nutrition_data.get("nutritionLabel")
+        if label_html is None:
+            logger.error(f"No nutrition label in the response for item {item_oid}")
+        return label_html
+    
+    def parse_label(self, label_html: str, item_oid: str) -> Optional[NutritionInfo]:
+        """Parse nutrition label HTML into a NutritionInfo object."""
         try:
-            soup = BeautifulSoup(nutrition_data["nutritionLabel"], "html.parser")
-            
-            # Extract item name
-            item_name_td = soup.find("td", class_="cbo_nn_LabelHeader")
-            item_name = item_name_td.get_text(strip=True) if item_name_td else "Unknown"
-            
-            # Extract serving size
-            serving_size_td = soup.find("td", class_="cbo_nn_LabelBottomBorderLabel")
-            serving_size_match = re.search(r"Serving Size:\s*(.*)", serving_size_td.get_text(strip=True)) if serving_size_td else None
-            serving_size = serving_size_match.group(1) if serving_size_match else "Unknown"
-            
-            # Extract calories
-            calorie_span = soup.find("span", string=re.compile(r"Calories", re.I))
-            if calorie_span:
-                calories_container = calorie_span.find_next("span", class_="cbo_nn_SecondaryNutrient")
-                calories = int(calories_container.get_text(strip=True)) if calories_container else 0
-            else:
-                calories = 0
-            
-            # Extract nutrients
-            nutrients = {}
-            nutrient_tables = soup.find_all("td", class_="cbo_nn_LabelBorderedSubHeader")
-            for td in nutrient_tables:
-                inner_table = td.find("table")
-                if not inner_table:
-                    continue
-                rows = inner_table.find_all("tr")
-                for row in rows:
-                    cols = row.find_all("td")
-                    if len(cols) >= 2:
-                        nutrient_name = cols[0].get_text(strip=True).replace(":", "")
-                        value_span = cols[1].find("span", class_="cbo_nn_SecondaryNutrient")
-                        if value_span:
-                            nutrient_value = value_span.get_text(strip=True)
-                            nutrients[nutrient_name] = nutrient_value
-
-            # Also extract secondary table nutrients (Vitamin A, Calcium, etc.)
-            secondary_table = soup.find("table", class_="cbo_nn_LabelSecondaryTable")
-            if secondary_table:
-                for row in secondary_table.find_all("tr"):
-                    cols = row.find_all("td")
-                    if len(cols) == 2:
-                        nutrient_name = cols[0].get_text(strip=True)
-                        nutrient_value = cols[1].get_text(strip=True)
-                        if nutrient_name and nutrient_value:
-                            nutrients[nutrient_name] = nutrient_value
-
-            # Additional nutrients (Vitamin D etc.)
-            additional_nutrients = soup.find("div", class_="cbo_nn_AdditonalNutrientLabel")
-            if additional_nutrients:
-                for row in additional_nutrients.find_all("tr"):
-                    cols = row.find_all("td")
-                    if len(cols) == 2:
-                        nutrient_name = cols[0].get_text(strip=True)
-                        nutrient_value = cols[1].get_text(strip=True)
-                        if nutrient_name:
-                            nutrients[nutrient_name] = nutrient_value
-
-            # Extract allergens
-            allergens_span = soup.find("span", class_="cbo_nn_LabelAllergens")
-            allergens = allergens_span.get_text(strip=True).replace("\xa0", " ") if allergens_span else "None"
-            
-            # Create and return NutritionInfo object
-            return NutritionInfo(
-                item_oid=item_oid,
-                item_name=item_name,
-                serving_size=serving_size,
-                calories=calories,
-                nutrients=nutrients,
-                allergens=allergens
-            )
-            
+            return self.parser.parse_nutrition_label(label_html, item_oid)
         except Exception as e:
             logger.error(f"Error parsing nutrition data for item {item_oid}: {e}")
             return None
+    
+    def get_nutrition_info_batch(
+        self,
+        item_oids: Iterable[str],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, NutritionInfo]:
+        """
+        Get nutrition information for many items concurrently.
+        
+        Labels are fetched on a thread pool of at most ``max_workers`` threads
+        (MAX_CONCURRENCY by default); the session manager additionally caps the
+        number of requests in flight against the host. Duplicate OIDs are only
+        fetched once.
+        
+        Returns:
+            Dictionary mapping item OID to its NutritionInfo, in request order.
+            Items whose label could not be fetched or parsed are omitted.
+        """
+        unique_oids = list(dict.fromkeys(item_oids))
+        if not unique_oids:
+            return {}
+        
+        workers = max(1, min(max_workers or MAX_CONCURRENCY, len(unique_oids)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nutrition") as executor:
+            labels = executor.map(self.get_nutrition_info, unique_oids)
+            return {
+                item_oid: nutrition_info
+                for item_oid, nutrition_info in zip(unique_oids, labels)
+                if nutrition_info
+            }
@@ -0,0 +1,134 @@
+"""Process pool for CPU-bound NetNutrition HTML parsing.
+
+With concurrent label fetching, parsing becomes the bottleneck: BeautifulSoup
+(and to a lesser degree lxml) holds the GIL, so parse threads never use more
+than one core. ParsePool ships raw label and item panel HTML to worker
+processes instead, while the calling threads keep fetching.
+
+Results cross the process boundary as plain tuples rather than model objects;
+they pickle smaller and faster and are turned back into NutritionInfo and
+MenuItem objects in the parent.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from backend.config.config import PARSE_PROCESSES
+from backend.models.item import MenuItem
+from backend.models.nutrition import NutritionInfo
+from backend.scraper.parsers import HtmlParser, get_parser
+
+logger = logging.getLogger(__name__)
+
+# (item_oid, item_name, serving_size, calories, ((nutrient, amount), ...), allergens)
+CompactNutrition = Tuple[str, str, str, int, Tuple[Tuple[str, str], ...], str]
+# (item_oid, name, category)
+CompactItem = Tuple[str, str, str]
+
+_worker_parser: Optional[HtmlParser] = None
+
+
+def pack_nutrition(nutrition_info: NutritionInfo) -> CompactNutrition:
+    """Convert a NutritionInfo into its compact, picklable tuple form."""
+    return (
+        nutrition_info.item_oid,
+        nutrition_info.item_name,
+        nutrition_info.serving_size,
+        nutrition_info.calories,
+        tuple(nutrition_info.nutrients.items()),
+        nutrition_info.allergens
+    )
+
+
+def unpack_nutrition(compact: CompactNutrition) -> NutritionInfo:
+    """Rebuild a NutritionInfo from its compact tuple form."""
+    item_oid, item_name, serving_size, calories, nutrients, allergens = compact
+    return NutritionInfo(item_oid, item_name, serving_size, calories, dict(nutrients), allergens)
+
+
+def _init_worker(parser_name: str) -> None:
+    global _worker_parser
+    _worker_parser = get_parser(parser_name)
+
+
+def _parse_label(item_oid: str, label_html: str) -> Optional[CompactNutrition]:
+    try:
+        return pack_nutrition(_worker_parser.parse_nutrition_label(label_html, item_oid))
+    except Exception as e:
+        logger.error(f"Error parsing nutrition data for item {item_oid}: {e}")
+        return None
+
+
+def _parse_item_panel(item_panel_html: str, menu_oid: str) -> List[CompactItem]:
+    try:
+        return [(item.item_oid, item.name, item.category) for item in _worker_parser.parse_item_panel(item_panel_html)]
+    except Exception as e:
+        logger.error(f"Failed to parse items structure for menu {menu_oid}: {e}")
+        return []
+
+
+class ParsePool:
+    """Parses nutrition labels and item panels in worker processes."""
+
+    def __init__(self, processes: int = PARSE_PROCESSES, parser_name: Optional[str] = None):
+        """
+        Args:
+            processes: Worker processes; at least one
+            parser_name: HTML parser backend used by the workers; defaults to HTML_PARSER
+        """
+        self.processes = max(1, processes)
+        self.parser_name = parser_name or get_parser().name
+        # Spawn rather than fork: the scraper forks from a process full of threads holding locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.parser_name,)
+        )
+
+    def parse_labels(self, labels: Dict[str, str]) -> Dict[str, Optional[NutritionInfo]]:
+        """
+        Parse many nutrition labels across the worker processes.
+
+        Args:
+            labels: Item OID to raw label HTML
+
+        Returns:
+            Item OID to NutritionInfo, None where the label could not be parsed
+        """
+        if not labels:
+            return {}
+
+        # Hand each worker a few chunks so IPC is amortized but no worker sits idle
+        chunksize = max(1, len(labels) // (self.processes * 4))
+        results = self._executor.map(_parse_label, labels.keys(), labels.values(), chunksize=chunksize)
+        return {
+            item_oid: unpack_nutrition(compact) if compact else None
+            for item_oid, compact in zip(labels, results)
+        }
+
+    def parse_items(self, item_panel_html: str, menu_oid: str) -> List[MenuItem]:
+        """Parse a menu's item panel HTML into menu items in a worker process."""
+        return self.parse_item_panels({menu_oid: item_panel_html})[menu_oid]
+
+    def parse_item_panels(self, item_panels: Dict[str, str]) -> Dict[str, List[MenuItem]]:
+        """
+        Parse many item panels across the worker processes.
+
+        Args:
+            item_panels: Menu OID to raw item panel HTML
+
+        Returns:
+            Menu OID to its menu items, empty where the panel could not be parsed
+        """
+        results = self._executor.map(_parse_item_panel, item_panels.values(), item_panels.keys())
+        return {
+            menu_oid: [MenuItem(item_oid, name, category) for item_oid, name, category in compact_items]
+            for menu_oid, compact_items in zip(item_panels, results)
+        }
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        self._executor.shutdown()
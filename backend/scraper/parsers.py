@@ -0,0 +1,377 @@
+"""HTML parser backends for NetNutrition menu panels, item panels and nutrition labels."""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from backend.config.config import HTML_PARSER
+from backend.models.item import MenuItem
+from backend.models.menu import Menu
+from backend.models.nutrition import NutritionInfo
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - lxml is an optional speedup
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+SERVING_SIZE_PATTERN = re.compile(r"Serving Size:\s*(.*)")
+CALORIES_PATTERN = re.compile(r"Calories", re.I)
+
+
+class HtmlParser:
+    """
+    Interface for turning NetNutrition HTML fragments into model objects.
+
+    Every backend must produce identical output for the same HTML. Parse
+    methods raise on markup they cannot make sense of; the scrapers catch and
+    log those errors.
+    """
+
+    name = "base"
+
+    def parse_menu_panel(self, html: str) -> Dict[str, List[Menu]]:
+        """Parse the unit menu panel into a date -> menus index."""
+        raise NotImplementedError
+
+    def parse_item_panel(self, html: str) -> List[MenuItem]:
+        """Parse a menu's item panel into menu items."""
+        raise NotImplementedError
+
+    def parse_nutrition_label(self, html: str, item_oid: str) -> NutritionInfo:
+        """Parse an item's nutrition label."""
+        raise NotImplementedError
+
+
+def _menu_oid_from_onclick(onclick: str) -> str:
+    """Extract the menu OID from a 'menuListSelectMenu(OID)' click handler."""
+    return onclick.split("menuListSelectMenu(")[1].split(")")[0]
+
+
+class BeautifulSoupParser(HtmlParser):
+    """Reference backend using BeautifulSoup with the pure-Python html.parser."""
+
+    name = "bs4"
+
+    def parse_menu_panel(self, html: str) -> Dict[str, List[Menu]]:
+        soup = BeautifulSoup(html, "html.parser")
+
+        menu_index = {}
+        for block in soup.select("div.card-block"):
+            header = block.find("header")
+            if not header:
+                continue
+
+            date_str = header.get_text(strip=True)
+            menus = menu_index.setdefault(date_str, [])
+
+            # Find all meal links in this row
+            for meal_link in block.find_all("a", class_="cbo_nn_menuLink"):
+                meal_type = meal_link.get_text(strip=True)
+                if "onclick" in meal_link.attrs:
+                    menus.append(Menu(
+                        date=date_str,
+                        meal_type=meal_type,
+                        menu_oid=_menu_oid_from_onclick(meal_link["onclick"])
+                    ))
+
+        return menu_index
+
+    def parse_item_panel(self, html: str) -> List[MenuItem]:
+        soup = BeautifulSoup(html, "html.parser")
+
+        items = []
+        current_category = "Unknown"
+        item_table = soup.find("table", class_="table")
+
+        # Use table directly if tbody might be missing; find_all handles this
+        for tr in item_table.find_all("tr", recursive=False):
+            if "cbo_nn_itemGroupRow" in tr.get("class", []):
+                category_td = tr.find("td")
+                if category_td:
+                    category_div = category_td.find("div")
+                    if category_div:
+                        current_category = category_div.get_text(strip=True)
+            else:
+                # Item row
+                item_a = tr.find("a", class_="cbo_nn_itemHover")
+                if item_a:
+                    try:
+                        # Assumes '...getItemNutritionLabel(NUMBER)...' structure
+                        item_id_attr = item_a.get("id", "")
+                        oid = item_id_attr.split("_")[1] if "_" in item_id_attr else None
+                        name = item_a.get_text(strip=True)
+                        items.append(MenuItem(oid, name, current_category))
+                    except (AttributeError, IndexError, TypeError):
+                        # Log minimally if a specific item row fails
+                        logger.warning(f"Skipping malformed item row in category '{current_category}'")
+
+        return items
+
+    def parse_nutrition_label(self, html: str, item_oid: str) -> NutritionInfo:
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Extract item name
+        item_name_td = soup.find("td", class_="cbo_nn_LabelHeader")
+        item_name = item_name_td.get_text(strip=True) if item_name_td else "Unknown"
+
+        # Extract serving size
+        serving_size_td = soup.find("td", class_="cbo_nn_LabelBottomBorderLabel")
+        serving_size_match = SERVING_SIZE_PATTERN.search(serving_size_td.get_text(strip=True)) if serving_size_td else None
+        serving_size = serving_size_match.group(1) if serving_size_match else "Unknown"
+
+        # Extract calories
+        calorie_span = soup.find("span", string=CALORIES_PATTERN)
+        if calorie_span:
+            calories_container = calorie_span.find_next("span", class_="cbo_nn_SecondaryNutrient")
+            calories = int(calories_container.get_text(strip=True)) if calories_container else 0
+        else:
+            calories = 0
+
+        # Extract nutrients
+        nutrients = {}
+        nutrient_tables = soup.find_all("td", class_="cbo_nn_LabelBorderedSubHeader")
+        for td in nutrient_tables:
+            inner_table = td.find("table")
+            if not inner_table:
+                continue
+            rows = inner_table.find_all("tr")
+            for row in rows:
+                cols = row.find_all("td")
+                if len(cols) >= 2:
+                    nutrient_name = cols[0].get_text(strip=True).replace(":", "")
+                    value_span = cols[1].find("span", class_="cbo_nn_SecondaryNutrient")
+                    if value_span:
+                        nutrient_value = value_span.get_text(strip=True)
+                        nutrients[nutrient_name] = nutrient_value
+
+        # Also extract secondary table nutrients (Vitamin A, Calcium, etc.)
+        secondary_table = soup.find("table", class_="cbo_nn_LabelSecondaryTable")
+        if secondary_table:
+            for row in secondary_table.find_all("tr"):
+                cols = row.find_all("td")
+                if len(cols) == 2:
+                    nutrient_name = cols[0].get_text(strip=True)
+                    nutrient_value = cols[1].get_text(strip=True)
+                    if nutrient_name and nutrient_value:
+                        nutrients[nutrient_name] = nutrient_value
+
+        # Additional nutrients (Vitamin D etc.)
+        additional_nutrients = soup.find("div", class_="cbo_nn_AdditonalNutrientLabel")
+        if additional_nutrients:
+            for row in additional_nutrients.find_all("tr"):
+                cols = row.find_all("td")
+                if len(cols) == 2:
+                    nutrient_name = cols[0].get_text(strip=True)
+                    nutrient_value = cols[1].get_text(strip=True)
+                    if nutrient_name:
+                        nutrients[nutrient_name] = nutrient_value
+
+        # Extract allergens
+        allergens_span = soup.find("span", class_="cbo_nn_LabelAllergens")
+        allergens = allergens_span.get_text(strip=True).replace("\xa0", " ") if allergens_span else "None"
+
+        return NutritionInfo(
+            item_oid=item_oid,
+            item_name=item_name,
+            serving_size=serving_size,
+            calories=calories,
+            nutrients=nutrients,
+            allergens=allergens
+        )
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains the given class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first(elements: list):
+    """Return the first element of an XPath result, or None."""
+    return elements[0] if elements else None
+
+
+def _text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return "".join(text.strip() for text in element.itertext())
+
+
+def _string(element) -> Optional[str]:
+    """Equivalent of BeautifulSoup's Tag.string: the text of a lone child string."""
+    children = [element.text] if element.text else []
+    for child in element:
+        children.append(child)
+        if child.tail:
+            children.append(child.tail)
+
+    if len(children) != 1:
+        return None
+    child = children[0]
+    if isinstance(child, str):
+        return child
+    if not isinstance(child.tag, str):
+        # Comments and processing instructions count as strings
+        return child.text
+    return _string(child)
+
+
+class LxmlParser(HtmlParser):
+    """
+    Fast backend using lxml's libxml2 HTML parser and XPath.
+
+    Mirrors the BeautifulSoup backend's lookups one for one, so both produce
+    the same menus, items and nutrition labels.
+    """
+
+    name = "lxml"
+
+    def _parse(self, html: str):
+        if not html or not html.strip():
+            return lxml.html.fromstring("<html></html>")
+        return lxml.html.document_fromstring(html)
+
+    def parse_menu_panel(self, html: str) -> Dict[str, List[Menu]]:
+        root = self._parse(html)
+
+        menu_index = {}
+        for block in root.xpath(f"//div[{_has_class('card-block')}]"):
+            header = _first(block.xpath(".//header"))
+            if header is None:
+                continue
+
+            date_str = _text(header)
+            menus = menu_index.setdefault(date_str, [])
+
+            for meal_link in block.xpath(f".//a[{_has_class('cbo_nn_menuLink')}]"):
+                onclick = meal_link.get("onclick")
+                if onclick is not None:
+                    menus.append(Menu(
+                        date=date_str,
+                        meal_type=_text(meal_link),
+                        menu_oid=_menu_oid_from_onclick(onclick)
+                    ))
+
+        return menu_index
+
+    def parse_item_panel(self, html: str) -> List[MenuItem]:
+        root = self._parse(html)
+
+        item_table = _first(root.xpath(f"//table[{_has_class('table')}]"))
+        if item_table is None:
+            raise AttributeError("item table not found in item panel")
+
+        items = []
+        current_category = "Unknown"
+        for tr in item_table.xpath("./tr"):
+            if "cbo_nn_itemGroupRow" in tr.get("class", "").split():
+                category_td = _first(tr.xpath(".//td"))
+                if category_td is not None:
+                    category_div = _first(category_td.xpath(".//div"))
+                    if category_div is not None:
+                        current_category = _text(category_div)
+            else:
+                item_a = _first(tr.xpath(f".//a[{_has_class('cbo_nn_itemHover')}]"))
+                if item_a is not None:
+                    try:
+                        item_id_attr = item_a.get("id", "")
+                        oid = item_id_attr.split("_")[1] if "_" in item_id_attr else None
+                        items.append(MenuItem(oid, _text(item_a), current_category))
+                    except (AttributeError, IndexError, TypeError):
+                        logger.warning(f"Skipping malformed item row in category '{current_category}'")
+
+        return items
+
+    def parse_nutrition_label(self, html: str, item_oid: str) -> NutritionInfo:
+        root = self._parse(html)
+
+        item_name_td = _first(root.xpath(f"//td[{_has_class('cbo_nn_LabelHeader')}]"))
+        item_name = _text(item_name_td) if item_name_td is not None else "Unknown"
+
+        serving_size_td = _first(root.xpath(f"//td[{_has_class('cbo_nn_LabelBottomBorderLabel')}]"))
+        serving_size_match = SERVING_SIZE_PATTERN.search(_text(serving_size_td)) if serving_size_td is not None else None
+        serving_size = serving_size_match.group(1) if serving_size_match else "Unknown"
+
+        calories = 0
+        for span in root.iter("span"):
+            span_string = _string(span)
+            if span_string is not None and CALORIES_PATTERN.search(span_string):
+                # First matching span after the "Calories" span in document order
+                calories_container = _first(span.xpath(
+                    f"(descendant::span[{_has_class('cbo_nn_SecondaryNutrient')}]"
+                    f" | following::span[{_has_class('cbo_nn_SecondaryNutrient')}])[1]"
+                ))
+                calories = int(_text(calories_container)) if calories_container is not None else 0
+                break
+
+        nutrients = {}
+        for td in root.xpath(f"//td[{_has_class('cbo_nn_LabelBorderedSubHeader')}]"):
+            inner_table = _first(td.xpath(".//table"))
+            if inner_table is None:
+                continue
+            for row in inner_table.xpath(".//tr"):
+                cols = row.xpath(".//td")
+                if len(cols) >= 2:
+                    nutrient_name = _text(cols[0]).replace(":", "")
+                    value_span = _first(cols[1].xpath(f".//span[{_has_class('cbo_nn_SecondaryNutrient')}]"))
+                    if value_span is not None:
+                        nutrients[nutrient_name] = _text(value_span)
+
+        secondary_table = _first(root.xpath(f"//table[{_has_class('cbo_nn_LabelSecondaryTable')}]"))
+        if secondary_table is not None:
+            for row in secondary_table.xpath(".//tr"):
+                cols = row.xpath(".//td")
+                if len(cols) == 2:
+                    nutrient_name = _text(cols[0])
+                    nutrient_value = _text(cols[1])
+                    if nutrient_name and nutrient_value:
+                        nutrients[nutrient_name] = nutrient_value
+
+        additional_nutrients = _first(root.xpath(f"//div[{_has_class('cbo_nn_AdditonalNutrientLabel')}]"))
+        if additional_nutrients is not None:
+            for row in additional_nutrients.xpath(".//tr"):
+                cols = row.xpath(".//td")
+                if len(cols) == 2:
+                    nutrient_name = _text(cols[0])
+                    if nutrient_name:
+                        nutrients[nutrient_name] = _text(cols[1])
+
+        allergens_span = _first(root.xpath(f"//span[{_has_class('cbo_nn_LabelAllergens')}]"))
+        allergens = _text(allergens_span).replace("\xa0", " ") if allergens_span is not None else "None"
+
+        return NutritionInfo(
+            item_oid=item_oid,
+            item_name=item_name,
+            serving_size=serving_size,
+            calories=calories,
+            nutrients=nutrients,
+            allergens=allergens
+        )
+
+
+PARSERS = {
+    BeautifulSoupParser.name: BeautifulSoupParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_parser(name: Optional[str] = None) -> HtmlParser:
+    """
+    Get an HTML parser backend by name.
+
+    "auto" (the default, see HTML_PARSER) picks lxml when it is installed and
+    falls back to BeautifulSoup otherwise.
+    """
+    name = name or HTML_PARSER
+    if name == "auto":
+        name = LxmlParser.name if lxml is not None else BeautifulSoupParser.name
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown HTML parser backend '{name}', expected one of {sorted(PARSERS)} or 'auto'")
+    if name == LxmlParser.name and lxml is None:
+        logger.warning("lxml is not installed, falling back to the BeautifulSoup parser")
+        name = BeautifulSoupParser.name
+
+    return PARSERS[name]()
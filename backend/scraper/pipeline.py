@@ -0,0 +1,540 @@
+"""Streaming scrape pipeline: menu discovery -> item listing -> label fetch -> parse -> persist.
+
+Each stage runs on its own worker threads and hands work to the next stage
+through a bounded queue, so network I/O, HTML parsing and database writes
+overlap while a slow stage applies backpressure to the ones before it. At
+most a few queue-lengths of menus are held in memory at any time, however
+many days are scraped.
+"""
+
+import hashlib
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.config.campuses import DEFAULT_CAMPUS, Campus
+from backend.config.config import (
+    MAX_CONCURRENCY, MAX_HALL_WORKERS, PIPELINE_QUEUE_SIZE, PIPELINE_LABEL_WORKERS,
+    PIPELINE_PARSE_WORKERS, PARSE_PROCESSES, PERSIST_BATCH_SIZE, PERSIST_FLUSH_INTERVAL, SCRAPE_DAY_BUDGET,
+    SCRAPE_HORIZON_DAYS
+)
+from backend.database.db import SessionLocal, ScrapeState, schema_exists
+from backend.database.write_queue import write_queue
+from backend.models.item import MenuItem
+from backend.models.menu import Menu
+from backend.models.nutrition import NutritionInfo
+from backend.scraper.archive import append_menus
+from backend.scraper.item_scraper import ItemScraper
+from backend.scraper.label_memo import LabelMemo
+from backend.scraper.menu_scraper import MenuScraper
+from backend.scraper.nutrition_cache import NutritionCache
+from backend.scraper.nutrition_scraper import NutritionScraper
+from backend.scraper.parse_pool import ParsePool
+from backend.scraper.parsers import HtmlParser, get_parser
+from backend.scraper.priority import prioritize_days
+from backend.scraper.session_pool import SessionPool
+from backend.scraper.stats import ScrapeStats
+from backend.services.menu_import import import_menu_to_db, serialize_nutrition_info
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+STOP = object()
+
+
+@dataclass
+class HallTarget:
+    """A dining hall to scrape."""
+    dining_hall_id: int
+    name: str
+    unit_oid: str
+    campus: str = DEFAULT_CAMPUS
+
+
+@dataclass
+class MenuJob:
+    """One menu flowing through the pipeline, accumulating results stage by stage."""
+    hall: HallTarget
+    menu: Menu
+    previous_state: Optional[Tuple[str, int, datetime]] = None  # (panel hash, item count, time) of the last scrape
+    panel_hash: Optional[str] = None
+    unchanged: bool = False  # Panel matched the last scrape; only the scrape time is recorded
+    items: List[MenuItem] = field(default_factory=list)
+    raw_labels: Dict[str, str] = field(default_factory=dict)
+    nutrition: Dict[str, NutritionInfo] = field(default_factory=dict)
+    owned: List[str] = field(default_factory=list)  # Labels this job claimed in the run's LabelMemo
+    shared: Dict[str, Future] = field(default_factory=dict)  # Labels claimed by other jobs
+
+
+class Stage:
+    """A pool of worker threads applying a generator handler to every job in a queue."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[object], Optional[Iterable[object]]],
+        workers: int,
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue]
+    ):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self) -> None:
+        while True:
+            job = self.inbox.get()
+            if job is STOP:
+                # Let sibling workers see the end of input too
+                self.inbox.put(STOP)
+                break
+            try:
+                for result in self.handler(job) or ():
+                    if self.outbox is not None:
+                        self.outbox.put(result)
+            except Exception as e:
+                logger.exception(f"Error in {self.name} stage: {e}")
+
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last and self.outbox is not None:
+            self.outbox.put(STOP)
+
+
+class ScrapePipeline:
+    """
+    Scrapes dining halls through concurrent, queue-connected stages.
+
+    Every request goes through a session checked out of a SessionPool for the
+    unit or menu at hand, so concurrent stages never share server-side state.
+    Discovery runs one worker per hall, item listing skips menus whose panel is unchanged since the last scrape,
+    label fetching fans out over a shared thread pool (fetching each distinct
+    label at most once per run, see LabelMemo), parsing optionally runs in
+    worker processes (see ParsePool), and a single persist
+    worker appends menus to the archive and imports them into the database
+    in batched transactions.
+    """
+
+    def __init__(
+        self,
+        nutrition_cache: Optional[NutritionCache] = None,
+        stats: Optional[ScrapeStats] = None,
+        parser: Optional[HtmlParser] = None,
+        pool: Optional[SessionPool] = None,
+        campus: Optional[Campus] = None,
+        parse_pool: Optional[ParsePool] = None,
+        force: bool = False,
+        days: int = SCRAPE_HORIZON_DAYS,
+        day_budget: int = SCRAPE_DAY_BUDGET,
+        meal_types: Optional[Iterable[str]] = None,
+        concurrency: int = MAX_CONCURRENCY,
+        parse_processes: int = PARSE_PROCESSES,
+        dry_run: bool = False,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        batch_size: int = PERSIST_BATCH_SIZE
+    ):
+        """
+        Args:
+            nutrition_cache: Persistent label cache shared by every hall
+            stats: Counters updated as menus, labels and bytes are processed
+            parser: HTML parser backend; defaults to HTML_PARSER
+            pool: Sessions to scrape with; a new pool (closed after the run) if None
+            campus: Campus the halls belong to; sets the site and rate limits of a new pool
+            parse_pool: Worker processes to parse in, shared with other pipelines; a new
+                pool of parse_processes workers (closed after the run) if None
+            force: Re-scrape every date of the horizon, fresh or not, even if its item panels have not changed
+            days: Number of menu dates considered per hall
+            day_budget: Most overdue dates refreshed per hall (0: every due date); see priority.py
+            meal_types: Only scrape these meals (case-insensitive); all meals if None
+            concurrency: Worker threads fetching nutrition labels
+            parse_processes: Worker processes parsing item panels and labels; parse in threads if 0
+            dry_run: Scrape and parse everything but write nothing to the archive or database;
+                scrape state is read only if the database has been initialized
+        """
+        self.nutrition_cache = nutrition_cache
+        self.stats = stats or ScrapeStats()
+        self.parser = parser or get_parser()
+        self.pool = pool
+        self.campus = campus
+        self.force = force
+        self.days = days
+        self.day_budget = day_budget
+        self.meal_types = {meal_type.upper() for meal_type in meal_types} if meal_types else None
+        self.concurrency = concurrency
+        self.parse_processes = parse_processes
+        self.parse_pool = parse_pool
+        self.dry_run = dry_run
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        # Parses and caches fetched labels without a session of its own, so the
+        # campus's rate limits are the first registered for its host
+        self._label_processor = NutritionScraper(cache=nutrition_cache, parser=self.parser)
+
+    def run(self, targets: List[HallTarget]) -> ScrapeStats:
+        """Scrape the given dining halls and block until everything is persisted."""
+        if not targets:
+            return self.stats
+
+        owns_pool = self.pool is None
+        if owns_pool:
+            self.pool = SessionPool(stats=self.stats, campus=self.campus)
+        self.memo = LabelMemo()
+        # A dry run must not create the database just to find it has no scrape state
+        self.has_scrape_state = not self.dry_run or schema_exists()
+        owns_parse_pool = self.parse_pool is None and self.parse_processes > 0
+        if owns_parse_pool:
+            self.parse_pool = ParsePool(self.parse_processes, self.parser.name)
+
+        try:
+            self._run_stages(targets)
+        finally:
+            logger.info(f"Label de-duplication: {self.memo.stats()}")
+            logger.info(f"Session pool metrics: {self.pool.metrics()}")
+            if owns_pool:
+                self.pool.close()
+                self.pool = None
+            if owns_parse_pool:
+                self.parse_pool.close()
+                self.parse_pool = None
+
+        return self.stats
+
+    def _run_stages(self, targets: List[HallTarget]) -> None:
+        halls: queue.Queue = queue.Queue()
+        menus: queue.Queue = queue.Queue(self.queue_size)
+        listed: queue.Queue = queue.Queue(self.queue_size)
+        fetched: queue.Queue = queue.Queue(self.queue_size)
+        parsed: queue.Queue = queue.Queue(self.queue_size)
+
+        for target in targets:
+            halls.put(target)
+        halls.put(STOP)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="label") as label_executor:
+            self._label_executor = label_executor
+            hall_workers = max(1, min(MAX_HALL_WORKERS, len(targets)))
+            stages = [
+                Stage("discover", self.discover_menus, hall_workers, halls, menus),
+                Stage("list", self.list_items, hall_workers, menus, listed),
+                Stage("fetch", self.fetch_labels, PIPELINE_LABEL_WORKERS, listed, fetched),
+                Stage("parse", self.parse_labels, PIPELINE_PARSE_WORKERS, fetched, parsed),
+            ]
+            persister = threading.Thread(target=self.persist, args=(parsed,), name="persist", daemon=True)
+
+            for stage in stages:
+                stage.start()
+            persister.start()
+
+            for stage in stages:
+                stage.join()
+            persister.join()
+
+    def _load_scrape_state(self, dining_hall_id: int) -> Dict[Tuple[str, str, str], Tuple[str, int, datetime]]:
+        """Load the last scraped panel hash and time of every menu of a hall in one query."""
+        db = SessionLocal()
+        try:
+            rows = db.query(ScrapeState).filter(ScrapeState.dining_hall_id == dining_hall_id).all()
+            return {
+                (row.date, row.meal_type, row.menu_oid): (row.panel_hash, row.item_count or 0, row.last_scraped_at)
+                for row in rows
+            }
+        finally:
+            db.close()
+
+    def discover_menus(self, hall: HallTarget) -> Iterator[MenuJob]:
+        """
+        Stage 1: select the hall's unit and emit the menus of its due dates, most overdue first.
+
+        Without force, a date is only refreshed once its staleness score (time
+        since its least recently scraped menu, relative to the refresh interval
+        for how far out it is) reaches 1, and at most day_budget dates are.
+        """
+        logger.info(f"Scraping menus for dining hall: {hall.name} (unit {hall.unit_oid})")
+
+        with self.pool.checkout() as session_manager:
+            if session_manager is None:
+                logger.error(f"Failed to initialize session for {hall.name}")
+                return
+            menu_index = MenuScraper(session_manager, hall.unit_oid, self.parser).get_menu_index()
+
+        if not menu_index:
+            logger.warning(f"No menus found for {hall.name}")
+            return
+
+        known = self._load_scrape_state(hall.dining_hall_id) if self.has_scrape_state and not self.force else {}
+        menus_by_date = {
+            date_str: [
+                menu for menu in menu_index[date_str]
+                if not self.meal_types or menu.meal_type.upper() in self.meal_types
+            ]
+            for date_str in list(menu_index)[:self.days]
+        }
+        # Dates without any of the requested meals have nothing to refresh
+        menus_by_date = {date_str: menus for date_str, menus in menus_by_date.items() if menus}
+
+        dates = list(menus_by_date)
+        if not self.force:
+            last_scraped = {}
+            for date_str, menus in menus_by_date.items():
+                states = [known.get((menu.date, menu.meal_type, menu.menu_oid)) for menu in menus]
+                # A date is as stale as its least recently scraped menu; never scraped if any menu is new
+                last_scraped[date_str] = None if None in states else min((state[2] for state in states), default=None)
+
+            priorities = prioritize_days(dates, last_scraped)
+            due = [priority for priority in priorities if priority.due]
+            if self.day_budget > 0:
+                due = due[:self.day_budget]
+            dates = [priority.date for priority in due]
+
+            deferred = len(priorities) - len(dates)
+            if deferred:
+                self.stats.add(days_deferred=deferred)
+            logger.info(
+                f"Refreshing {len(dates)} of {len(priorities)} dates at {hall.name}: "
+                + ", ".join(f"+{priority.day_offset}d ({priority.score:.1f})" for priority in due)
+            )
+
+        for date_str in dates:
+            for menu in menus_by_date[date_str]:
+                yield MenuJob(
+                    hall=hall,
+                    menu=menu,
+                    previous_state=known.get((menu.date, menu.meal_type, menu.menu_oid))
+                )
+
+    def list_items(self, job: MenuJob) -> Iterator[MenuJob]:
+        """Stage 2: fetch the item panel, skip unchanged menus, and parse the item list."""
+        with self.pool.checkout(job.hall.unit_oid) as session_manager:
+            if session_manager is None:
+                logger.error(f"No session available for {job.hall.name}")
+                return
+            item_scraper = ItemScraper(session_manager, self.parser)
+            item_panel_html = item_scraper.get_item_panel(job.menu.menu_oid)
+        if item_panel_html is None:
+            return
+
+        job.panel_hash = hashlib.sha256(item_panel_html.encode("utf-8")).hexdigest()
+        if job.previous_state and job.previous_state[0] == job.panel_hash:
+            logger.info(f"Skipping unchanged {job.menu.meal_type} for {job.menu.date} at {job.hall.name}")
+            self.stats.add(menus_skipped=1, items_skipped=job.previous_state[1])
+            # Still passed on so the persist stage records that the menu was checked
+            job.unchanged = True
+            yield job
+            return
+
+        if self.parse_pool:
+            job.items = self.parse_pool.parse_items(item_panel_html, job.menu.menu_oid)
+        else:
+            job.items = item_scraper.parse_items(item_panel_html, job.menu.menu_oid)
+        logger.info(f"Found {len(job.items)} items for {job.menu.meal_type} on {job.menu.date} at {job.hall.name}")
+        yield job
+
+    def fetch_labels(self, job: MenuJob) -> Iterator[MenuJob]:
+        """
+        Stage 3: fetch raw labels for every item concurrently.
+
+        Fresh labels come from the cache. Labels another menu in this run has
+        already claimed are linked rather than requested again; they are filled
+        in when that menu's label is parsed.
+        """
+        for item_oid in dict.fromkeys(item.item_oid for item in job.items):
+            cached = self._label_processor.get_cached(item_oid)
+            if cached:
+                job.nutrition[item_oid] = cached
+                self.stats.add(labels_cached=1)
+                continue
+
+            future, owner = self.memo.claim(item_oid)
+            if owner:
+                job.owned.append(item_oid)
+            else:
+                job.shared[item_oid] = future
+                self.stats.add(labels_deduplicated=1)
+
+        if job.owned:
+            # Labels are fetched while the menu is selected, on one session for the whole menu
+            with self.pool.checkout(job.hall.unit_oid, job.menu.menu_oid) as session_manager:
+                if session_manager is None:
+                    logger.error(f"No session available for {job.menu.meal_type} on {job.menu.date} at {job.hall.name}")
+                    for item_oid in job.owned:
+                        self.memo.resolve(item_oid, None)
+                    return
+                nutrition_scraper = NutritionScraper(session_manager, self.nutrition_cache, self.parser)
+                labels = self._label_executor.map(nutrition_scraper.fetch_label, job.owned)
+                for item_oid, label_html in zip(job.owned, labels):
+                    if label_html is None:
+                        self.memo.resolve(item_oid, None)
+                        continue
+                    job.raw_labels[item_oid] = label_html
+                    self.stats.add(labels_fetched=1)
+        yield job
+
+    def parse_labels(self, job: MenuJob) -> Iterator[MenuJob]:
+        """Stage 4: parse fetched labels into NutritionInfo objects, in worker processes if configured."""
+        parsed = self._label_processor.process_labels(job.raw_labels, self.parse_pool)
+        for item_oid, nutrition_info in parsed.items():
+            if nutrition_info:
+                job.nutrition[item_oid] = nutrition_info
+            self.memo.resolve(item_oid, nutrition_info)
+
+        # Raw HTML is no longer needed; drop it before the job is queued again
+        job.raw_labels = {}
+        yield job
+
+    def persist(self, inbox: queue.Queue) -> None:
+        """
+        Stage 5: append parsed menus to the archive and import them in batched transactions.
+
+        Batches are written on the shared writer thread, so the persist stages of
+        concurrently scraped campuses take turns instead of contending for SQLite's lock.
+        """
+        if self.dry_run:
+            while True:
+                job = inbox.get()
+                if job is STOP:
+                    return
+                if not job.unchanged:
+                    self.stats.add(menus_scraped=1, items_scraped=len(job.items))
+
+        db = SessionLocal()
+        batch: List[MenuJob] = []
+        # Menus waiting for labels claimed by menus further back in the pipeline
+        waiting: List[MenuJob] = []
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    job = inbox.get(timeout=0.1 if waiting else PERSIST_FLUSH_INTERVAL)
+                except queue.Empty:
+                    job = None
+
+                if job is STOP:
+                    break
+                if job is not None:
+                    waiting.append(job)
+
+                still_waiting = []
+                for waiting_job in waiting:
+                    if all(future.done() for future in waiting_job.shared.values()):
+                        batch.append(waiting_job)
+                    else:
+                        still_waiting.append(waiting_job)
+                waiting = still_waiting
+
+                now = time.monotonic()
+                if batch and (len(batch) >= self.batch_size or now - last_flush >= PERSIST_FLUSH_INTERVAL):
+                    write_queue.run(self._persist_batch, db, batch)
+                    batch = []
+                    last_flush = now
+
+            # Every stage has finished; labels whose owner failed are simply missing
+            batch.extend(waiting)
+            if batch:
+                write_queue.run(self._persist_batch, db, batch)
+        finally:
+            db.close()
+
+    def _menu_data(self, job: MenuJob) -> Dict:
+        for item_oid, future in job.shared.items():
+            if future.done() and future.result():
+                job.nutrition[item_oid] = future.result()
+
+        results = []
+        for item in job.items:
+            nutrition_info = job.nutrition.get(item.item_oid)
+            if nutrition_info:
+                results.append({
+                    "name": item.name,
+                    "category": item.category,
+                    "nutrition": serialize_nutrition_info(nutrition_info)
+                })
+
+        return {
+            "dining_hall_id": job.hall.dining_hall_id,
+            "date": job.menu.date,
+            "meal_type": job.menu.meal_type,
+            "items": results
+        }
+
+    def _record_scrape_state(self, db, job: MenuJob) -> None:
+        """Remember the item panel that was just imported for this menu."""
+        scrape_state = db.query(ScrapeState).filter(
+            ScrapeState.dining_hall_id == job.hall.dining_hall_id,
+            ScrapeState.date == job.menu.date,
+            ScrapeState.meal_type == job.menu.meal_type,
+            ScrapeState.menu_oid == job.menu.menu_oid
+        ).first()
+
+        if not scrape_state:
+            scrape_state = ScrapeState(
+                dining_hall_id=job.hall.dining_hall_id,
+                date=job.menu.date,
+                meal_type=job.menu.meal_type,
+                menu_oid=job.menu.menu_oid
+            )
+            db.add(scrape_state)
+        scrape_state.panel_hash = job.panel_hash
+        scrape_state.item_count = job.previous_state[1] if job.unchanged else len(job.items)
+        scrape_state.last_scraped_at = datetime.utcnow()
+
+    def _persist_batch(self, db, batch: List[MenuJob]) -> None:
+        """Import a batch of menus in one transaction, falling back to one menu at a time."""
+        unchanged = [job for job in batch if job.unchanged]
+        batch = [job for job in batch if not job.unchanged]
+        menu_data = [self._menu_data(job) for job in batch]
+        if menu_data:
+            try:
+                records = append_menus(menu_data)
+                logger.info(f"Archived {len(batch)} menus ({records} items)")
+            except (OSError, ValueError) as e:
+                logger.error(f"Error archiving menus: {e}")
+
+        try:
+            for job in unchanged:
+                self._record_scrape_state(db, job)
+            for job, data in zip(batch, menu_data):
+                if not import_menu_to_db(data, db, job.hall.dining_hall_id, commit=False):
+                    raise RuntimeError(f"import failed for {job.menu.meal_type} on {job.menu.date}")
+                self._record_scrape_state(db, job)
+            db.commit()
+            for job in batch:
+                self.stats.add(menus_scraped=1, items_scraped=len(job.items))
+            return
+        except Exception as e:
+            db.rollback()
+            if len(batch) + len(unchanged) == 1:
+                logger.error(f"Error persisting menu: {e}")
+                return
+            logger.warning(f"Batch import failed ({e}), retrying {len(batch)} menus individually")
+
+        if unchanged:
+            for job in unchanged:
+                self._record_scrape_state(db, job)
+            db.commit()
+        for job, data in zip(batch, menu_data):
+            if not import_menu_to_db(data, db, job.hall.dining_hall_id):
+                continue
+            self._record_scrape_state(db, job)
+            db.commit()
+            self.stats.add(menus_scraped=1, items_scraped=len(job.items))
@@ -0,0 +1,80 @@
+"""Staleness-driven priorities for the scrape horizon.
+
+Today's and tomorrow's menus change most and are the ones users plan with;
+menus a week out rarely change and are rarely looked at. Rather than
+re-scraping every day of the horizon on every run, each (date, hall) pair
+gets a staleness score: the time since it was last scraped divided by the
+refresh interval for how far out the date is (SCRAPE_REFRESH_HOURS). Pairs
+scoring 1 or more are due; the most overdue are scraped first, and a run can
+be capped at a budget of dates per hall (SCRAPE_DAY_BUDGET) so the near
+horizon is refreshed often for the same total number of requests.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from backend.config.config import SCRAPE_REFRESH_HOURS
+from backend.scraper.archive import menu_date
+
+
+@dataclass
+class DayPriority:
+    """A menu date of one hall and how overdue its refresh is."""
+    date: str  # As shown on the site, e.g. "Monday, March 31, 2025"
+    day_offset: int  # Days from today
+    score: float  # Staleness; 1.0 means due, infinity means never scraped
+
+    @property
+    def due(self) -> bool:
+        return self.score >= 1.0
+
+
+def refresh_interval(day_offset: int) -> float:
+    """Seconds between refreshes of a menu date ``day_offset`` days from today."""
+    for last_offset, hours in SCRAPE_REFRESH_HOURS:
+        if last_offset is None or day_offset <= last_offset:
+            return hours * 3600
+    return SCRAPE_REFRESH_HOURS[-1][1] * 3600
+
+
+def staleness_score(last_scraped_at: Optional[datetime], day_offset: int, now: datetime) -> float:
+    """Time since the last scrape as a multiple of the date's refresh interval."""
+    if last_scraped_at is None:
+        return math.inf
+    return (now - last_scraped_at).total_seconds() / refresh_interval(day_offset)
+
+
+def prioritize_days(
+    dates: Iterable[str],
+    last_scraped: Dict[str, Optional[datetime]],
+    today: Optional[date] = None,
+    now: Optional[datetime] = None
+) -> List[DayPriority]:
+    """
+    Score a hall's menu dates, most overdue first.
+
+    Args:
+        dates: Menu dates in site order (soonest first)
+        last_scraped: Date to the oldest last scrape among its menus; None if a menu was never scraped
+        today: Reference day for offsets; the local date if None
+        now: Reference time for staleness, in UTC like ScrapeState; the current time if None
+
+    Returns:
+        Every date with its score, sorted by score (descending), nearest first on ties
+    """
+    today = today or date.today()
+    now = now or datetime.utcnow()
+
+    priorities = []
+    for position, date_str in enumerate(dates):
+        try:
+            day_offset = max((menu_date(date_str) - today).days, 0)
+        except ValueError:
+            day_offset = position
+        score = staleness_score(last_scraped.get(date_str), day_offset, now)
+        priorities.append(DayPriority(date_str, day_offset, score))
+
+    priorities.sort(key=lambda priority: (-priority.score, priority.day_offset))
+    return priorities
@@ -0,0 +1,62 @@
+"""On-disk recordings of NetNutrition request/response pairs.
+
+Each exchange is stored as one JSON file named after a hash of the request
+(method, endpoint and form data), so the same request always maps to the same
+recording and replay is a single dictionary lookup.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Dict, Mapping
+
+
+def request_key(method: str, endpoint: str, data: Mapping[str, Any] = None) -> str:
+    """Build a stable key identifying a request."""
+    form = sorted((str(key), str(value)) for key, value in (data or {}).items())
+    payload = json.dumps([method.upper(), endpoint, form])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def save_exchange(
+    record_dir: str,
+    method: str,
+    endpoint: str,
+    data: Mapping[str, Any],
+    status: int,
+    content_type: str,
+    body: str
+) -> str:
+    """Write a request/response pair to the recording directory and return its path."""
+    if not os.path.exists(record_dir):
+        os.makedirs(record_dir, exist_ok=True)
+
+    key = request_key(method, endpoint, data)
+    path = os.path.join(record_dir, f"{key}.json")
+    exchange = {
+        "method": method.upper(),
+        "endpoint": endpoint,
+        "data": {str(k): str(v) for k, v in (data or {}).items()},
+        "status": status,
+        "content_type": content_type,
+        "body": body,
+    }
+
+    # Write atomically so a concurrent reader never sees a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(exchange, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_exchanges(record_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Load every recorded exchange in a directory, keyed by request key."""
+    exchanges = {}
+    for path in sorted(glob.glob(os.path.join(record_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            exchange = json.load(f)
+        key = request_key(exchange["method"], exchange["endpoint"], exchange.get("data"))
+        exchanges[key] = exchange
+    return exchanges
@@ -0,0 +1,222 @@
+"""Local stand-in for NetNutrition that replays recorded request/response pairs.
+
+Record a run first by setting NETNUTRITION_RECORD_DIR, then serve it:
+
+    python -m backend.scraper.replay_server --recordings recordings --port 8001 --latency 0.2
+
+and point the scraper at it with
+NETNUTRITION_BASE_URL=http://127.0.0.1:8001/NetNutrition/7. Latency, jitter,
+error, stall and session-expiry injection make it possible to measure
+throughput, concurrency limits, retries and session recovery without network
+access.
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlparse
+
+from backend.config.config import BASE_URL
+from backend.scraper.recording import load_exchanges, request_key
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering requests from a recording directory."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        exchanges: Dict[str, Dict[str, Any]],
+        base_path: str = urlparse(BASE_URL).path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 30.0,
+        session_ttl: int = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            address: (host, port) to listen on
+            exchanges: Recorded exchanges, as returned by load_exchanges
+            base_path: URL path prefix that recorded endpoints are served under
+            latency: Seconds added to every response
+            jitter: Maximum extra random delay in seconds
+            error_rate: Probability of answering with a 503 instead of the recording
+            stall_rate: Probability of stalling for ``stall_seconds`` before answering
+            stall_seconds: Length of an injected stall, to exercise client timeouts
+            session_ttl: If set, requests a session cookie may make before it expires and
+                is redirected to the homepage, like NetNutrition does with stale sessions
+            seed: Seed for the injection random number generator
+        """
+        super().__init__(address, ReplayRequestHandler)
+        self.exchanges = exchanges
+        self.base_path = base_path.rstrip("/")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.session_ttl = session_ttl
+        self.sessions: Dict[str, int] = {}
+        self.random = random.Random(seed)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "replayed": 0, "missing": 0, "errors": 0, "stalls": 0, "sessions": 0, "expired": 0}
+
+    def count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def roll(self, probability: float) -> bool:
+        with self._stats_lock:
+            return self.random.random() < probability
+
+    def new_session(self) -> str:
+        session_id = uuid.uuid4().hex
+        with self._stats_lock:
+            self.sessions[session_id] = 0
+            self.stats["sessions"] += 1
+        return session_id
+
+    def use_session(self, session_id: Optional[str]) -> bool:
+        """Count a request against a session; False if the session is unknown or expired."""
+        with self._stats_lock:
+            if session_id not in self.sessions or self.sessions[session_id] >= self.session_ttl:
+                self.stats["expired"] += 1
+                return False
+            self.sessions[session_id] += 1
+            return True
+
+    def delay(self) -> float:
+        with self._stats_lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """Serves recorded responses for GET and POST requests."""
+
+    server: ReplayServer
+
+    def do_GET(self):
+        self._replay("GET", {})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        self._replay("POST", dict(parse_qsl(body, keep_blank_values=True)))
+
+    def _replay(self, method: str, data: Dict[str, str]) -> None:
+        server = self.server
+        server.count("requests")
+
+        path = urlparse(self.path).path.rstrip("/")
+        if server.base_path and path.startswith(server.base_path):
+            path = path[len(server.base_path):]
+
+        if server.stall_rate and server.roll(server.stall_rate):
+            server.count("stalls")
+            time.sleep(server.stall_seconds)
+
+        delay = server.delay()
+        if delay:
+            time.sleep(delay)
+
+        if server.error_rate and server.roll(server.error_rate):
+            server.count("errors")
+            self._respond(503, "text/plain", "Injected failure")
+            return
+
+        cookie_header = None
+        if server.session_ttl:
+            if path == "":
+                cookie_header = f"ASP.NET_SessionId={server.new_session()}; Path=/"
+            else:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                session_id = cookie["ASP.NET_SessionId"].value if "ASP.NET_SessionId" in cookie else None
+                if not server.use_session(session_id):
+                    self._redirect(f"{server.base_path}/")
+                    return
+
+        exchange = server.exchanges.get(request_key(method, path, data))
+        if not exchange:
+            server.count("missing")
+            self._respond(404, "text/plain", f"No recording for {method} {path} {data}")
+            return
+
+        server.count("replayed")
+        self._respond(exchange["status"], exchange["content_type"] or "text/html", exchange["body"], cookie_header)
+
+    def _respond(self, status: int, content_type: str, body: str, cookie: Optional[str] = None) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded NetNutrition responses")
+    parser.add_argument("--recordings", required=True, help="Directory written by SessionManager record mode")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--base-path", default=urlparse(BASE_URL).path, help="URL prefix for recorded endpoints")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    parser.add_argument("--stall-seconds", type=float, default=30.0, help="Length of an injected stall")
+    parser.add_argument("--session-ttl", type=int, default=0, help="Requests per session before it expires")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for injected latency and failures")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    exchanges = load_exchanges(args.recordings)
+    server = ReplayServer(
+        (args.host, args.port),
+        exchanges,
+        base_path=args.base_path,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        session_ttl=args.session_ttl,
+        seed=args.seed
+    )
+    logger.info(f"Replaying {len(exchanges)} recorded exchanges on http://{args.host}:{args.port}{server.base_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Replay stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Scraper run orchestration, independent of the FastAPI application."""
+
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterable, List, Optional, TextIO
+
+from backend.config.campuses import CAMPUSES, DEFAULT_CAMPUS, get_campus
+from backend.config.config import (
+    DEFAULT_UNIT_OID, MAX_CONCURRENCY, PARSE_PROCESSES, SCRAPE_DAY_BUDGET, SCRAPE_HORIZON_DAYS
+)
+from backend.database.db import SessionLocal, DiningHall, schema_exists
+from backend.scraper.nutrition_cache import NutritionCache, campus_cache_path
+from backend.scraper.parse_pool import ParsePool
+from backend.scraper.pipeline import HallTarget, ScrapePipeline
+from backend.scraper.stats import ScrapeStats
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Periodically writes menus/sec, labels/sec and bytes downloaded for a running scrape."""
+
+    def __init__(self, stats: ScrapeStats, interval: float = 2.0, stream: TextIO = sys.stderr):
+        self.stats = stats
+        self.interval = interval
+        self.stream = stream
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = time.monotonic()
+
+    def line(self) -> str:
+        counts = self.stats.as_dict()
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        menus = counts["menus_scraped"] + counts["menus_skipped"]
+        labels = counts["labels_fetched"]
+        megabytes = counts["bytes_downloaded"] / 1e6
+        return (
+            f"[{elapsed:6.1f}s] menus {menus} ({menus / elapsed:.2f}/s, {counts['menus_skipped']} unchanged) | "
+            f"labels {labels} ({labels / elapsed:.1f}/s, {counts['labels_cached']} cached, "
+            f"{counts['labels_deduplicated']} de-duplicated) | "
+            f"{megabytes:.2f} MB ({megabytes / elapsed:.2f} MB/s) in {counts['requests_made']} requests"
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.stream.write(self.line() + "\n")
+            self.stream.flush()
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.stream.write(self.line() + "\n")
+        self.stream.flush()
+
+
+def load_targets(
+    halls: Optional[Iterable[str]] = None,
+    campuses: Optional[Iterable[str]] = None
+) -> List[HallTarget]:
+    """
+    Load the dining halls to scrape from the database.
+
+    Args:
+        halls: Hall ids or names (case-insensitive) to restrict the run to; all halls if None
+        campuses: Campus keys or names to restrict the run to; all campuses if None
+
+    Returns:
+        Halls to scrape; the registry's halls, numbered as seed_initial_data would,
+        when the database has not been initialized (e.g. on a dry run), and the
+        default unit when there are none
+    """
+    if schema_exists():
+        db = SessionLocal()
+        try:
+            targets = [
+                HallTarget(dining_hall.id, dining_hall.name, dining_hall.unit_oid or DEFAULT_UNIT_OID, dining_hall.campus or DEFAULT_CAMPUS)
+                for dining_hall in db.query(DiningHall).all()
+            ]
+        finally:
+            db.close()
+    else:
+        units = [(campus.key, unit) for campus in CAMPUSES.values() for unit in campus.units]
+        targets = [
+            HallTarget(dining_hall_id, unit.name, unit.unit_oid, campus_key)
+            for dining_hall_id, (campus_key, unit) in enumerate(units, start=1)
+        ]
+
+    # If no dining halls in database, use default unit OID
+    targets = targets or [HallTarget(1, "default", DEFAULT_UNIT_OID, DEFAULT_CAMPUS)]
+
+    if halls:
+        wanted = {str(hall).lower() for hall in halls}
+        targets = [
+            target for target in targets
+            if str(target.dining_hall_id) in wanted or target.name.lower() in wanted
+        ]
+    if campuses:
+        wanted = {get_campus(campus).key for campus in campuses}
+        targets = [target for target in targets if target.campus in wanted]
+    return targets
+
+
+def scrape_campus(
+    campus_key: str,
+    targets: List[HallTarget],
+    stats: ScrapeStats,
+    parse_pool: Optional[ParsePool] = None,
+    **options
+) -> None:
+    """
+    Scrape one campus's halls with its own sessions, rate limits and label cache.
+
+    Args:
+        campus_key: Key of the campus in the registry
+        targets: The campus's halls
+        stats: Counters shared by every campus in the run
+        parse_pool: Worker processes shared by every campus in the run
+        options: Passed on to ScrapePipeline (force, days, meal_types, ...)
+    """
+    campus = CAMPUSES.get(campus_key)
+    if campus is None:
+        logger.warning(f"Skipping {len(targets)} halls of unregistered campus '{campus_key}'")
+        return
+
+    # Open the persistent nutrition label cache shared by every menu of the campus;
+    # dry runs read it but keep their changes in memory
+    nutrition_cache = NutritionCache(campus_cache_path(campus.key), read_only=options.get("dry_run", False))
+    try:
+        logger.info(f"Scraping {len(targets)} halls at {campus.name}")
+        # Stream menus from discovery through label fetching and parsing into the database
+        ScrapePipeline(nutrition_cache, stats, campus=campus, parse_pool=parse_pool, **options).run(targets)
+        logger.info(f"Finished scraping {campus.name}")
+
+    except Exception as e:
+        logger.error(f"Error scraping {campus.name}: {str(e)}")
+        traceback.print_exc()
+
+    finally:
+        logger.info(f"Nutrition cache stats for {campus.name}: {nutrition_cache.stats()}")
+        nutrition_cache.close()
+
+
+def run_scraper(
+    force: bool = False,
+    halls: Optional[Iterable[str]] = None,
+    days: int = SCRAPE_HORIZON_DAYS,
+    day_budget: int = SCRAPE_DAY_BUDGET,
+    meal_types: Optional[Iterable[str]] = None,
+    concurrency: int = MAX_CONCURRENCY,
+    parse_processes: int = PARSE_PROCESSES,
+    dry_run: bool = False,
+    progress: Optional[ProgressReporter] = None,
+    stats: Optional[ScrapeStats] = None,
+    campuses: Optional[Iterable[str]] = None
+) -> ScrapeStats:
+    """
+    Run the scraper to get the latest menu data.
+
+    Campuses are scraped concurrently and independently: each has its own
+    session pool, rate limits and label cache, and a failure at one campus
+    does not stop the others.
+
+    Args:
+        force: Re-scrape every date of the horizon, fresh or not, even if its item panels have not changed
+        halls: Hall ids or names to scrape; all halls if None
+        days: Number of menu dates considered per hall
+        day_budget: Most overdue dates refreshed per hall; every due date if 0
+        meal_types: Only scrape these meals; all meals if None
+        concurrency: Worker threads fetching nutrition labels, per campus
+        parse_processes: Worker processes parsing HTML, shared by all campuses; parse in threads if 0
+        dry_run: Scrape and parse without writing to the archive, database or label cache
+        progress: Reporter started for the duration of the run
+        stats: Counters to update; a new ScrapeStats if None
+        campuses: Campus keys or names to scrape; all campuses if None
+
+    Returns:
+        Counters describing the work done and skipped in this run
+    """
+    logger.info("Starting menu scraper")
+    stats = stats if stats is not None else ScrapeStats()
+
+    try:
+        targets = load_targets(halls, campuses)
+    except Exception as e:
+        logger.error(f"Error loading dining halls: {str(e)}")
+        return stats
+    if not targets:
+        logger.warning(f"No dining halls match {list(halls or [])} at {list(campuses or ['any campus'])}")
+        return stats
+
+    campus_of = attrgetter("campus")
+    by_campus = {
+        campus_key: list(campus_targets)
+        for campus_key, campus_targets in groupby(sorted(targets, key=campus_of), key=campus_of)
+    }
+    parse_pool = ParsePool(parse_processes) if parse_processes > 0 else None
+    if progress:
+        progress.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(by_campus), thread_name_prefix="campus") as executor:
+            for campus_key, campus_targets in by_campus.items():
+                executor.submit(
+                    scrape_campus,
+                    campus_key,
+                    campus_targets,
+                    stats,
+                    parse_pool,
+                    force=force,
+                    days=days,
+                    day_budget=day_budget,
+                    meal_types=meal_types,
+                    concurrency=concurrency,
+                    dry_run=dry_run
+                )
+
+        logger.info("Scraping completed")
+        logger.info(stats.summary())
+
+    finally:
+        if progress:
+            progress.stop()
+        if parse_pool:
+            parse_pool.close()
+
+    return stats
+
+
+def run_scraper_process(*args: str) -> ScrapeStats:
+    """
+    Run the scraper CLI (``python -m backend.scraper``) in a child process.
+
+    Keeps scraping CPU and memory out of the calling (API) process.
+
+    Args:
+        args: Extra command-line options for the scraper CLI
+
+    Returns:
+        Counters reported by the child process
+
+    Raises:
+        subprocess.CalledProcessError: If the scraper exits with an error
+    """
+    command = [sys.executable, "-m", "backend.scraper", "--json", "--no-progress", *args]
+    logger.info(f"Starting scraper process: {' '.join(command)}")
+    completed = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True)
+
+    output = completed.stdout.strip().splitlines()
+    counts = json.loads(output[-1]) if output else {}
+    return ScrapeStats(**counts)
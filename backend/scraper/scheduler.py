@@ -0,0 +1,288 @@
+"""Cron-style scraper scheduling that is safe to run in every API worker.
+
+Each worker process may start a ScraperScheduler. At every scheduled time all
+of them wake up, but only the one holding an exclusive file lock runs the
+scrape; the others (and any run still in progress) are skipped. Run status is
+kept in a small JSON file so any worker can report the last and next run.
+"""
+
+import json
+import logging
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Set
+
+from backend.config.config import SCRAPE_SCHEDULE, SCRAPE_LOCK_PATH, SCRAPE_STATUS_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# (name, minimum, maximum) of the five cron fields
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+class CronSchedule:
+    """
+    A five-field cron expression ("minute hour day month weekday").
+
+    Fields accept ``*``, numbers, ranges (``1-5``), lists (``1,15``) and steps
+    (``*/15``, ``0-30/10``). Weekdays run from 0 (Sunday) to 6, with 7 also
+    meaning Sunday. As in cron, when both day and weekday are restricted a
+    time matches if either does.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+
+        values = {}
+        for part, (name, minimum, maximum) in zip(parts, CRON_FIELDS):
+            upper = 7 if name == "weekday" else maximum
+            values[name] = self._parse_field(part, minimum, upper, name)
+        if 7 in values["weekday"]:
+            values["weekday"] = (values["weekday"] - {7}) | {0}
+
+        self.minutes = values["minute"]
+        self.hours = values["hour"]
+        self.days = values["day"]
+        self.months = values["month"]
+        self.weekdays = values["weekday"]
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int, name: str) -> Set[int]:
+        values = set()
+        for term in field.split(","):
+            term_range, _, step = term.partition("/")
+            try:
+                step_size = int(step) if step else 1
+                if term_range == "*":
+                    start, end = minimum, maximum
+                elif "-" in term_range:
+                    start, end = (int(bound) for bound in term_range.split("-", 1))
+                else:
+                    start = int(term_range)
+                    end = maximum if step else start
+            except ValueError:
+                raise ValueError(f"Invalid cron {name} field: {field!r}") from None
+            if step_size < 1 or start < minimum or end > maximum or start > end:
+                raise ValueError(f"Invalid cron {name} field: {field!r}")
+            values.update(range(start, end + 1, step_size))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first scheduled minute strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month_start = candidate.replace(day=1, hour=0, minute=0)
+                candidate = (month_start + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class FileLock:
+    """Non-blocking exclusive lock on a file, shared across processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        """Try to take the lock. Returns False if another process (or run) holds it."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def read_status(status_path: str = SCRAPE_STATUS_PATH) -> Dict[str, Any]:
+    """Load the shared scraper run status (empty if no run has been recorded)."""
+    try:
+        with open(status_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_status(status: Dict[str, Any], status_path: str = SCRAPE_STATUS_PATH) -> None:
+    """Atomically replace the shared scraper run status."""
+    directory = os.path.dirname(status_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{status_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, status_path)
+
+
+def scraper_status(schedule: str = SCRAPE_SCHEDULE, status_path: str = SCRAPE_STATUS_PATH) -> Dict[str, Any]:
+    """Last run details from the shared status file plus the next scheduled run."""
+    status = read_status(status_path)
+    status["schedule"] = schedule
+    status["next_run_at"] = CronSchedule(schedule).next_after(datetime.now()).isoformat()
+    return status
+
+
+class ScraperScheduler:
+    """Runs a scrape job on a cron schedule, at most once per slot across all processes."""
+
+    def __init__(
+        self,
+        job: Callable[[], Any],
+        schedule: str = SCRAPE_SCHEDULE,
+        lock_path: str = SCRAPE_LOCK_PATH,
+        status_path: str = SCRAPE_STATUS_PATH
+    ):
+        """
+        Args:
+            job: Function performing the scrape; its result is recorded if it has ``as_dict()``
+            schedule: Cron expression in server local time, e.g. "0 3 * * *" for 3am daily
+            lock_path: File locked for the duration of a run
+            status_path: JSON file recording the last and next run
+        """
+        self.job = job
+        self.schedule = CronSchedule(schedule)
+        self.lock_path = lock_path
+        self.status_path = status_path
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_run(self, after: Optional[datetime] = None) -> datetime:
+        return self.schedule.next_after(after or datetime.now())
+
+    def status(self) -> Dict[str, Any]:
+        return scraper_status(self.schedule.expression, self.status_path)
+
+    def _update_status(self, **fields: Any) -> None:
+        status = read_status(self.status_path)
+        status.update(fields)
+        write_status(status, self.status_path)
+
+    def run_once(self, slot: Optional[datetime] = None) -> bool:
+        """
+        Run the job now unless another run holds the lock or already covered this slot.
+
+        Args:
+            slot: Scheduled time this run is for; workers waking for the same slot run it once
+
+        Returns:
+            Whether the job was run
+        """
+        lock = FileLock(self.lock_path)
+        if not lock.acquire():
+            logger.info("Scraper run skipped: another run is in progress")
+            return False
+
+        try:
+            last_slot = read_status(self.status_path).get("last_slot")
+            if slot and last_slot and last_slot >= slot.isoformat():
+                logger.info(f"Scraper run for {slot.isoformat()} already done by another worker")
+                return False
+
+            started_at = datetime.now()
+            self._update_status(
+                running=True,
+                pid=os.getpid(),
+                last_slot=(slot or started_at).isoformat(),
+                last_started_at=started_at.isoformat()
+            )
+            logger.info("Scheduled scraper run starting")
+
+            result = None
+            error = None
+            try:
+                result = self.job()
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Error in scheduled scraper run: {error}")
+                traceback.print_exc()
+
+            finished_at = datetime.now()
+            self._update_status(
+                running=False,
+                last_finished_at=finished_at.isoformat(),
+                last_duration_seconds=round((finished_at - started_at).total_seconds(), 1),
+                last_result="failed" if error else "succeeded",
+                last_error=error,
+                last_stats=result.as_dict() if hasattr(result, "as_dict") else None,
+                next_run_at=self.next_run(finished_at).isoformat()
+            )
+            return True
+        finally:
+            lock.release()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            slot = self.next_run()
+            logger.info(f"Next scraper run scheduled for {slot.isoformat()}")
+            # Sleep in bounded steps so clock changes and stop requests are noticed
+            while not self._stop.is_set() and datetime.now() < slot:
+                self._stop.wait(min(60.0, max(0.0, (slot - datetime.now()).total_seconds())))
+            if not self._stop.is_set():
+                self.run_once(slot)
+
+    def start(self) -> None:
+        """Start the scheduling thread (a no-op if it is already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="scraper-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop scheduling; a run in progress finishes in the background."""
+        self._stop.set()
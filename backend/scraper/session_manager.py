@@ -1,47 +1,261 @@
 import requests
 import logging
+import random
+import threading
+import time
 from typing import Dict, Optional, Any
+from urllib.parse import urlparse
 import json
-from backend.config.config import BASE_URL, ENDPOINTS, DEFAULT_HEADERS
+from requests.adapters import HTTPAdapter
+from backend.config.config import (
+    BASE_URL, ENDPOINTS, DEFAULT_HEADERS, MAX_CONCURRENCY, MAX_REQUESTS_PER_HOST, RECORD_DIR,
+    REQUESTS_PER_SECOND, REQUEST_BURST, REQUEST_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX, RETRY_STATUS_CODES, SESSION_EXPIRED_STATUS_CODES
+)
+from backend.scraper.rate_limiter import TokenBucket
+from backend.scraper.recording import save_exchange
+from backend.scraper.stats import ScrapeStats
 
 
 logger = logging.getLogger(__name__)
 
+# Per-host semaphores and token buckets shared by every SessionManager so that
+# concurrent scrapers never have more than MAX_REQUESTS_PER_HOST requests in
+# flight, or exceed REQUESTS_PER_SECOND, against one host. Campuses can set
+# their own limits (see backend/config/campuses.py); the first session created
+# for a host fixes them.
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_rate_limiters: Dict[str, TokenBucket] = {}
+_host_lock = threading.Lock()
+
+
+def get_host_semaphore(url: str, max_in_flight: int = MAX_REQUESTS_PER_HOST) -> threading.BoundedSemaphore:
+    """Get the politeness semaphore for the host of the given URL."""
+    host = urlparse(url).netloc
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(max_in_flight)
+        return _host_semaphores[host]
+
+
+def get_host_rate_limiter(url: str, rate: float = REQUESTS_PER_SECOND, burst: int = REQUEST_BURST) -> TokenBucket:
+    """Get the requests-per-second token bucket for the host of the given URL."""
+    host = urlparse(url).netloc
+    with _host_lock:
+        if host not in _host_rate_limiters:
+            _host_rate_limiters[host] = TokenBucket(rate, burst)
+        return _host_rate_limiters[host]
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BACKOFF_BASE, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given (zero-based) retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
 class SessionManager:
     """Manages HTTP sessions and requests to the Grinnell nutrition website."""
-    def __init__(self):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        record_dir: Optional[str] = RECORD_DIR,
+        pool_size: Optional[int] = None,
+        timeout: Any = REQUEST_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        stats: Optional[ScrapeStats] = None,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        request_burst: int = REQUEST_BURST,
+        max_requests_per_host: int = MAX_REQUESTS_PER_HOST
+    ):
+        """
+        Create a session against a NetNutrition site.
+        
+        Args:
+            base_url: Site root, e.g. the live site or a local replay server
+            record_dir: If set, every request/response pair is saved there for replay
+            pool_size: Connections kept open to the host; defaults to the scraper concurrency
+            timeout: Per-request timeout in seconds, or a (connect, read) tuple
+            max_retries: Retries after a timeout, connection error or retryable status
+            stats: Optional ScrapeStats credited with every request made and byte downloaded
+            requests_per_second: Rate limit shared by every session against the host
+            request_burst: Token bucket capacity shared by every session against the host
+            max_requests_per_host: Requests in flight allowed against the host
+        """
+        self.base_url = base_url
+        self.record_dir = record_dir
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stats = stats
         self.session = requests.Session()
+        
+        # Size the connection pool to the number of threads sharing this session
+        pool_size = pool_size or max(MAX_CONCURRENCY, max_requests_per_host)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         self.headers = DEFAULT_HEADERS.copy()
-        self.headers["Referer"] = BASE_URL
-        self.headers["Origin"] = BASE_URL
+        self.headers["Referer"] = base_url
+        self.headers["Origin"] = base_url
         self.headers["X-Requested-With"] = "XMLHttpRequest"
         self.initialized = False
+        self.reinitializations = 0
+        self._generation = 0  # Bumped on every re-initialization
+        # Server-side selections (unit, then menu) replayed after re-initialization
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.host_semaphore = get_host_semaphore(base_url, max_requests_per_host)
+        self.rate_limiter = get_host_rate_limiter(base_url, requests_per_second, request_burst)
+        self._init_lock = threading.RLock()
+    
+    def _record(self, method: str, endpoint: str, data: Dict[str, Any], response: requests.Response) -> None:
+        """Save a request/response pair when recording is enabled."""
+        if not self.record_dir:
+            return
+        try:
+            save_exchange(
+                self.record_dir,
+                method,
+                endpoint,
+                data,
+                response.status_code,
+                response.headers.get("Content-Type", ""),
+                response.text
+            )
+        except OSError as e:
+            logger.warning(f"Failed to record response from {endpoint}: {e}")
+    
+    def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        Send a rate-limited request, retrying timeouts and retryable statuses.
         
-    def initialize(self) -> bool:
-        """Initialize the session by loading the homepage."""
-        if self.initialized:
+        Retries use jittered exponential backoff (honoring Retry-After when the
+        server sends one). The last response is returned even if it is an error
+        status; the last exception is raised if every attempt failed.
+        """
+        url = f"{self.base_url}{endpoint}"
+        
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self.host_semaphore:
+                    response = self.session.request(
+                        method, url, data=data, headers=self.headers, timeout=self.timeout
+                    )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"{method} {endpoint} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            if self.stats is not None:
+                self.stats.add(requests_made=1, bytes_downloaded=len(response.content))
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                self._record(method, endpoint, data or {}, response)
+                return response
+            
+            delay = backoff_delay(attempt)
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), RETRY_BACKOFF_MAX))
+            logger.warning(f"{method} {endpoint} returned {response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+    
+    def _is_expired(self, endpoint: str, response: requests.Response) -> bool:
+        """Whether the server answered as if our session had expired."""
+        if response.status_code in SESSION_EXPIRED_STATUS_CODES:
             return True
         
-        try:
-            response = self.session.get(BASE_URL, headers=self.headers)
-            response.raise_for_status()
-            self.initialized = True
-            logger.info("Session initialized successfully.")
+        # Expired sessions are redirected back to the homepage
+        if response.history and not urlparse(response.url).path.endswith(endpoint):
             return True
-        except requests.RequestException as e:
-            logger.error(f"Failed to initialize session: {e}")
-            return False
+        
+        content_type = response.headers.get("Content-Type", "")
+        if endpoint != ENDPOINTS["nutrition_label"] and response.ok and "json" not in content_type:
+            try:
+                response.json()
+            except ValueError:
+                return True
+        return False
+    
+    def _remember_state(self, endpoint: str, data: Dict[str, Any]) -> None:
+        if endpoint == ENDPOINTS["select_unit"]:
+            self.state = {endpoint: dict(data)}
+        elif endpoint == ENDPOINTS["select_menu"]:
+            self.state[endpoint] = dict(data)
+    
+    def reinitialize(self, generation: Optional[int] = None) -> bool:
+        """
+        Start a fresh server session and replay the unit and menu selections made so far.
+        
+        Args:
+            generation: Session generation the caller saw expire; if another thread
+                has re-initialized since, the session is already fresh and reused
+        """
+        with self._init_lock:
+            if generation is not None and generation != self._generation:
+                return self.initialized
+            
+            logger.warning("NetNutrition session expired, re-initializing")
+            self.reinitializations += 1
+            self._generation += 1
+            self.session.cookies.clear()
+            self.initialized = False
+            if not self.initialize():
+                return False
+            
+            for endpoint in (ENDPOINTS["select_unit"], ENDPOINTS["select_menu"]):
+                if endpoint not in self.state:
+                    continue
+                try:
+                    response = self._request("POST", endpoint, self.state[endpoint])
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    logger.error(f"Failed to restore session state at {endpoint}: {e}")
+                    return False
+            return True
+    
+    def ensure_state(self, unit_oid: Optional[str] = None, menu_oid: Optional[str] = None) -> bool:
+        """Select the given unit and menu on the server unless they are already selected."""
+        if unit_oid is not None and self.state.get(ENDPOINTS["select_unit"]) != {"unitOid": unit_oid}:
+            if self.post(ENDPOINTS["select_unit"], {"unitOid": unit_oid}) is None:
+                return False
+        if menu_oid is not None and self.state.get(ENDPOINTS["select_menu"]) != {"menuOid": menu_oid}:
+            if self.post(ENDPOINTS["select_menu"], {"menuOid": menu_oid}) is None:
+                return False
+        return True
+    
+    def initialize(self) -> bool:
+        """Initialize the session by loading the homepage."""
+        with self._init_lock:
+            if self.initialized:
+                return True
+            
+            try:
+                response = self._request("GET", "")
+                response.raise_for_status()
+                self.initialized = True
+                logger.info("Session initialized successfully.")
+                return True
+            except requests.RequestException as e:
+                logger.error(f"Failed to initialize session: {e}")
+                return False
     
     def post(self, endpoint: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Send a POST request to the specified endpoint."""
         if not self.initialized and not self.initialize():
             return None
         
-        url = f"{BASE_URL}{endpoint}"
-        
         try:
-            response = self.session.post(url, data=data, headers=self.headers)
+            generation = self._generation
+            response = self._request("POST", endpoint, data)
+            if self._is_expired(endpoint, response):
+                if not self.reinitialize(generation):
+                    return None
+                response = self._request("POST", endpoint, data)
             response.raise_for_status()
+            self._remember_state(endpoint, data)
             
             # Special handling for nutrition label endpoint which returns HTML
             if endpoint == ENDPOINTS["nutrition_label"]:
@@ -61,12 +275,15 @@ class SessionManager:
         if not self.initialized and not self.initialize():
             return None
         
-        url = f"{BASE_URL}{endpoint}"
-        
         try:
-            response = self.session.get(url, headers=self.headers)
+            generation = self._generation
+            response = self._request("GET", endpoint)
+            if response.status_code in SESSION_EXPIRED_STATUS_CODES:
+                if not self.reinitialize(generation):
+                    return None
+                response = self._request("GET", endpoint)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
             logger.error(f"GET request failed to {endpoint}: {e}")
-            return None
\ No newline at end of file
+            return None
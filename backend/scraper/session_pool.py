@@ -0,0 +1,129 @@
+"""Pool of independently initialized NetNutrition sessions.
+
+NetNutrition keeps the selected unit and menu in server-side session state,
+so one session cannot safely serve two menus at once. The pool hands out
+sessions exclusively: a worker checks a session out for one unit or menu,
+the pool selects that unit/menu on the server if the session is not already
+on it, and the session goes back to the pool when the worker is done.
+Sessions whose server state already matches are preferred, which saves the
+selection requests.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.config.campuses import Campus
+from backend.config.config import BASE_URL, ENDPOINTS, SESSION_POOL_SIZE
+from backend.scraper.session_manager import SessionManager
+from backend.scraper.stats import ScrapeStats
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """Thread-safe pool of SessionManagers with unit/menu affinity and usage metrics."""
+
+    def __init__(
+        self,
+        size: int = SESSION_POOL_SIZE,
+        base_url: str = BASE_URL,
+        stats: Optional[ScrapeStats] = None,
+        campus: Optional[Campus] = None
+    ):
+        """
+        Args:
+            size: Maximum number of sessions; checkouts block while all are in use
+            base_url: Site root every session talks to
+            stats: Counters credited with the requests and bytes of every session
+            campus: Campus whose site (overriding base_url) and rate limits the sessions use
+        """
+        self.size = max(1, size)
+        self.base_url = campus.base_url if campus else base_url
+        self.stats = stats
+        self._session_options = {}
+        if campus:
+            self._session_options = {
+                "requests_per_second": campus.requests_per_second,
+                "request_burst": campus.request_burst,
+                "max_requests_per_host": campus.max_requests_per_host,
+            }
+        self._sessions: List[SessionManager] = []
+        self._idle: List[SessionManager] = []
+        self._condition = threading.Condition()
+        self._metrics = {"checkouts": 0, "waits": 0, "wait_seconds": 0.0, "affinity_hits": 0, "state_switches": 0}
+
+    def _take(self, unit_oid: Optional[str], menu_oid: Optional[str]) -> SessionManager:
+        """Take the idle session whose server state best matches, creating one if allowed."""
+        with self._condition:
+            waited = None
+            while not self._idle and len(self._sessions) >= self.size:
+                waited = waited or time.monotonic()
+                self._condition.wait()
+
+            self._metrics["checkouts"] += 1
+            if waited:
+                self._metrics["waits"] += 1
+                self._metrics["wait_seconds"] += time.monotonic() - waited
+
+            if self._idle:
+                wanted_unit = {"unitOid": unit_oid} if unit_oid is not None else None
+                wanted_menu = {"menuOid": menu_oid} if menu_oid is not None else None
+
+                def affinity(session: SessionManager) -> int:
+                    on_unit = wanted_unit is None or session.state.get(ENDPOINTS["select_unit"]) == wanted_unit
+                    on_menu = wanted_menu is None or session.state.get(ENDPOINTS["select_menu"]) == wanted_menu
+                    return 2 * on_unit + on_menu
+
+                session = max(self._idle, key=affinity)
+                if affinity(session) == 3 and (unit_oid is not None or menu_oid is not None):
+                    self._metrics["affinity_hits"] += 1
+                self._idle.remove(session)
+                return session
+
+            session = SessionManager(self.base_url, stats=self.stats, **self._session_options)
+            self._sessions.append(session)
+            return session
+
+    def _give_back(self, session: SessionManager) -> None:
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def checkout(self, unit_oid: Optional[str] = None, menu_oid: Optional[str] = None) -> Iterator[Optional[SessionManager]]:
+        """
+        Borrow a session, with the given unit and menu selected, for exclusive use.
+
+        Yields None if the session could not be initialized or the selection failed.
+        """
+        session = self._take(unit_oid, menu_oid)
+        try:
+            state = dict(session.state)
+            if not session.initialize() or not session.ensure_state(unit_oid, menu_oid):
+                yield None
+                return
+            if session.state != state:
+                with self._condition:
+                    self._metrics["state_switches"] += 1
+            yield session
+        finally:
+            self._give_back(session)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of pool usage: sessions created, checkouts, waits and re-initializations."""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["wait_seconds"] = round(metrics["wait_seconds"], 3)
+            metrics["sessions"] = len(self._sessions)
+            metrics["in_use"] = len(self._sessions) - len(self._idle)
+            metrics["reinitializations"] = sum(session.reinitializations for session in self._sessions)
+        return metrics
+
+    def close(self) -> None:
+        """Close every session's connections."""
+        with self._condition:
+            for session in self._sessions:
+                session.session.close()
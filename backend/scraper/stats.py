@@ -0,0 +1,43 @@
+"""Run-level counters for scraper runs."""
+
+import threading
+from dataclasses import dataclass, field, fields
+
+
+@dataclass
+class ScrapeStats:
+    """Thread-safe counters describing the work done (and avoided) by one scraper run."""
+    menus_scraped: int = 0
+    menus_skipped: int = 0
+    items_scraped: int = 0
+    items_skipped: int = 0
+    labels_fetched: int = 0
+    labels_cached: int = 0
+    labels_deduplicated: int = 0
+    days_deferred: int = 0
+    requests_made: int = 0
+    bytes_downloaded: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        """Increment one or more counters."""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        """Snapshot of all counters."""
+        with self._lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+
+    def summary(self) -> str:
+        """Human-readable summary of how much work was done and skipped."""
+        counts = self.as_dict()
+        total_menus = counts["menus_scraped"] + counts["menus_skipped"]
+        return (
+            f"Scraped {counts['menus_scraped']}/{total_menus} menus ({counts['items_scraped']} items); "
+            f"skipped {counts['menus_skipped']} unchanged menus "
+            f"({counts['items_skipped']} items, no label fetches or imports); "
+            f"{counts['labels_deduplicated']} label requests saved by in-run de-duplication; "
+            f"{counts['days_deferred']} fresh dates deferred"
+        )
@@ -4,12 +4,12 @@ import logging
 import json
 import os
 from typing import List, Dict, Any, Optional
-from datetime import datetime, date, timedelta
+from datetime import date
 from sqlalchemy.orm import Session
 from google import genai
 from dotenv import load_dotenv
 
-from backend.database.db import User, MenuItem, DiningHall
+from backend.database.db import User, MenuItem, DiningHall, menu_date_key
 from backend.services.nutrition import calculate_tdee, calculate_macros
 
 # Load environment variables
@@ -53,8 +53,7 @@ def generate_meal_plan(
     """
     # Get available menu items for the specified date and meal types
     query = db.query(MenuItem).filter(
-        MenuItem.date >= datetime.combine(date, datetime.min.time()),
-        MenuItem.date < datetime.combine(date + timedelta(days=1), datetime.min.time()),
+        MenuItem.date_key == menu_date_key(date),
         MenuItem.meal_type.in_(meal_types)
     )
     
@@ -266,20 +265,10 @@ def fallback_meal_plan(available_items, prompt, error_response):
     # Calculate nutritional totals
     total_calories = sum(item.calories or 0 for item in selected_items)
     
-    # Extract protein, carbs, and fat from nutrients
-    total_protein = 0
-    total_carbs = 0
-    total_fat = 0
-    
-    for item in selected_items:
-        if item.nutrients:
-            try:
-                nutrients = eval(item.nutrients)
-                total_protein += float(nutrients.get("Protein", "0").split()[0])
-                total_carbs += float(nutrients.get("Total Carb.", "0").split()[0])
-                total_fat += float(nutrients.get("Total Fat", "0").split()[0])
-            except:
-                pass
+    # Sum protein, carbs, and fat from the numeric nutrient columns
+    total_protein = sum(item.protein_g or 0 for item in selected_items)
+    total_carbs = sum(item.total_carbohydrate_g or 0 for item in selected_items)
+    total_fat = sum(item.total_fat_g or 0 for item in selected_items)
     
     return {
         "description": "Fallback meal plan (AI generation failed)",
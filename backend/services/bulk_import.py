@@ -0,0 +1,182 @@
+"""Bulk import of archived menus into the database.
+
+Usage:
+    python -m backend.services.bulk_import
+    python -m backend.services.bulk_import --archive archive --hall 1 --start 2025-01-01
+    python -m backend.services.bulk_import --json-dir output --defer-indexes
+
+Where import_menu_to_db handles one freshly scraped menu at a time, this
+streams a whole archive (or a legacy JSON output directory) into menu_items
+with batched executemany upserts inside large transactions, and reports rows
+per second as it goes. Importing the same archive twice is harmless: rows are
+keyed on (item_oid, date, meal_type, dining_hall_id) and later records
+replace earlier ones.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.engine import Connection, Engine
+
+from backend.config.config import (
+    ARCHIVE_DIR, BULK_IMPORT_BATCH_ROWS, BULK_IMPORT_COMMIT_ROWS, LOG_FORMAT, LOG_LEVEL
+)
+from backend.database.db import MenuItem, engine as default_engine, init_db, lift_statement_timeout, seed_initial_data
+from backend.scraper.archive import iter_json_menus, iter_menus
+from backend.services.menu_import import menu_item_rows, menu_item_upsert, unique_rows
+from backend.services.search import create_search_index, drop_search_index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportReport:
+    """Counts and timing of a bulk import."""
+    menus: int = 0
+    rows: int = 0
+    skipped_menus: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Imported {self.rows} rows from {self.menus} menus in {self.seconds:.1f}s "
+            f"({self.rows_per_second:,.0f} rows/s); skipped {self.skipped_menus} unreadable menus"
+        )
+
+
+def _secondary_indexes():
+    """Plain (non-unique) menu_items indexes; the unique key is needed by the upsert itself."""
+    return [index for index in MenuItem.__table__.indexes if not index.unique]
+
+
+def _write(connection: Connection, statement, rows: List[Dict]) -> None:
+    if rows:
+        connection.execute(statement, unique_rows(rows))
+
+
+def bulk_import(
+    menus: Iterable[Dict],
+    engine: Engine = default_engine,
+    batch_rows: int = BULK_IMPORT_BATCH_ROWS,
+    commit_rows: int = BULK_IMPORT_COMMIT_ROWS,
+    defer_indexes: bool = False
+) -> ImportReport:
+    """
+    Upsert menus into menu_items in large batched transactions.
+
+    Args:
+        menus: Menus in the scraper's menu dict format, each with a dining_hall_id
+        engine: Database to import into
+        batch_rows: Rows per executemany statement
+        commit_rows: Rows per transaction
+        defer_indexes: Drop the secondary indexes and the search index for the duration
+            of the import and rebuild them once at the end; worthwhile when importing many rows into a
+            table that already holds many
+
+    Returns:
+        Counts and rows/sec of the import
+    """
+    report = ImportReport()
+    statement = menu_item_upsert(engine.dialect.name)
+    started = time.perf_counter()
+
+    if defer_indexes:
+        with engine.begin() as connection:
+            for index in _secondary_indexes():
+                index.drop(connection, checkfirst=True)
+            drop_search_index(connection)
+
+    try:
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            batch: List[Dict] = []
+            uncommitted = 0
+            for menu_data in menus:
+                try:
+                    rows = menu_item_rows(menu_data, menu_data["dining_hall_id"])
+                except (KeyError, ValueError) as e:
+                    logger.warning(f"Skipping menu {menu_data.get('date')} {menu_data.get('meal_type')}: {e}")
+                    report.skipped_menus += 1
+                    continue
+
+                batch.extend(rows)
+                report.menus += 1
+                report.rows += len(rows)
+                if len(batch) >= batch_rows:
+                    _write(connection, statement, batch)
+                    uncommitted += len(batch)
+                    batch = []
+                if uncommitted >= commit_rows:
+                    transaction.commit()
+                    transaction = connection.begin()
+                    uncommitted = 0
+                    elapsed = time.perf_counter() - started
+                    logger.info(f"Committed {report.rows} rows ({report.rows / elapsed:,.0f} rows/s)")
+
+            _write(connection, statement, batch)
+            transaction.commit()
+        except Exception:
+            transaction.rollback()
+            raise
+        finally:
+            connection.close()
+
+    finally:
+        if defer_indexes:
+            index_started = time.perf_counter()
+            with engine.begin() as connection:
+                lift_statement_timeout(connection)
+                for index in _secondary_indexes():
+                    index.create(connection, checkfirst=True)
+            create_search_index(engine)
+            logger.info(f"Rebuilt {len(_secondary_indexes())} indexes in {time.perf_counter() - index_started:.1f}s")
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Bulk import archived menus into the database")
+    source = arg_parser.add_mutually_exclusive_group()
+    source.add_argument("--archive", default=ARCHIVE_DIR, help="Archive root directory")
+    source.add_argument("--json-dir", help="Legacy directory of per-menu JSON files instead of the archive")
+    arg_parser.add_argument("--hall", type=int, help="Only this dining hall (archive); hall of JSON files without one")
+    arg_parser.add_argument("--start", type=date.fromisoformat, help="First day (YYYY-MM-DD, archive only)")
+    arg_parser.add_argument("--end", type=date.fromisoformat, help="Last day (YYYY-MM-DD, archive only)")
+    arg_parser.add_argument("--batch-rows", type=int, default=BULK_IMPORT_BATCH_ROWS, help="Rows per statement")
+    arg_parser.add_argument("--commit-rows", type=int, default=BULK_IMPORT_COMMIT_ROWS, help="Rows per transaction")
+    arg_parser.add_argument("--defer-indexes", action="store_true", help="Rebuild secondary and search indexes after loading")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, LOG_LEVEL.upper()), format=LOG_FORMAT, stream=sys.stderr)
+    init_db()
+    # Menu items reference their dining hall
+    seed_initial_data()
+
+    if args.json_dir:
+        menus = iter_json_menus(args.json_dir, args.hall or 1)
+    else:
+        menus = iter_menus(args.archive, args.hall, args.start, args.end)
+
+    report = bulk_import(
+        menus,
+        batch_rows=args.batch_rows,
+        commit_rows=args.commit_rows,
+        defer_indexes=args.defer_indexes
+    )
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
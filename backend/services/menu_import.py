@@ -0,0 +1,143 @@
+"""Import scraped menus into the database."""
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.database.db import MenuItem, encode_allergens, menu_date_key
+from backend.models.nutrition import NutritionInfo
+from backend.services.nutrition import nutrient_columns
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying one item on one menu (uq_menu_items_menu_item)
+MENU_ITEM_KEY = ("item_oid", "date", "meal_type", "dining_hall_id")
+
+
+def serialize_nutrition_info(nutrition_info: NutritionInfo) -> Dict:
+    """Serialize nutrition info for JSON output."""
+    return {
+        "item_oid": nutrition_info.item_oid,
+        "item_name": nutrition_info.item_name,
+        "serving_size": nutrition_info.serving_size,
+        "calories": nutrition_info.calories,
+        "nutrients": nutrition_info.nutrients,
+        "allergens": nutrition_info.allergens
+    }
+
+
+def menu_item_rows(menu_data: Dict, dining_hall_id: int) -> List[Dict]:
+    """
+    Build menu_items rows for a scraped menu, parsing label strings into numeric columns once.
+    
+    Raises:
+        ValueError: If the menu date cannot be parsed
+    """
+    menu_date = datetime.strptime(menu_data["date"], "%A, %B %d, %Y")
+    rows = []
+    for item_data in menu_data.get("items", []):
+        nutrition_data = item_data.get("nutrition", {})
+        nutrients = nutrition_data.get("nutrients", {})
+        rows.append({
+            "item_oid": nutrition_data.get("item_oid"),
+            "name": item_data.get("name"),
+            "category": item_data.get("category"),
+            "date": menu_date,
+            "date_key": menu_date_key(menu_date),
+            "meal_type": menu_data["meal_type"],
+            "dining_hall_id": dining_hall_id,
+            "serving_size": nutrition_data.get("serving_size"),
+            "calories": nutrition_data.get("calories"),
+            "nutrients": json.dumps(nutrients),
+            "allergens": encode_allergens(nutrition_data.get("allergens")),
+            **nutrient_columns(nutrients)
+        })
+    return rows
+
+
+def menu_item_upsert(dialect_name: str):
+    """
+    INSERT ... ON CONFLICT statement for menu_items rows.
+    
+    A row whose menu item already exists replaces its name, category and
+    nutrition data, but only when one of them changed, so re-importing an
+    unchanged menu rewrites nothing and the statement's rowcount is the
+    number of new or changed rows.
+    
+    Raises:
+        ValueError: For databases other than SQLite and PostgreSQL
+    """
+    dialects = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+    if dialect_name not in dialects:
+        raise ValueError(f"Upserts are not supported on {dialect_name}")
+    
+    table = MenuItem.__table__
+    statement = dialects[dialect_name](table)
+    updated = [column.name for column in table.columns if column.name not in MENU_ITEM_KEY + ("id",)]
+    return statement.on_conflict_do_update(
+        index_elements=list(MENU_ITEM_KEY),
+        set_={column: statement.excluded[column] for column in updated},
+        where=or_(*(table.c[column].is_distinct_from(statement.excluded[column]) for column in updated))
+    ).execution_options(preserve_rowcount=True)  # SQLAlchemy only keeps rowcount for INSERTs on request
+
+
+def unique_rows(rows: Iterable[Dict]) -> List[Dict]:
+    """Drop all but the last row for each menu item; one statement may not update a row twice."""
+    return list({tuple(row[column] for column in MENU_ITEM_KEY): row for row in rows}.values())
+
+
+def import_menu_to_db(menu_data: Dict, db: Session, dining_hall_id: int, commit: bool = True) -> bool:
+    """
+    Import scraped menu data into the database.
+    
+    The whole menu is written with one INSERT ... ON CONFLICT statement keyed
+    on (item_oid, date, meal_type, dining_hall_id): new items are inserted,
+    items whose nutrition or other data changed are updated and unchanged
+    items are left alone.
+    
+    With ``commit=False`` the rows are only flushed, so the caller can commit
+    several menus in one transaction. On failure the session is rolled back.
+    
+    Returns:
+        Whether the import succeeded
+    """
+    if not menu_data:
+        logger.error("No menu data provided")
+        return False
+    
+    date_str = menu_data.get("date")
+    if not date_str:
+        logger.error("No date information in menu data")
+        return False
+        
+    meal_type = menu_data.get("meal_type")
+    if not meal_type:
+        logger.error("No meal type information in menu data")
+        return False
+    
+    try:
+        rows = unique_rows(menu_item_rows(menu_data, dining_hall_id))
+        changed = 0
+        if rows:
+            statement = menu_item_upsert(db.get_bind().dialect.name).values(rows)
+            changed = db.execute(statement).rowcount
+        
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        logger.info(
+            f"Imported menu data for {date_str}, {meal_type}: "
+            f"{len(rows)} items, {changed} new or changed"
+        )
+        return True
+    
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error importing menu data: {str(e)}")
+        return False
@@ -1,7 +1,106 @@
 """Nutrition-related utility functions for calculating nutritional needs."""
 
-from typing import Dict, Any
-from backend.database.db import User
+import re
+from typing import Dict, Any, Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.database.db import User, MenuItem, NUTRIENT_COLUMNS
+
+
+# Conversion factors to grams
+UNIT_GRAMS = {"g": 1.0, "mg": 1e-3, "mcg": 1e-6, "µg": 1e-6, "ug": 1e-6}
+
+# Label names (as scraped) for each numeric MenuItem column
+NUTRIENT_LABELS = {
+    "Total Fat": "total_fat_g",
+    "Saturated Fat": "saturated_fat_g",
+    "Trans Fat": "trans_fat_g",
+    "Cholesterol": "cholesterol_mg",
+    "Sodium": "sodium_mg",
+    "Total Carbohydrate": "total_carbohydrate_g",
+    "Total Carb.": "total_carbohydrate_g",
+    "Total Carbs": "total_carbohydrate_g",
+    "Dietary Fiber": "dietary_fiber_g",
+    "Total Sugars": "total_sugars_g",
+    "Sugars": "total_sugars_g",
+    "Protein": "protein_g",
+}
+
+_AMOUNT_PATTERN = re.compile(r"(<|less than)?\s*(\d+(?:\.\d+)?|\.\d+)\s*(mcg|µg|ug|mg|g)?", re.IGNORECASE)
+
+
+def parse_nutrient_amount(value: Optional[str], unit: str = "g") -> Optional[float]:
+    """
+    Parse a label amount such as "12g", "370mg" or "<1 g" into ``unit``.
+    
+    Labels print "<1 g" or "less than 1g" for amounts too small to declare,
+    so upper bounds count as 0, as they do in the label's own totals.
+    
+    Args:
+        value: Amount as shown on the nutrition label
+        unit: Target unit ("g", "mg" or "mcg"); amounts without a unit are assumed to be in it
+        
+    Returns:
+        The converted amount, or None if the value has no number (e.g. "--" or "NA")
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    match = _AMOUNT_PATTERN.search(value.replace(",", ""))
+    if not match:
+        return None
+    
+    if match.group(1):
+        return 0.0
+    amount = float(match.group(2))
+    source_unit = (match.group(3) or unit).lower()
+    return round(amount * UNIT_GRAMS[source_unit] / UNIT_GRAMS[unit], 4)
+
+
+def nutrient_columns(nutrients: Optional[Dict[str, str]]) -> Dict[str, Optional[float]]:
+    """
+    Convert a scraped nutrients dict into values for the numeric MenuItem columns.
+    
+    Args:
+        nutrients: Label name to amount string, e.g. {"Protein": "14g", "Sodium": "250mg"}
+        
+    Returns:
+        Every numeric nutrient column, None where the label has no value
+    """
+    values: Dict[str, Optional[float]] = {column: None for column in NUTRIENT_COLUMNS}
+    for label, amount in (nutrients or {}).items():
+        column = NUTRIENT_LABELS.get(label.strip().rstrip(":"))
+        if column and values[column] is None:
+            values[column] = parse_nutrient_amount(amount, NUTRIENT_COLUMNS[column])
+    return values
+
+
+def calculate_menu_item_totals(db: Session, item_ids: Iterable[int]) -> Dict[str, float]:
+    """
+    Sum calories and macronutrients of menu items in SQL.
+    
+    Args:
+        db: Database session
+        item_ids: MenuItem ids
+        
+    Returns:
+        Dictionary with total_calories, total_protein, total_carbs and total_fat
+    """
+    calories, protein, carbs, fat = db.query(
+        func.coalesce(func.sum(MenuItem.calories), 0),
+        func.coalesce(func.sum(MenuItem.protein_g), 0.0),
+        func.coalesce(func.sum(MenuItem.total_carbohydrate_g), 0.0),
+        func.coalesce(func.sum(MenuItem.total_fat_g), 0.0)
+    ).filter(MenuItem.id.in_(list(item_ids))).one()
+    
+    return {
+        "total_calories": int(calories),
+        "total_protein": float(protein),
+        "total_carbs": float(carbs),
+        "total_fat": float(fat)
+    }
 
 
 def calculate_bmr(user: User) -> float:
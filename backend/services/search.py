@@ -0,0 +1,221 @@
+"""Full-text search over menu item names and categories.
+
+``name ILIKE '%q%'`` scans every menu item ever imported, and that table
+grows by a few hundred rows per hall and day. Search goes through an index
+instead:
+
+- SQLite: an external-content FTS5 table, menu_items_fts, kept in sync with
+  menu_items by triggers, ranked with bm25. date_key and dining_hall_id are
+  indexed as tokens too, so day and hall filters are intersected inside the
+  index instead of being checked against every matching row of the year.
+- PostgreSQL: a GIN expression index on a weighted tsvector of name and
+  category, ranked with ts_rank. Being an index, it needs no syncing.
+
+Every word of the query is matched as a prefix ("chick sand" finds "Chicken
+Sandwich"), name matches rank above category matches, and among equally good
+matches the most recent menus come first. Other databases fall back to ILIKE.
+"""
+
+import logging
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend.config.config import SEARCH_PAGE_SIZE
+from backend.database.db import MenuItem, lift_statement_timeout, menu_date_key
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "menu_items_fts"
+
+# bm25 column weights: name matches outrank category matches; the filter columns don't score
+BM25_WEIGHTS = "10.0, 1.0, 0.0, 0.0"
+
+_SQLITE_FTS = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    name, category, date_key, dining_hall_id,
+    content='menu_items', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+)
+"""
+
+# Dropped along with menu_items whenever a migration rebuilds the table
+_SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON menu_items BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, category, date_key, dining_hall_id)
+            VALUES (new.id, new.name, new.category, new.date_key, new.dining_hall_id);
+        END
+    """,
+    f"{FTS_TABLE}_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON menu_items BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, category, date_key, dining_hall_id)
+            VALUES ('delete', old.id, old.name, old.category, old.date_key, old.dining_hall_id);
+        END
+    """,
+    f"{FTS_TABLE}_update": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF name, category, date_key, dining_hall_id ON menu_items BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, category, date_key, dining_hall_id)
+            VALUES ('delete', old.id, old.name, old.category, old.date_key, old.dining_hall_id);
+            INSERT INTO {FTS_TABLE}(rowid, name, category, date_key, dining_hall_id)
+            VALUES (new.id, new.name, new.category, new.date_key, new.dining_hall_id);
+        END
+    """,
+}
+
+# The query must repeat this expression verbatim for PostgreSQL to use the index
+_PG_DOCUMENT = (
+    "(setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'B'))"
+)
+_PG_INDEX = f"CREATE INDEX IF NOT EXISTS ix_menu_items_search ON menu_items USING gin ({_PG_DOCUMENT})"
+
+
+def create_search_index(engine: Engine) -> None:
+    """
+    Create the search index if it is missing, filling it from existing menu items.
+
+    On SQLite a missing trigger means the index may have missed writes (e.g.
+    menu_items was rebuilt by a migration), so the index is rebuilt as well.
+    """
+    with engine.begin() as connection:
+        lift_statement_timeout(connection)
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(_PG_INDEX))
+        elif connection.dialect.name == "sqlite":
+            _create_sqlite_index(connection)
+
+
+def drop_search_index(connection: Connection) -> None:
+    """
+    Stop maintaining the search index, e.g. for the duration of a bulk import.
+
+    On SQLite only the triggers are dropped; create_search_index then puts
+    them back and rebuilds the index in one pass.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("DROP INDEX IF EXISTS ix_menu_items_search"))
+    elif connection.dialect.name == "sqlite":
+        for trigger in _SQLITE_TRIGGERS:
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+
+
+def _create_sqlite_index(connection: Connection) -> None:
+    existing = set(connection.execute(
+        text("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE :prefix"),
+        {"prefix": f"{FTS_TABLE}%"}
+    ).scalars())
+    if FTS_TABLE in existing and all(trigger in existing for trigger in _SQLITE_TRIGGERS):
+        return
+
+    try:
+        connection.execute(text(_SQLITE_FTS))
+    except OperationalError as e:
+        logger.warning(f"SQLite was built without FTS5, item search falls back to LIKE: {e}")
+        return
+    for trigger in _SQLITE_TRIGGERS.values():
+        connection.execute(text(trigger))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    logger.info("Built the menu item search index")
+
+
+def query_terms(query: str) -> List[str]:
+    """Lowercased words of a search query; punctuation and search syntax are dropped."""
+    return re.findall(r"\w+", query.lower())
+
+
+def fts_match(terms: List[str], day_key: Optional[int] = None, dining_hall_id: Optional[int] = None) -> str:
+    """
+    FTS5 MATCH expression for query terms and filters.
+
+    Every term is a quoted prefix query on the name and category columns;
+    the filters match the date_key and dining_hall_id token columns.
+    """
+    match = "{name category} : (" + " AND ".join(f'"{term}"*' for term in terms) + ")"
+    if day_key is not None:
+        match += f" AND date_key : {int(day_key)}"
+    if dining_hall_id is not None:
+        match += f" AND dining_hall_id : {int(dining_hall_id)}"
+    return match
+
+
+def search_menu_items(
+    db: Session,
+    query: str,
+    menu_day: Optional[date] = None,
+    dining_hall_id: Optional[int] = None,
+    limit: int = SEARCH_PAGE_SIZE,
+    offset: int = 0
+) -> List[MenuItem]:
+    """
+    Search menu items by name and category, best matches first.
+
+    Args:
+        db: Database session
+        query: Words to search for, each matched as a prefix
+        menu_day: Only items on this day's menus
+        dining_hall_id: Only items of this dining hall
+        limit: Page size
+        offset: Results to skip (page number times page size)
+
+    Returns:
+        One page of matching menu items
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    params = {"limit": limit, "offset": offset}
+    day_key = menu_date_key(menu_day) if menu_day is not None else None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and _has_sqlite_index(db):
+        params["match"] = fts_match(terms, day_key, dining_hall_id)
+        statement = f"""
+            SELECT menu_items.id FROM {FTS_TABLE} JOIN menu_items ON menu_items.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match
+            ORDER BY bm25({FTS_TABLE}, {BM25_WEIGHTS}), menu_items.date DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        filters = []
+        if day_key is not None:
+            filters.append("date_key = :date_key")
+            params["date_key"] = day_key
+        if dining_hall_id is not None:
+            filters.append("dining_hall_id = :dining_hall_id")
+            params["dining_hall_id"] = dining_hall_id
+
+        if dialect == "postgresql":
+            params["tsquery"] = " & ".join(f"{term}:*" for term in terms)
+            filters.insert(0, f"{_PG_DOCUMENT} @@ to_tsquery('simple', :tsquery)")
+            order = f"ts_rank({_PG_DOCUMENT}, to_tsquery('simple', :tsquery)) DESC, date DESC"
+        else:
+            for position, term in enumerate(terms):
+                filters.append(f"(lower(name) LIKE :term{position} OR lower(category) LIKE :term{position})")
+                params[f"term{position}"] = f"%{term}%"
+            order = "date DESC"
+        statement = f"""
+            SELECT id FROM menu_items
+            WHERE {" AND ".join(filters)}
+            ORDER BY {order}
+            LIMIT :limit OFFSET :offset
+        """
+
+    ids = db.execute(text(statement), params).scalars().all()
+    if not ids:
+        return []
+    items = {item.id: item for item in db.query(MenuItem).filter(MenuItem.id.in_(ids))}
+    return [items[item_id] for item_id in ids if item_id in items]
+
+
+def _has_sqlite_index(db: Session) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first() is not None
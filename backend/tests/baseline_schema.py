@@ -0,0 +1,126 @@
+"""The database schema as it was before the migrations in backend.database.db, for migration tests.
+
+Only the tables and keys the migrations touch are declared: menu items keyed
+on item_oid alone, dining halls with globally unique names and unit OIDs, no
+campus, date_key or nutrient columns, and association tables without primary
+keys. Seeded rows include duplicate association pairs and allergens in their
+old comma-separated label format.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Engine
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("email", String, unique=True, index=True),
+    Column("hashed_password", String),
+    Column("name", String),
+)
+allergies = Table(
+    "allergies", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, index=True),
+    Column("description", String, nullable=True),
+)
+diet_types = Table(
+    "diet_types", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, index=True),
+    Column("description", String, nullable=True),
+)
+dining_halls = Table(
+    "dining_halls", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, index=True),
+    Column("location", String, nullable=True),
+    Column("unit_oid", String, unique=True),
+)
+menu_items = Table(
+    "menu_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("item_oid", String, unique=True, index=True),
+    Column("name", String, index=True),
+    Column("category", String, index=True),
+    Column("date", DateTime, index=True),
+    Column("meal_type", String, index=True),
+    Column("dining_hall_id", Integer, ForeignKey("dining_halls.id")),
+    Column("serving_size", String, nullable=True),
+    Column("calories", Integer, nullable=True),
+    Column("nutrients", Text, nullable=True),
+    Column("allergens", Text, nullable=True),
+)
+mealplans = Table(
+    "mealplans", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("date", DateTime),
+    Column("name", String, nullable=True),
+)
+user_allergy = Table(
+    "user_allergy", metadata,
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("allergy_id", Integer, ForeignKey("allergies.id")),
+)
+user_diet_type = Table(
+    "user_diet_type", metadata,
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("diet_type_id", Integer, ForeignKey("diet_types.id")),
+)
+user_dining_hall = Table(
+    "user_dining_hall", metadata,
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("dining_hall_id", Integer, ForeignKey("dining_halls.id")),
+)
+mealplan_item = Table(
+    "mealplan_item", metadata,
+    Column("mealplan_id", Integer, ForeignKey("mealplans.id")),
+    Column("menu_item_id", Integer, ForeignKey("menu_items.id")),
+    Column("servings", Float, default=1.0),
+)
+
+MENU_DAY = datetime(2025, 6, 2)
+
+
+def create_baseline(engine: Engine) -> None:
+    """
+    Create the old schema in an empty database and seed it.
+
+    Rows get ids 1, 2, ... in insertion order; they are not given explicitly,
+    which would leave PostgreSQL's id sequences behind.
+    """
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(users.insert(), [{"username": "jayhawk", "email": "jayhawk@ku.edu"}])
+        connection.execute(allergies.insert(), [{"name": "Eggs"}, {"name": "Milk"}])
+        connection.execute(diet_types.insert(), [{"name": "Vegetarian"}])
+        connection.execute(dining_halls.insert(), [{"name": "Mrs. E's", "unit_oid": "1"}])
+        connection.execute(menu_items.insert(), [
+            {
+                "item_oid": "101", "name": "Fried Chicken Sandwich", "category": "Grill",
+                "date": MENU_DAY, "meal_type": "LUNCH", "dining_hall_id": 1,
+                "nutrients": '{"Protein": "14g", "Sodium": "250mg"}', "allergens": "Eggs, Milk",
+            },
+            {
+                "item_oid": "102", "name": "Garden Salad", "category": "Salad Bar",
+                "date": MENU_DAY, "meal_type": "LUNCH", "dining_hall_id": 1,
+                "nutrients": '{"Protein": "2g"}', "allergens": "None",
+            },
+        ])
+        connection.execute(mealplans.insert(), [{"user_id": 1, "date": MENU_DAY}])
+        # Nothing used to stop the same pair from being added twice
+        connection.execute(user_allergy.insert(), [
+            {"user_id": 1, "allergy_id": 1}, {"user_id": 1, "allergy_id": 1}, {"user_id": 1, "allergy_id": 2},
+        ])
+        connection.execute(user_diet_type.insert(), [{"user_id": 1, "diet_type_id": 1}] * 2)
+        connection.execute(user_dining_hall.insert(), [{"user_id": 1, "dining_hall_id": 1}] * 2)
+        connection.execute(mealplan_item.insert(), [
+            {"mealplan_id": 1, "menu_item_id": 1, "servings": 1.0},
+            {"mealplan_id": 1, "menu_item_id": 1, "servings": 1.0},
+            {"mealplan_id": 1, "menu_item_id": 2, "servings": 0.5},
+        ])
@@ -0,0 +1,78 @@
+"""Shared fixtures: throwaway SQLite and PostgreSQL databases behind backend.database.db.
+
+Run from the repository root:
+
+    python -m pytest backend/tests
+
+PostgreSQL tests run against TEST_POSTGRES_URL if set, else against a local
+server started with pgserver (``pip install pgserver``), and are skipped when
+neither is available. Every test gets an empty public schema.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+# The app is imported as the backend package, as `python -m backend.main` does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.database import db, explain  # noqa: E402
+
+
+def use_database(monkeypatch, url: str) -> Engine:
+    """Point the database module's engine and sessions at another database for one test."""
+    url = db.normalize_database_url(url)
+    engine = create_engine(url, **db.engine_options(url))
+    event.listen(engine, "connect", db._set_sqlite_pragmas)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    monkeypatch.setattr(explain, "engine", engine)
+    return engine
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """An empty SQLite database file."""
+    engine = use_database(monkeypatch, f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    """A session on a freshly initialized SQLite database."""
+    db.init_db()
+    session = db.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory):
+    url = os.getenv("TEST_POSTGRES_URL")
+    if url:
+        yield url
+        return
+
+    pgserver = pytest.importorskip("pgserver", reason="needs pgserver or TEST_POSTGRES_URL")
+    server = pgserver.get_server(tmp_path_factory.mktemp("pgdata"), cleanup_mode="delete")
+    try:
+        yield server.get_uri()
+    finally:
+        server.cleanup()
+
+
+@pytest.fixture
+def postgres_engine(postgres_url, monkeypatch):
+    """An empty PostgreSQL database."""
+    engine = use_database(monkeypatch, postgres_url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    yield engine
+    engine.dispose()
@@ -0,0 +1,49 @@
+"""Reading the compressed menu archive back."""
+
+import logging
+import os
+
+from backend.scraper.archive import append_menus, archive_files, iter_menus, iter_records
+
+
+def menu(item_names, dining_hall_id=1, day="Monday, June 2, 2025", meal_type="LUNCH"):
+    return {
+        "dining_hall_id": dining_hall_id,
+        "date": day,
+        "meal_type": meal_type,
+        "items": [
+            {"name": name, "category": "Grill", "nutrition": {"item_oid": name, "nutrients": {}}}
+            for name in item_names
+        ],
+    }
+
+
+def test_round_trip(tmp_path):
+    archive = str(tmp_path)
+    assert append_menus([menu(["Tofu Bowl", "Beef Tacos"]), menu(["Pancakes"], meal_type="BREAKFAST")], archive) == 3
+    assert append_menus([menu(["Pizza"], dining_hall_id=2)], archive) == 1
+
+    assert [(m["dining_hall_id"], m["meal_type"], [i["name"] for i in m["items"]]) for m in iter_menus(archive)] == [
+        (1, "LUNCH", ["Tofu Bowl", "Beef Tacos"]),
+        (1, "BREAKFAST", ["Pancakes"]),
+        (2, "LUNCH", ["Pizza"]),
+    ]
+    assert [m["dining_hall_id"] for m in iter_menus(archive, dining_hall_id=2)] == [2]
+
+
+def test_truncated_partition_is_skipped(tmp_path, caplog):
+    archive = str(tmp_path)
+    append_menus([menu(["Tofu Bowl"])], archive)
+    append_menus([menu(["Pizza"], dining_hall_id=2)], archive)
+
+    # Cut the last member short, as a crash during an append would, then append after it
+    truncated = archive_files(archive, dining_hall_id=1)[0]
+    os.truncate(truncated, os.path.getsize(truncated) - 10)
+    append_menus([menu(["Beef Tacos"], meal_type="DINNER")], archive)
+
+    with caplog.at_level(logging.WARNING, logger="backend.scraper.archive"):
+        names = [record["name"] for record in iter_records(archive)]
+    # Reading goes on with the next partition
+    assert names[-1] == "Pizza"
+    assert "Beef Tacos" not in names
+    assert truncated in caplog.text
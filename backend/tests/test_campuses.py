@@ -0,0 +1,50 @@
+"""The campus registry and the default campus setting."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.config.campuses import get_campus, load_campus_registry
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def import_campuses(**env):
+    """Import the registry in a fresh interpreter with the given environment variables."""
+    return subprocess.run(
+        [sys.executable, "-c", "import backend.database.db"],
+        cwd=REPO_ROOT, env={**os.environ, **env}, capture_output=True, text=True
+    )
+
+
+def test_get_campus():
+    assert get_campus().key == "ku"
+    assert get_campus(" University of Kansas ").key == "ku"
+    with pytest.raises(ValueError, match="expected one of"):
+        get_campus("nowhere")
+
+
+def test_registry_file(tmp_path):
+    path = tmp_path / "campuses.json"
+    path.write_text(json.dumps([{
+        "key": "ksu", "name": "Kansas State University", "base_url": "https://example.edu/NetNutrition/1",
+        "units": [{"name": "Derby", "location": "Derby Hall", "unit_oid": "4"}], "requests_per_second": 2.0
+    }]))
+    campus = load_campus_registry(str(path))["ksu"]
+    assert campus.units[0].unit_oid == "4"
+    assert campus.requests_per_second == 2.0
+
+
+def test_unknown_default_campus_is_reported_clearly(tmp_path):
+    failed = import_campuses(DEFAULT_CAMPUS="nowhere")
+    assert failed.returncode != 0
+    assert "DEFAULT_CAMPUS 'nowhere' is not a registered campus key, expected one of ['ku']" in failed.stderr
+
+    # A campus from the registry file may be the default
+    path = tmp_path / "campuses.json"
+    path.write_text(json.dumps([{"key": "ksu", "name": "Kansas State University", "base_url": "https://example.edu"}]))
+    assert import_campuses(DEFAULT_CAMPUS="ksu", CAMPUS_REGISTRY_PATH=str(path)).returncode == 0
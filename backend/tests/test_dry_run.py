@@ -0,0 +1,55 @@
+"""Dry runs read the database and label cache but write neither."""
+
+import os
+
+from backend.config.campuses import CAMPUSES
+from backend.database import db
+from backend.models.nutrition import NutritionInfo
+from backend.scraper import runner
+from backend.scraper.nutrition_cache import NutritionCache, hash_label
+
+
+def label(item_oid):
+    return NutritionInfo(item_oid, "Tofu Bowl", "1 bowl", 300, {"Protein": "10g"}, "Soy")
+
+
+def test_read_only_label_cache(tmp_path):
+    path = str(tmp_path / "labels.sqlite3")
+    cache = NutritionCache(path)
+    cache.put("1", hash_label("<div>1</div>"), label("1"))
+    cache.close()
+    before = os.path.getmtime(path)
+
+    cache = NutritionCache(path, read_only=True)
+    assert cache.get("1") == label("1")
+    cache.put("2", hash_label("<div>2</div>"), label("2"))
+    assert cache.get("2") == label("2")
+    cache.close()
+
+    assert os.path.getmtime(path) == before
+    cache = NutritionCache(path)
+    assert cache.get("2") is None
+    cache.close()
+
+
+def test_read_only_label_cache_is_not_created(tmp_path):
+    cache = NutritionCache(str(tmp_path / "cache" / "labels.sqlite3"), read_only=True)
+    cache.put("1", hash_label("<div>1</div>"), label("1"))
+    cache.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_targets_without_a_database(sqlite_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "SessionLocal", db.SessionLocal)
+    assert not db.schema_exists()
+    targets = runner.load_targets()
+    assert os.listdir(tmp_path) == []
+    assert [target.unit_oid for target in targets] == [
+        unit.unit_oid for campus in CAMPUSES.values() for unit in campus.units
+    ]
+
+    # Numbered as the halls seeded into a new database
+    db.init_db()
+    db.seed_initial_data()
+    assert db.schema_exists()
+    assert runner.load_targets() == targets
@@ -0,0 +1,101 @@
+"""Importing scraped menus with one INSERT ... ON CONFLICT statement per menu."""
+
+import logging
+
+import pytest
+
+from backend.database.db import MenuItem, seed_initial_data
+from backend.services.menu_import import import_menu_to_db, menu_item_upsert, unique_rows
+
+
+def menu(items, meal_type="LUNCH", day="Monday, June 2, 2025"):
+    return {
+        "date": day,
+        "meal_type": meal_type,
+        "items": [
+            {
+                "name": name,
+                "category": "Grill",
+                "nutrition": {"item_oid": item_oid, "nutrients": {"Protein": protein}, "allergens": "Eggs, Milk"},
+            }
+            for item_oid, name, protein in items
+        ],
+    }
+
+
+@pytest.fixture
+def session(db_session):
+    seed_initial_data()
+    return db_session
+
+
+def imported(caplog):
+    """The "N items, M new or changed" part of the last import's log line."""
+    return caplog.records[-1].getMessage().split(": ", 1)[1]
+
+
+def test_insert_update_and_skip_unchanged(session, caplog):
+    caplog.set_level(logging.INFO, logger="backend.services.menu_import")
+    lunch = menu([("1", "Tofu Bowl", "10g"), ("2", "Beef Tacos", "20g")])
+
+    assert import_menu_to_db(lunch, session, 1)
+    assert imported(caplog) == "2 items, 2 new or changed"
+    ids = dict(session.query(MenuItem.item_oid, MenuItem.id))
+
+    assert import_menu_to_db(lunch, session, 1)
+    assert imported(caplog) == "2 items, 0 new or changed"
+
+    assert import_menu_to_db(menu([("1", "Tofu Bowl", "12g"), ("2", "Beef Tacos", "20g")]), session, 1)
+    assert imported(caplog) == "2 items, 1 new or changed"
+
+    session.expire_all()
+    items = {item.item_oid: item for item in session.query(MenuItem)}
+    # Updated in place, so meal plans referencing the rows keep them
+    assert {item_oid: item.id for item_oid, item in items.items()} == ids
+    assert items["1"].protein_g == 12.0
+    assert items["1"].nutrients == {"Protein": "12g"}
+    assert items["1"].allergens == ["Eggs", "Milk"]
+    assert items["1"].date_key == 20250602
+
+
+def test_same_item_on_other_menus(session):
+    item = [("1", "Tofu Bowl", "10g")]
+    assert import_menu_to_db(menu(item, "LUNCH"), session, 1)
+    assert import_menu_to_db(menu(item, "DINNER"), session, 1)
+    assert import_menu_to_db(menu(item, "LUNCH"), session, 2)
+    assert import_menu_to_db(menu(item, "LUNCH", "Tuesday, June 3, 2025"), session, 1)
+    assert session.query(MenuItem).filter(MenuItem.item_oid == "1").count() == 4
+
+
+def test_duplicate_items_in_one_menu(session):
+    # One statement may not update a row twice; the last occurrence wins
+    assert import_menu_to_db(menu([("1", "Tofu Bowl", "10g"), ("1", "Tofu Bowl", "11g")]), session, 1)
+    assert [item.protein_g for item in session.query(MenuItem)] == [11.0]
+
+
+def test_commit_false_only_flushes(session):
+    assert import_menu_to_db(menu([("1", "Tofu Bowl", "10g")]), session, 1, commit=False)
+    assert session.query(MenuItem).count() == 1
+    session.rollback()
+    assert session.query(MenuItem).count() == 0
+
+
+def test_invalid_menus(session):
+    assert not import_menu_to_db({}, session, 1)
+    assert not import_menu_to_db({"date": "Monday, June 2, 2025", "items": []}, session, 1)
+    assert not import_menu_to_db(menu([("1", "Tofu Bowl", "10g")], day="June 2nd"), session, 1)
+    assert session.query(MenuItem).count() == 0
+
+
+def test_unique_rows_keeps_last():
+    rows = [
+        {"item_oid": "1", "date": 1, "meal_type": "LUNCH", "dining_hall_id": 1, "name": "first"},
+        {"item_oid": "1", "date": 1, "meal_type": "DINNER", "dining_hall_id": 1, "name": "other menu"},
+        {"item_oid": "1", "date": 1, "meal_type": "LUNCH", "dining_hall_id": 1, "name": "last"},
+    ]
+    assert [row["name"] for row in unique_rows(rows)] == ["last", "other menu"]
+
+
+def test_upsert_requires_sqlite_or_postgresql():
+    with pytest.raises(ValueError):
+        menu_item_upsert("mysql")
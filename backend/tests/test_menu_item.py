@@ -0,0 +1,85 @@
+"""Stored forms of MenuItem nutrients and allergens, and their decoded-value cache."""
+
+import pytest
+from sqlalchemy import select
+
+from backend.database import db
+from backend.database.db import MenuItem, encode_allergens, split_allergens
+from backend.tests.baseline_schema import create_baseline
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Eggs, Milk", ["Eggs", "Milk"]),
+    ("Eggs, Milk ,", ["Eggs", "Milk"]),
+    ("Wheat", ["Wheat"]),
+    ('["Eggs", "Milk"]', ["Eggs", "Milk"]),
+    ('"Eggs, Milk"', ["Eggs", "Milk"]),
+    (["Eggs", " Milk "], ["Eggs", "Milk"]),
+    ("None", []),
+    ("none", []),
+    ('["None"]', []),
+    ("", []),
+    ("[]", []),
+    ("{}", []),
+    (None, []),
+])
+def test_split_allergens(value, expected):
+    assert split_allergens(value) == expected
+
+
+def test_encode_allergens_is_canonical():
+    forms = ["Eggs, Milk", '["Eggs", "Milk"]', '"Eggs, Milk"', ["Eggs", "Milk"]]
+    assert {encode_allergens(form) for form in forms} == {'["Eggs", "Milk"]'}
+    assert encode_allergens("None") == "[]"
+    # Encoding is idempotent
+    assert encode_allergens(encode_allergens("Eggs, Milk")) == '["Eggs", "Milk"]'
+
+
+def test_decoded_values_are_cached():
+    item = MenuItem()
+    item._nutrients = '{"Protein": "14g"}'
+    item._allergens = '["Eggs"]'
+    assert item.nutrients is item.nutrients
+    assert item.allergens is item.allergens
+
+    # A new raw value (set directly or reloaded from the database) is decoded again
+    item._nutrients = '{"Protein": "12g"}'
+    item._allergens = "Eggs, Milk"
+    assert item.nutrients == {"Protein": "12g"}
+    assert item.allergens == ["Eggs", "Milk"]
+
+
+def test_setters_store_canonical_json():
+    item = MenuItem()
+    nutrients = {"Protein": "14g"}
+    item.nutrients = nutrients
+    item.allergens = "Eggs, Milk"
+    assert item._nutrients == '{"Protein": "14g"}'
+    assert item._allergens == '["Eggs", "Milk"]'
+
+    # Later changes to the caller's dict do not leak into the cached value
+    nutrients["Fat"] = "1g"
+    assert item.nutrients == {"Protein": "14g"}
+
+    item.nutrients = '{"Sodium": "5mg"}'
+    assert item.nutrients == {"Sodium": "5mg"}
+    item.nutrients = "not json"
+    assert (item._nutrients, item.nutrients) == (None, {})
+    item.allergens = None
+    assert (item._allergens, item.allergens) == (None, [])
+
+
+def test_invalid_stored_nutrients():
+    item = MenuItem()
+    item._nutrients = "not json"
+    assert item.nutrients == {}
+    item._nutrients = '["Protein"]'
+    assert item.nutrients == {}
+
+
+def test_allergens_migrated_to_json_lists(sqlite_engine):
+    create_baseline(sqlite_engine)
+    db.init_db()
+    with sqlite_engine.connect() as connection:
+        stored = connection.execute(select(MenuItem.__table__.c.allergens).order_by(MenuItem.id)).scalars().all()
+    assert stored == ['["Eggs", "Milk"]', "[]"]
@@ -0,0 +1,58 @@
+"""Parsing label amounts into the numeric nutrient columns."""
+
+import pytest
+
+from backend.database.db import NUTRIENT_COLUMNS
+from backend.services.nutrition import nutrient_columns, parse_nutrient_amount
+
+
+@pytest.mark.parametrize("value, unit, expected", [
+    ("12g", "g", 12.0),
+    ("5.5 g", "g", 5.5),
+    (".5g", "g", 0.5),
+    ("<1 g", "g", 0.0),
+    ("<1g", "g", 0.0),
+    ("less than 1g", "g", 0.0),
+    ("Less than 5mg", "mg", 0.0),
+    ("<5mg", "g", 0.0),
+    ("370mg", "mg", 370.0),
+    ("1,200mg", "mg", 1200.0),
+    ("2g", "mg", 2000.0),
+    ("250mg", "g", 0.25),
+    ("1.1mcg", "mg", 0.0011),
+    ("3 µg", "mg", 0.003),
+    ("14", "g", 14.0),
+    ("15", "mg", 15.0),
+    ("0g", "g", 0.0),
+    (7, "g", 7.0),
+    (2.5, "mg", 2.5),
+])
+def test_parse_nutrient_amount(value, unit, expected):
+    assert parse_nutrient_amount(value, unit) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [None, "", "--", "NA", "n/a", "g"])
+def test_amount_without_a_number(value):
+    assert parse_nutrient_amount(value) is None
+
+
+def test_nutrient_columns():
+    columns = nutrient_columns({
+        "Protein:": "14g",
+        " Sodium ": "250mg",
+        "Total Carbohydrate": "30g",
+        # An alias of a column already filled does not override it
+        "Total Carbs": "99g",
+        "Cholesterol": "--",
+        "Vitamin A": "10%",
+    })
+    assert set(columns) == set(NUTRIENT_COLUMNS)
+    assert columns["protein_g"] == 14.0
+    assert columns["sodium_mg"] == 250.0
+    assert columns["total_carbohydrate_g"] == 30.0
+    assert columns["cholesterol_mg"] is None
+    assert columns["total_fat_g"] is None
+
+
+def test_nutrient_columns_without_nutrients():
+    assert nutrient_columns(None) == {column: None for column in NUTRIENT_COLUMNS}
@@ -0,0 +1,23 @@
+"""Fetching raw nutrition labels."""
+
+from backend.scraper.nutrition_scraper import NutritionScraper
+
+
+class StubSession:
+    """Answers every POST with a fixed response."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, endpoint, data):
+        return self.response
+
+
+def test_fetch_label():
+    assert NutritionScraper(StubSession({"nutritionLabel": "<div></div>"})).fetch_label("1") == "<div></div>"
+
+
+def test_failed_or_incomplete_responses_return_none():
+    # Neither may raise: the pipeline maps fetch_label over a whole menu's labels
+    assert NutritionScraper(StubSession(None)).fetch_label("1") is None
+    assert NutritionScraper(StubSession({"success": False})).fetch_label("1") is None
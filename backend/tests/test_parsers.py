@@ -0,0 +1,75 @@
+"""Every HTML parser backend must turn the same NetNutrition markup into the same objects."""
+
+from pathlib import Path
+
+import pytest
+
+from backend.models.item import MenuItem
+from backend.models.menu import Menu
+from backend.models.nutrition import NutritionInfo
+from backend.scraper.parsers import BeautifulSoupParser, LxmlParser, lxml
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+pytestmark = pytest.mark.skipif(lxml is None, reason="lxml is not installed")
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES / name).read_text()
+
+
+def both(method: str, *args):
+    """The result of one parse method on both backends."""
+    return getattr(BeautifulSoupParser(), method)(*args), getattr(LxmlParser(), method)(*args)
+
+
+def test_menu_panel():
+    reference, fast = both("parse_menu_panel", fixture("menu_panel.html"))
+    assert fast == reference
+    assert reference == {
+        "Monday, March 31, 2025": [Menu("Monday, March 31, 2025", "BREAKFAST", "101"), Menu("Monday, March 31, 2025", "LUNCH", "102")],
+        "Tuesday, April 01, 2025": [Menu("Tuesday, April 01, 2025", "DINNER", "201")],
+    }
+
+
+def test_item_panel():
+    reference, fast = both("parse_item_panel", fixture("item_panel.html"))
+    assert fast == reference
+    assert reference == [
+        MenuItem("5001", "Scrambled Eggs", "Entrees"),
+        MenuItem("5002", "BaconStrips", "Entrees"),
+        MenuItem("5003", "Coffee", "Beverages"),
+    ]
+
+
+def test_nutrition_label():
+    reference, fast = both("parse_nutrition_label", fixture("label.html"), "5001")
+    assert fast == reference
+    assert reference == NutritionInfo(
+        item_oid="5001",
+        item_name="Scrambled  Eggs",
+        serving_size="4 oz",
+        calories=210,
+        nutrients={
+            "Total Fat": "15g", "Saturated Fat": "5.5g", "Cholesterol": "370mg", "Sodium": "250mg",
+            "Total Carbohydrate": "2g", "Protein": "14g", "Vitamin A": "10%", "Calcium": "6%",
+            "Vitamin D": "1.1mcg", "Iron": "1.8mg",
+        },
+        allergens="Eggs, Milk",
+    )
+
+
+def test_minimal_nutrition_label():
+    # Nested "Calories" text, the amount in a later row, no serving size, no allergens
+    reference, fast = both("parse_nutrition_label", fixture("label_minimal.html"), "5003")
+    assert fast == reference
+    assert (reference.serving_size, reference.calories, reference.allergens) == ("Unknown", 5, "None")
+    assert reference.nutrients == {"Sodium": "<5mg"}
+
+
+def test_empty_html():
+    assert both("parse_menu_panel", "") == ({}, {})
+    # No item table: both raise the same error for the scraper to log
+    for parser in (BeautifulSoupParser(), LxmlParser()):
+        with pytest.raises(AttributeError):
+            parser.parse_item_panel("")
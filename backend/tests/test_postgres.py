@@ -0,0 +1,178 @@
+"""PostgreSQL support: pool sizing, migrations, upserts, statement timeouts, index checks and search."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+
+from backend.database import db
+from backend.database.explain import check_plans, uses_index
+from backend.services.menu_import import MENU_ITEM_KEY, import_menu_to_db, menu_item_rows, menu_item_upsert
+from backend.services import search
+from backend.services.search import search_menu_items
+from backend.tests.baseline_schema import create_baseline
+
+POSTGRES_URL = "postgresql://flanner@localhost/flanner"
+
+
+def menu(items, meal_type="LUNCH"):
+    return {
+        "date": "Monday, June 2, 2025",
+        "meal_type": meal_type,
+        "items": [
+            {
+                "name": name,
+                "category": category,
+                "nutrition": {"item_oid": item_oid, "nutrients": {"Protein": protein}, "allergens": "Milk"},
+            }
+            for item_oid, name, category, protein in items
+        ],
+    }
+
+
+@pytest.fixture
+def pg_session(postgres_engine):
+    db.init_db()
+    db.seed_initial_data()
+    session = db.SessionLocal()
+    yield session
+    session.close()
+
+
+def pool_options(monkeypatch, **settings):
+    for name, value in settings.items():
+        monkeypatch.setattr(db, name, value)
+    return db.engine_options(POSTGRES_URL)
+
+
+def test_pool_is_shared_between_processes(monkeypatch):
+    # 60 connections over 3 API workers and the scraper: 15 each, 8 kept open
+    options = pool_options(monkeypatch, WEB_CONCURRENCY=3, DB_MAX_CONNECTIONS=60, DB_POOL_SIZE=0, DB_MAX_OVERFLOW=-1)
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 7
+    assert options["pool_pre_ping"] is True
+
+    # Never fewer than two connections per process
+    options = pool_options(monkeypatch, WEB_CONCURRENCY=100)
+    assert (options["pool_size"], options["max_overflow"]) == (1, 1)
+
+    options = pool_options(monkeypatch, DB_POOL_SIZE=5, DB_MAX_OVERFLOW=0)
+    assert (options["pool_size"], options["max_overflow"]) == (5, 0)
+
+
+def test_statement_timeout_option(monkeypatch):
+    assert pool_options(monkeypatch, DB_STATEMENT_TIMEOUT_MS=30000)["connect_args"] == {
+        "options": "-c statement_timeout=30000"
+    }
+    assert "connect_args" not in pool_options(monkeypatch, DB_STATEMENT_TIMEOUT_MS=0)
+    assert db.engine_options("sqlite:///flanner.db") == {}
+
+
+def test_urls_select_the_psycopg_driver():
+    assert db.normalize_database_url("postgres://u:p@host/db") == "postgresql+psycopg://u:p@host/db"
+    assert db.normalize_database_url("postgresql://u@/db?host=/tmp") == "postgresql+psycopg://u@/db?host=/tmp"
+    # Explicit drivers and other databases are left alone
+    assert db.normalize_database_url("postgresql+psycopg2://u@host/db") == "postgresql+psycopg2://u@host/db"
+    assert db.normalize_database_url("sqlite:///flanner.db") == "sqlite:///flanner.db"
+
+
+def test_engine_uses_psycopg(postgres_engine):
+    assert postgres_engine.dialect.driver == "psycopg"
+
+
+def test_explain_matches_postgres_plans():
+    assert uses_index(["Index Scan using ix_menu_items_hall_day_meal on menu_items"], ("ix_menu_items_hall_day_meal",), "postgresql")
+    assert uses_index(["Bitmap Heap Scan on menu_items", "  ->  Bitmap Index Scan on ix_menu_items_day_meal_hall"], ("ix_menu_items_day_meal_hall",), "postgresql")
+    assert uses_index(["Index Scan using user_allergy_pkey on user_allergy"], (), "postgresql")
+    assert not uses_index(["Seq Scan on menu_items"], ("ix_menu_items_day_meal_hall",), "postgresql")
+    # A prefix of another index's name is not a match
+    assert not uses_index(["Index Scan using ix_menu_items_day_meal_hall_old on menu_items"], ("ix_menu_items_day_meal_hall",), "postgresql")
+
+
+def test_migrate_old_schema(postgres_engine):
+    create_baseline(postgres_engine)
+    db.init_db()
+    # Migrations are idempotent
+    db.init_db()
+
+    inspector = inspect(postgres_engine)
+    for table in db.ASSOCIATION_TABLES:
+        assert inspector.get_pk_constraint(table.name)["constrained_columns"] == [
+            column.name for column in table.primary_key.columns
+        ]
+    unique_keys = {tuple(unique["column_names"]) for unique in inspector.get_unique_constraints("menu_items")}
+    assert unique_keys == {MENU_ITEM_KEY}
+    assert not any(index["unique"] for index in inspector.get_indexes("menu_items") if not index.get("duplicates_constraint"))
+
+    with postgres_engine.connect() as connection:
+        # Duplicate pairs were dropped, one of each kept
+        for table, count in ((db.user_allergy, 2), (db.user_diet_type, 1), (db.user_dining_hall, 1), (db.mealplan_item, 2)):
+            assert connection.execute(select(func.count()).select_from(table)).scalar() == count
+        item = connection.execute(select(db.MenuItem.__table__).where(db.MenuItem.id == 1)).one()
+    assert item.date_key == 20250602
+    assert item.protein_g == 14.0
+    assert item.allergens == '["Eggs", "Milk"]'
+
+    # The migrated table takes the upserts that depend on the new key
+    session = db.SessionLocal()
+    try:
+        assert import_menu_to_db(menu([("101", "Fried Chicken Sandwich", "Grill", "14g")], "DINNER"), session, 1)
+        assert session.query(db.MenuItem).filter(db.MenuItem.item_oid == "101").count() == 2
+    finally:
+        session.close()
+
+    assert all(check_plans().values())
+
+
+def test_upsert_on_conflict(pg_session):
+    upsert = menu_item_upsert("postgresql")
+    rows = menu_item_rows(menu([("1", "Tofu Bowl", "Vegan", "10g"), ("2", "Beef Tacos", "Grill", "20g")]), 1)
+    assert pg_session.execute(upsert.values(rows)).rowcount == 2
+    ids = dict(pg_session.query(db.MenuItem.item_oid, db.MenuItem.id))
+
+    # Unchanged rows are not rewritten
+    assert pg_session.execute(upsert.values(rows)).rowcount == 0
+
+    rows = menu_item_rows(menu([("1", "Tofu Bowl", "Vegan", "12g"), ("2", "Beef Tacos", "Grill", "20g")]), 1)
+    assert pg_session.execute(upsert.values(rows)).rowcount == 1
+    pg_session.commit()
+
+    items = {item.item_oid: item for item in pg_session.query(db.MenuItem)}
+    assert {item_oid: item.id for item_oid, item in items.items()} == ids
+    assert items["1"].protein_g == 12.0
+    assert items["1"].nutrients == {"Protein": "12g"}
+
+
+def test_lift_statement_timeout(postgres_engine):
+    with postgres_engine.connect() as connection:
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == "30s"
+        connection.rollback()
+        with connection.begin():
+            db.lift_statement_timeout(connection)
+            assert connection.execute(text("SHOW statement_timeout")).scalar() == "0"
+        # SET LOCAL ends with the transaction
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == "30s"
+
+
+def test_search(pg_session):
+    import_menu_to_db(menu([
+        ("1", "Fried Chicken Sandwich", "Grill", "20g"),
+        ("2", "Garden Salad", "Chicken and Greens", "5g"),
+        ("3", "Tofu Bowl", "Vegan", "10g"),
+    ]), pg_session, 1)
+    import_menu_to_db(menu([("4", "Chicken Tacos", "Grill", "18g")]), pg_session, 2)
+
+    # Every word is a prefix; name matches rank above category matches
+    assert [item.name for item in search_menu_items(pg_session, "chick sand")] == ["Fried Chicken Sandwich"]
+    assert [item.name for item in search_menu_items(pg_session, "chicken", dining_hall_id=1)] == [
+        "Fried Chicken Sandwich", "Garden Salad"
+    ]
+    assert [item.name for item in search_menu_items(pg_session, "chicken", limit=1, offset=2)] == ["Garden Salad"]
+    assert search_menu_items(pg_session, "chicken", menu_day=date(2025, 6, 3)) == []
+
+    with db.engine.connect() as connection:
+        connection.execute(text("SET enable_seqscan = off"))
+        plan = connection.execute(text(
+            f"EXPLAIN SELECT id FROM menu_items WHERE {search._PG_DOCUMENT} @@ to_tsquery('simple', 'chick:*')"
+        )).scalars().all()
+    assert uses_index(plan, ("ix_menu_items_search",), "postgresql")
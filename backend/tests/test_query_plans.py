@@ -0,0 +1,31 @@
+"""The hot queries must be served by their indexes, on new and on migrated databases."""
+
+from sqlalchemy import inspect
+
+from backend.database import db
+from backend.database.explain import HOT_QUERIES, check_plans
+from backend.tests.baseline_schema import create_baseline
+
+
+def assert_plans_use_indexes():
+    results = check_plans()
+    assert set(results) == {name for name, _, _ in HOT_QUERIES}
+    assert [name for name, ok in results.items() if not ok] == []
+
+
+def test_fresh_database_plans(sqlite_engine):
+    db.init_db()
+    assert_plans_use_indexes()
+
+
+def test_migrated_database_plans(sqlite_engine):
+    create_baseline(sqlite_engine)
+    db.init_db()
+
+    # The association tables were rebuilt with primary keys, the plans must still find them
+    inspector = inspect(sqlite_engine)
+    for table in db.ASSOCIATION_TABLES:
+        assert inspector.get_pk_constraint(table.name)["constrained_columns"] == [
+            column.name for column in table.primary_key.columns
+        ]
+    assert_plans_use_indexes()
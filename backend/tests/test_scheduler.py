@@ -0,0 +1,75 @@
+"""Cron schedule evaluation and the scheduler's cross-process lock."""
+
+from datetime import datetime
+
+import pytest
+
+from backend.scraper.scheduler import CronSchedule, FileLock
+
+
+def next_runs(expression: str, moment: datetime, count: int):
+    schedule = CronSchedule(expression)
+    runs = []
+    for _ in range(count):
+        moment = schedule.next_after(moment)
+        runs.append(moment)
+    return runs
+
+
+def test_next_after_is_strictly_after():
+    schedule = CronSchedule("0 * * * *")
+    assert schedule.next_after(datetime(2025, 6, 2, 10, 15, 42)) == datetime(2025, 6, 2, 11, 0)
+    assert schedule.next_after(datetime(2025, 6, 2, 11, 0)) == datetime(2025, 6, 2, 12, 0)
+    assert schedule.next_after(datetime(2025, 6, 2, 23, 30)) == datetime(2025, 6, 3, 0, 0)
+
+
+def test_ranges_steps_and_lists():
+    # Friday evening to Monday morning
+    assert next_runs("*/15 8-17 * * 1-5", datetime(2025, 6, 6, 17, 50), 2) == [
+        datetime(2025, 6, 9, 8, 0), datetime(2025, 6, 9, 8, 15)
+    ]
+    assert next_runs("10-30/10 6,18 * * *", datetime(2025, 6, 2, 6, 25), 3) == [
+        datetime(2025, 6, 2, 6, 30), datetime(2025, 6, 2, 18, 10), datetime(2025, 6, 2, 18, 20)
+    ]
+
+
+def test_weekday_only():
+    # 2025-06-02 is a Monday; 0 and 7 are both Sunday
+    assert CronSchedule("0 0 * * 0").next_after(datetime(2025, 6, 2)) == datetime(2025, 6, 8)
+    assert CronSchedule("0 0 * * 7").next_after(datetime(2025, 6, 2)) == datetime(2025, 6, 8)
+
+
+def test_day_or_weekday_when_both_restricted():
+    # The 13th of the month or any Friday, as in cron
+    assert next_runs("0 9 13 * 5", datetime(2025, 7, 1), 4) == [
+        datetime(2025, 7, 4, 9, 0),   # Friday
+        datetime(2025, 7, 11, 9, 0),  # Friday
+        datetime(2025, 7, 13, 9, 0),  # Sunday the 13th
+        datetime(2025, 7, 18, 9, 0),  # Friday
+    ]
+
+
+def test_month_and_year_rollover():
+    assert CronSchedule("0 0 1 1 *").next_after(datetime(2025, 6, 2)) == datetime(2026, 1, 1)
+    assert CronSchedule("30 12 29 2 *").next_after(datetime(2025, 3, 1)) == datetime(2028, 2, 29, 12, 30)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "5-1 * * * *", "x * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_never_matching_expression():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2025, 1, 1))
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "locks" / "scraper.lock")
+    first, second = FileLock(path), FileLock(path)
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
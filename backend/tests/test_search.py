@@ -0,0 +1,130 @@
+"""Full-text menu item search on SQLite (PostgreSQL search is covered in test_postgres)."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from backend.database import db
+from backend.database.db import MenuItem, seed_initial_data
+from backend.services.bulk_import import bulk_import
+from backend.services.menu_import import import_menu_to_db
+from backend.services.search import FTS_TABLE, fts_match, query_terms, search_menu_items
+from backend.tests.baseline_schema import create_baseline
+
+
+def menu(items, meal_type="LUNCH", day="Monday, June 2, 2025", dining_hall_id=None):
+    menu_data = {
+        "date": day,
+        "meal_type": meal_type,
+        "items": [
+            {"name": name, "category": category, "nutrition": {"item_oid": item_oid, "nutrients": {}}}
+            for item_oid, name, category in items
+        ],
+    }
+    if dining_hall_id is not None:
+        menu_data["dining_hall_id"] = dining_hall_id
+    return menu_data
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+@pytest.fixture
+def session(db_session):
+    seed_initial_data()
+    import_menu_to_db(menu([
+        ("1", "Fried Chicken Sandwich", "Grill"),
+        ("2", "Garden Salad", "Chicken and Greens"),
+        ("3", "Jalapeño Poppers", "Sides"),
+    ]), db_session, 1)
+    import_menu_to_db(menu([("4", "Chicken Tacos", "Grill")], day="Tuesday, June 3, 2025"), db_session, 2)
+    return db_session
+
+
+def test_query_terms_drop_search_syntax():
+    assert query_terms('Chick "sand*" OR name:x -(NEAR') == ["chick", "sand", "or", "name", "x", "near"]
+    assert query_terms("  ***  ") == []
+
+
+def test_fts_match():
+    assert fts_match(["chick", "sand"]) == '{name category} : ("chick"* AND "sand"*)'
+    assert fts_match(["chick"], 20250602, 3) == (
+        '{name category} : ("chick"*) AND date_key : 20250602 AND dining_hall_id : 3'
+    )
+
+
+def test_prefix_terms(session):
+    assert names(search_menu_items(session, "chick sand")) == ["Fried Chicken Sandwich"]
+    assert names(search_menu_items(session, "TACO")) == ["Chicken Tacos"]
+    assert search_menu_items(session, "sandwiches") == []
+    assert search_menu_items(session, "?!") == []
+
+
+def test_diacritics_are_ignored(session):
+    assert names(search_menu_items(session, "jalapeno")) == ["Jalapeño Poppers"]
+
+
+def test_ranking_and_filters(session):
+    # Name matches outrank category matches; equally good matches go newest first
+    assert names(search_menu_items(session, "chicken")) == ["Chicken Tacos", "Fried Chicken Sandwich", "Garden Salad"]
+    assert names(search_menu_items(session, "chicken", menu_day=date(2025, 6, 2))) == [
+        "Fried Chicken Sandwich", "Garden Salad"
+    ]
+    assert names(search_menu_items(session, "chicken", dining_hall_id=2)) == ["Chicken Tacos"]
+    assert search_menu_items(session, "chicken", menu_day=date(2025, 6, 3), dining_hall_id=1) == []
+
+
+def test_pagination(session):
+    everything = search_menu_items(session, "chicken")
+    assert search_menu_items(session, "chicken", limit=2) == everything[:2]
+    assert search_menu_items(session, "chicken", limit=2, offset=2) == everything[2:]
+
+
+def test_index_follows_writes(session):
+    import_menu_to_db(menu([("5", "Zesty Quinoa Bowl", "Vegan")]), session, 1)
+    assert names(search_menu_items(session, "quin")) == ["Zesty Quinoa Bowl"]
+
+    # A changed name is re-indexed by the upsert
+    import_menu_to_db(menu([("5", "Zesty Farro Bowl", "Vegan")]), session, 1)
+    assert search_menu_items(session, "quin") == []
+    assert names(search_menu_items(session, "farro")) == ["Zesty Farro Bowl"]
+
+    session.query(MenuItem).filter(MenuItem.item_oid == "5").delete()
+    session.commit()
+    assert search_menu_items(session, "zesty") == []
+
+
+def test_like_fallback_without_index(session):
+    with db.engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE {FTS_TABLE}"))
+    assert names(search_menu_items(session, "chick sand")) == ["Fried Chicken Sandwich"]
+    assert names(search_menu_items(session, "chicken", dining_hall_id=2)) == ["Chicken Tacos"]
+
+
+def test_index_built_for_migrated_database(sqlite_engine):
+    create_baseline(sqlite_engine)
+    db.init_db()
+    session = db.SessionLocal()
+    try:
+        assert names(search_menu_items(session, "garden")) == ["Garden Salad"]
+        # The triggers survive the rebuild of menu_items
+        import_menu_to_db(menu([("9", "Garden Burger", "Grill")]), session, 1)
+        assert names(search_menu_items(session, "garden burg")) == ["Garden Burger"]
+    finally:
+        session.close()
+
+
+def test_bulk_import_with_deferred_indexes(session):
+    report = bulk_import(
+        [menu([("6", "Pesto Pasta", "Pasta")], dining_hall_id=1), menu([("7", "Pesto Pizza", "Pizza")], dining_hall_id=2)],
+        engine=db.engine,
+        defer_indexes=True
+    )
+    assert report.rows == 2
+    assert sorted(names(search_menu_items(session, "pesto"))) == ["Pesto Pasta", "Pesto Pizza"]
+
+    # Triggers are back after the import
+    import_menu_to_db(menu([("8", "Pesto Panini", "Grill")]), session, 1)
+    assert "Pesto Panini" in names(search_menu_items(session, "pesto"))
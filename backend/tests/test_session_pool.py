@@ -0,0 +1,36 @@
+"""Per-campus politeness limits of the scraper's sessions."""
+
+import pytest
+
+from backend.config.campuses import Campus
+from backend.config.config import BASE_URL
+from backend.scraper import session_manager
+from backend.scraper.pipeline import ScrapePipeline
+from backend.scraper.session_pool import SessionPool
+
+
+@pytest.fixture(autouse=True)
+def fresh_host_limits(monkeypatch):
+    monkeypatch.setattr(session_manager, "_host_semaphores", {})
+    monkeypatch.setattr(session_manager, "_host_rate_limiters", {})
+
+
+def test_campus_limits_reach_the_host_limiter():
+    campus = Campus(
+        key="test", name="Test", base_url=BASE_URL,
+        requests_per_second=0.5, request_burst=2, max_requests_per_host=1
+    )
+    # Building the pipeline must not register the default limits for the host first
+    ScrapePipeline(campus=campus, parse_processes=0)
+
+    pool = SessionPool(campus=campus)
+    session = pool._take(None, None)
+    try:
+        assert (session.rate_limiter.rate, session.rate_limiter.capacity) == (0.5, 2)
+        assert session.host_semaphore is session_manager.get_host_semaphore(BASE_URL)
+        # A BoundedSemaphore of one: a second acquire does not succeed
+        assert session.host_semaphore.acquire(blocking=False)
+        assert not session.host_semaphore.acquire(blocking=False)
+        session.host_semaphore.release()
+    finally:
+        pool.close()
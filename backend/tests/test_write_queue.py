@@ -0,0 +1,63 @@
+"""The single-writer queue and the SQLite connection settings."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+from backend.database.write_queue import WriteQueue
+
+
+@pytest.fixture
+def write_queue():
+    queue = WriteQueue(serialize=True)
+    yield queue
+    queue.close()
+
+
+def test_writes_run_one_at_a_time_on_the_writer_thread(write_queue):
+    running = []
+    overlaps = []
+
+    def write(n):
+        running.append(n)
+        overlaps.append(len(running))
+        time.sleep(0.001)
+        running.remove(n)
+        return threading.current_thread().name
+
+    with ThreadPoolExecutor(max_workers=8) as callers:
+        threads = list(callers.map(lambda n: write_queue.run(write, n), range(40)))
+
+    assert max(overlaps) == 1
+    assert {name.split("_")[0] for name in threads} == {"db-writer"}
+
+
+def test_nested_writes_run_inline(write_queue):
+    # A queued write that writes through the queue again must not wait on itself
+    assert write_queue.run(lambda: write_queue.run(lambda: "inner")) == "inner"
+
+
+def test_errors_reach_the_caller(write_queue):
+    def fail():
+        raise RuntimeError("database is locked")
+
+    with pytest.raises(RuntimeError, match="locked"):
+        write_queue.run(fail)
+    # The writer thread survives a failed write
+    assert write_queue.run(lambda: 1) == 1
+
+
+def test_unserialized_writes_run_in_the_caller():
+    queue = WriteQueue(serialize=False)
+    assert queue.run(threading.get_ident) == threading.get_ident()
+
+
+def test_sqlite_pragmas(sqlite_engine):
+    with sqlite_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() > 0